@@ -2,12 +2,19 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.naive_bayes import MultinomialNB
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.linear_model import LogisticRegression
-import pickle
+import joblib
+import hashlib
 import os
 import json
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Tuple, Optional
 import re
 
+# Predictions remembered per categorizer; recurring vendors and receipts
+# skip the vectorizer/classifier entirely
+PREDICTION_CACHE_SIZE = 4096
+
 class ImprovedTransactionCategorizer:
     """Categorize transactions using improved ML with context awareness"""
     
@@ -34,6 +41,11 @@ class ImprovedTransactionCategorizer:
         self.trained = False
         self.categories = {}
         self.model_type = model_type
+        
+        # LRU of feature-text digest -> (category, confidence), emptied
+        # whenever the model changes
+        self._predictions = OrderedDict()
+        self._predictions_lock = threading.Lock()
     
     def get_enhanced_training_data(self) -> Dict[str, List[str]]:
         """Enhanced training data with more examples and context"""
@@ -329,6 +341,7 @@ class ImprovedTransactionCategorizer:
         X = self.vectorizer.fit_transform(texts)
         self.classifier.fit(X, labels)
         self.trained = True
+        self.clear_prediction_cache()
         
         print(f"✅ Categorizer trained with {len(texts)} examples across {len(categories_dict)} categories")
         print(f"   Model type: {self.model_type}")
@@ -366,6 +379,15 @@ class ImprovedTransactionCategorizer:
         if not text.strip():
             return 'Other', 0.0
         
+        # The digest covers the whole feature text, so a hit is exactly the
+        # prediction the model would make
+        key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        with self._predictions_lock:
+            cached = self._predictions.get(key)
+            if cached is not None:
+                self._predictions.move_to_end(key)
+                return cached
+        
         # Transform and predict
         try:
             X = self.vectorizer.transform([text])
@@ -381,11 +403,21 @@ class ImprovedTransactionCategorizer:
             else:
                 confidence = 50.0  # Default confidence for classifiers without probability
             
-            return category_name, confidence
-            
         except Exception as e:
             print(f"Error predicting category: {e}")
             return 'Other', 0.0
+        
+        with self._predictions_lock:
+            self._predictions[key] = (category_name, confidence)
+            if len(self._predictions) > PREDICTION_CACHE_SIZE:
+                self._predictions.popitem(last=False)
+        
+        return category_name, confidence
+    
+    def clear_prediction_cache(self):
+        """Forget cached predictions (after the model is trained or loaded)"""
+        with self._predictions_lock:
+            self._predictions.clear()
     
     def predict_with_alternatives(self, vendor_name: str, description: str = '', 
                                   amount: float = None, top_n: int = 3) -> List[Tuple[str, float]]:
@@ -435,8 +467,8 @@ class ImprovedTransactionCategorizer:
         
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
         
-        with open(filepath, 'wb') as f:
-            pickle.dump(model_data, f)
+        # Uncompressed, so load_model() can memory-map the numpy arrays
+        joblib.dump(model_data, filepath, compress=0)
         
         print(f"✅ Model saved to {filepath}")
     
@@ -444,14 +476,16 @@ class ImprovedTransactionCategorizer:
         """Load trained model from disk"""
         if os.path.exists(filepath):
             try:
-                with open(filepath, 'rb') as f:
-                    model_data = pickle.load(f)
+                # Read-only memmap: workers share the arrays via the page cache
+                # (plain pickles written by older versions load normally)
+                model_data = joblib.load(filepath, mmap_mode='r')
                 
                 self.vectorizer = model_data['vectorizer']
                 self.classifier = model_data['classifier']
                 self.categories = model_data['categories']
                 self.trained = model_data['trained']
                 self.model_type = model_data.get('model_type', 'nb')
+                self.clear_prediction_cache()
                 
                 print(f"✅ Model loaded from {filepath}")
                 return True
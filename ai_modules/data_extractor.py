@@ -1,25 +1,80 @@
+import logging
 import re
 from datetime import datetime
 from dateutil import parser as date_parser
-import traceback
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from collections import Counter
 
+logger = logging.getLogger(__name__)
+
+# Regexes are compiled once at import; extraction runs them per line of
+# every document, so re-resolving pattern strings there adds up.
+
+# Date patterns with priority
+DATE_PATTERNS = [
+    # ISO format
+    (re.compile(r'\b\d{4}[-/]\d{1,2}[-/]\d{1,2}\b', re.IGNORECASE), 10),
+    # DD/MM/YYYY or MM/DD/YYYY
+    (re.compile(r'\b\d{1,2}[-/]\d{1,2}[-/]\d{2,4}\b', re.IGNORECASE), 8),
+    # DD Month YYYY
+    (re.compile(r'\b\d{1,2}[\s-]+(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[\s-]+\d{2,4}\b', re.IGNORECASE), 9),
+    # Month DD, YYYY
+    (re.compile(r'\b(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[\s-]+\d{1,2},?\s+\d{4}\b', re.IGNORECASE), 9),
+]
+
+# Currency patterns with priority (group 1 is the amount)
+CURRENCY_PATTERNS = [
+    # Indian Rupee - various formats
+    (re.compile(r'(?:total|amount|paid|balance|sum)[\s:]*(?:rs\.?|inr|₹)\s*(\d+(?:,\d{2,3})*(?:\.\d{2})?)', re.IGNORECASE), 10),
+    (re.compile(r'(?:rs\.?|inr|₹)\s*(\d+(?:,\d{2,3})*(?:\.\d{2})?)', re.IGNORECASE), 8),
+    (re.compile(r'(\d+(?:,\d{2,3})*(?:\.\d{2})?)\s*(?:rs\.?|inr|₹)', re.IGNORECASE), 7),
+    # Dollar
+    (re.compile(r'\$\s*(\d+(?:,\d{3})*(?:\.\d{2})?)', re.IGNORECASE), 6),
+    # Plain numbers near context words
+    (re.compile(r'(?:total|amount|paid|balance)[\s:]*(\d+(?:,\d{2,3})*(?:\.\d{2})?)', re.IGNORECASE), 5),
+    # Plain numbers
+    (re.compile(r'\b(\d+(?:,\d{2,3})*(?:\.\d{2})?)\b', re.IGNORECASE), 1),
+]
+
+# Tax patterns: (regex, 'amount' | 'percentage')
+TAX_PATTERNS = [
+    # GST/Tax with amount
+    (re.compile(r'(?:gst|tax|vat|cgst|sgst|igst)[\s:@]*(?:rs\.?|₹|inr)?\s*(\d+(?:,\d{2,3})*(?:\.\d{2})?)', re.IGNORECASE), 'amount'),
+    # Percentage format
+    (re.compile(r'(?:gst|tax|vat)[\s:@]*(\d+(?:\.\d{1,2})?)\s*%', re.IGNORECASE), 'percentage'),
+    # @ percentage format
+    (re.compile(r'@\s*(\d+(?:\.\d{1,2})?)\s*%', re.IGNORECASE), 'percentage'),
+]
+
+INVOICE_PATTERNS = [
+    re.compile(r'(?:invoice|bill|receipt)\s*(?:no\.?|number|#)[\s:]*([A-Z0-9/-]+)', re.IGNORECASE),
+    re.compile(r'(?:inv|rcpt|bill)\s*#[\s:]*([A-Z0-9/-]+)', re.IGNORECASE),
+    re.compile(r'(?:invoice|bill|receipt)[\s:]*([A-Z]{2,}\d+)', re.IGNORECASE),
+]
+
+PAYMENT_KEYWORDS = {
+    'Card': ['card', 'credit card', 'debit card', 'visa', 'mastercard', 'amex', 'rupay'],
+    'UPI': ['upi', 'paytm', 'gpay', 'google pay', 'phonepe', 'bhim', 'upi id', 'upi transaction'],
+    'Cash': ['cash', 'paid in cash', 'cash payment'],
+    'Net Banking': ['net banking', 'netbanking', 'online banking', 'bank transfer', 'neft', 'rtgs', 'imps'],
+    'Wallet': ['wallet', 'mobikwik', 'freecharge', 'paytm wallet', 'amazon pay'],
+    'Cheque': ['cheque', 'check', 'cheque no', 'check number'],
+}
+
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_RE = re.compile(r'(?:\+91|91)?[\s-]?[6-9]\d{9}')
+
+_NON_NUMERIC_RE = re.compile(r'[^\d.]')
+_NON_PHONE_RE = re.compile(r'[^\d+]')
+_VENDOR_JUNK_RE = re.compile(r'[^\w\s&.-]')
+
+
 class ImprovedDataExtractor:
     """Extract structured data from raw text with improved accuracy"""
     
     def __init__(self):
-        # Enhanced date patterns with context
-        self.date_patterns = [
-            # ISO format
-            (r'\b\d{4}[-/]\d{1,2}[-/]\d{1,2}\b', 10),
-            # DD/MM/YYYY or MM/DD/YYYY
-            (r'\b\d{1,2}[-/]\d{1,2}[-/]\d{2,4}\b', 8),
-            # DD Month YYYY
-            (r'\b\d{1,2}[\s-]+(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[\s-]+\d{2,4}\b', 9),
-            # Month DD, YYYY
-            (r'\b(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)[\s-]+\d{1,2},?\s+\d{4}\b', 9),
-        ]
+        # Enhanced date patterns with context (compiled once, see DATE_PATTERNS)
+        self.date_patterns = DATE_PATTERNS
         
         # Date context keywords
         self.date_contexts = {
@@ -36,38 +91,27 @@ class ImprovedDataExtractor:
             'discount': ['discount', 'off', 'savings'],
         }
         
-        # Enhanced currency patterns
-        self.currency_patterns = [
-            # Indian Rupee - various formats
-            (r'(?:total|amount|paid|balance|sum)[\s:]*(?:rs\.?|inr|₹)\s*(\d+(?:,\d{2,3})*(?:\.\d{2})?)', 10),
-            (r'(?:rs\.?|inr|₹)\s*(\d+(?:,\d{2,3})*(?:\.\d{2})?)', 8),
-            (r'(\d+(?:,\d{2,3})*(?:\.\d{2})?)\s*(?:rs\.?|inr|₹)', 7),
-            # Dollar
-            (r'\$\s*(\d+(?:,\d{3})*(?:\.\d{2})?)', 6),
-            # Plain numbers near context words
-            (r'(?:total|amount|paid|balance)[\s:]*(\d+(?:,\d{2,3})*(?:\.\d{2})?)', 5),
-            # Plain numbers
-            (r'\b(\d+(?:,\d{2,3})*(?:\.\d{2})?)\b', 1),
-        ]
+        # Enhanced currency patterns (compiled once, see CURRENCY_PATTERNS)
+        self.currency_patterns = CURRENCY_PATTERNS
     
     def extract_dates_with_context(self, text: str) -> Tuple[Optional[datetime], Dict[str, datetime]]:
         """Extract dates with contextual understanding"""
-        dates_by_context = {
-            'invoice': [],
-            'transaction': [],
-            'due': [],
-            'other': []
-        }
-        
+        best_dates = {}
+        self._scan_dates(text, best_dates)
+        return self._pick_dates(best_dates)
+    
+    def _scan_dates(self, text: str, best_dates: Dict) -> None:
+        """
+        Fold the dates found in text into best_dates
+        ({context: (rank, best date, first date)})
+        """
         # Split text into lines for context analysis
-        lines = text.split('\n')
-        
-        for line_idx, line in enumerate(lines):
+        for line in text.split('\n'):
             line_lower = line.lower()
             
             # Try each date pattern
             for pattern, priority in self.date_patterns:
-                matches = re.finditer(pattern, line, re.IGNORECASE)
+                matches = pattern.finditer(line)
                 for match in matches:
                     try:
                         date_str = match.group(0)
@@ -84,45 +128,45 @@ class ImprovedDataExtractor:
                                 context_type = ctx_type
                                 break
                         
-                        dates_by_context[context_type].append({
-                            'date': parsed_date,
-                            'priority': priority,
-                            'context': context_type,
-                            'line': line.strip()
-                        })
+                        # Keep the best per context (priority, then recency,
+                        # then the earliest match) and the first match
+                        rank = (-priority, -parsed_date.timestamp())
+                        current = best_dates.get(context_type)
+                        if current is None:
+                            best_dates[context_type] = (rank, parsed_date, parsed_date)
+                        elif rank < current[0]:
+                            best_dates[context_type] = (rank, parsed_date, current[2])
                     except Exception:
                         continue
-        
+    
+    def _pick_dates(self, best_dates: Dict) -> Tuple[Optional[datetime], Dict[str, datetime]]:
+        """Primary date and {context: date} from _scan_dates() results"""
         # Select primary date (prefer invoice/transaction dates)
-        primary_date = None
+        primary_context = primary_date = None
         for context in ['invoice', 'transaction', 'other', 'due']:
-            if dates_by_context[context]:
-                # Sort by priority and recency
-                dates_by_context[context].sort(key=lambda x: (-x['priority'], -x['date'].timestamp()))
-                primary_date = dates_by_context[context][0]['date']
+            if context in best_dates:
+                primary_context = context
+                primary_date = best_dates[context][1]
                 break
         
-        # Convert to simple dict for return
+        # Convert to simple dict for return: only the primary context is
+        # ranked, the others report their first match
         simplified_dates = {}
-        for context, date_list in dates_by_context.items():
-            if date_list:
-                simplified_dates[context] = date_list[0]['date']
+        for context in ['invoice', 'transaction', 'due', 'other']:
+            if context in best_dates:
+                simplified_dates[context] = best_dates[context][1 if context == primary_context else 2]
         
         return primary_date, simplified_dates
     
     def extract_amounts_with_context(self, text: str) -> Dict[str, float]:
         """Extract monetary amounts with contextual understanding"""
-        amounts_by_context = {
-            'total': [],
-            'subtotal': [],
-            'tax': [],
-            'discount': [],
-            'other': []
-        }
-        
-        lines = text.split('\n')
-        
-        for line in lines:
+        best_amounts = {}
+        self._scan_amounts(text, best_amounts)
+        return self._pick_amounts(best_amounts)
+    
+    def _scan_amounts(self, text: str, best_amounts: Dict) -> None:
+        """Fold the amounts found in text into best_amounts ({context: (priority, amount)})"""
+        for line in text.split('\n'):
             line_lower = line.lower()
             
             # Determine line context
@@ -134,31 +178,29 @@ class ImprovedDataExtractor:
             
             # Try each currency pattern
             for pattern, priority in self.currency_patterns:
-                matches = re.finditer(pattern, line, re.IGNORECASE)
+                matches = pattern.finditer(line)
                 for match in matches:
                     try:
                         # Extract numeric value
                         amount_str = match.group(1)
-                        amount_str = re.sub(r'[^\d.]', '', amount_str)
+                        amount_str = _NON_NUMERIC_RE.sub('', amount_str)
                         amount = float(amount_str)
                         
-                        # Filter reasonable amounts
+                        # Filter reasonable amounts; highest priority wins,
+                        # earliest match on ties
                         if 0.01 <= amount <= 10000000:
-                            amounts_by_context[line_context].append({
-                                'amount': amount,
-                                'priority': priority,
-                                'line': line.strip()
-                            })
+                            current = best_amounts.get(line_context)
+                            if current is None or priority > current[0]:
+                                best_amounts[line_context] = (priority, amount)
                     except (ValueError, IndexError):
                         continue
-        
-        # Select best amounts for each context
+    
+    def _pick_amounts(self, best_amounts: Dict) -> Dict[str, float]:
+        """{context: amount} from _scan_amounts() results"""
         result = {}
-        for context, amount_list in amounts_by_context.items():
-            if amount_list:
-                # Sort by priority
-                amount_list.sort(key=lambda x: -x['priority'])
-                result[context] = amount_list[0]['amount']
+        for context in ['total', 'subtotal', 'tax', 'discount', 'other']:
+            if context in best_amounts:
+                result[context] = best_amounts[context][1]
         
         # If we have both total and subtotal, validate
         if 'total' in result and 'subtotal' in result:
@@ -177,7 +219,7 @@ class ImprovedDataExtractor:
         
         for i, line in enumerate(lines[:10]):  # Check first 10 lines
             score = 0
-            line_clean = re.sub(r'[^\w\s&.-]', '', line)
+            line_clean = _VENDOR_JUNK_RE.sub('', line)
             
             # Skip if too short or too long
             if len(line_clean) < 3 or len(line_clean) > 80:
@@ -234,77 +276,72 @@ class ImprovedDataExtractor:
     
     def extract_tax_info(self, text: str) -> Tuple[Optional[float], Optional[float]]:
         """Extract tax amount and percentage with better accuracy"""
-        tax_amount = None
-        tax_percentage = None
-        
-        # Tax-specific patterns
-        patterns = [
-            # GST/Tax with amount
-            (r'(?:gst|tax|vat|cgst|sgst|igst)[\s:@]*(?:rs\.?|₹|inr)?\s*(\d+(?:,\d{2,3})*(?:\.\d{2})?)', 'amount'),
-            # Percentage format
-            (r'(?:gst|tax|vat)[\s:@]*(\d+(?:\.\d{1,2})?)\s*%', 'percentage'),
-            # @ percentage format
-            (r'@\s*(\d+(?:\.\d{1,2})?)\s*%', 'percentage'),
-        ]
-        
-        for pattern, tax_type in patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+        last_taxes = [[None, None] for _ in TAX_PATTERNS]
+        self._scan_tax(text, last_taxes)
+        return self._pick_tax(last_taxes)
+    
+    def _scan_tax(self, text: str, last_taxes: List[List]) -> None:
+        """Fold the tax matches in text into last_taxes ([amount, percentage] per pattern, last match wins)"""
+        for (pattern, tax_type), last in zip(TAX_PATTERNS, last_taxes):
+            matches = pattern.finditer(text)
             for match in matches:
                 try:
-                    value_str = re.sub(r'[^\d.]', '', match.group(1))
+                    value_str = _NON_NUMERIC_RE.sub('', match.group(1))
                     value = float(value_str)
                     
                     if tax_type == 'percentage':
                         if 0 < value <= 100:
-                            tax_percentage = value
+                            last[1] = value
                     else:  # amount
                         if value < 1:  # Likely percentage written as decimal
-                            tax_percentage = value * 100
+                            last[1] = value * 100
                         elif value <= 100:  # Could be percentage
-                            tax_percentage = value
+                            last[1] = value
                         else:  # Definitely amount
-                            tax_amount = value
+                            last[0] = value
                 except (ValueError, IndexError):
                     continue
-        
+    
+    def _pick_tax(self, last_taxes: List[List]) -> Tuple[Optional[float], Optional[float]]:
+        """(tax amount, tax percentage) from _scan_tax() results; later patterns win"""
+        tax_amount = None
+        tax_percentage = None
+        for amount, percentage in last_taxes:
+            if amount is not None:
+                tax_amount = amount
+            if percentage is not None:
+                tax_percentage = percentage
         return tax_amount, tax_percentage
     
     def extract_payment_method(self, text: str) -> str:
         """Extract payment method with better detection"""
+        return self._pick_payment_method(self._score_payment_methods(text))
+    
+    def _score_payment_methods(self, text: str) -> Dict[str, int]:
+        """Keyword hit counts per payment method (methods with no hits are left out)"""
         text_lower = text.lower()
         
         # Score each payment method
         scores = {}
         
-        payment_keywords = {
-            'Card': ['card', 'credit card', 'debit card', 'visa', 'mastercard', 'amex', 'rupay'],
-            'UPI': ['upi', 'paytm', 'gpay', 'google pay', 'phonepe', 'bhim', 'upi id', 'upi transaction'],
-            'Cash': ['cash', 'paid in cash', 'cash payment'],
-            'Net Banking': ['net banking', 'netbanking', 'online banking', 'bank transfer', 'neft', 'rtgs', 'imps'],
-            'Wallet': ['wallet', 'mobikwik', 'freecharge', 'paytm wallet', 'amazon pay'],
-            'Cheque': ['cheque', 'check', 'cheque no', 'check number'],
-        }
-        
-        for method, keywords in payment_keywords.items():
+        for method, keywords in PAYMENT_KEYWORDS.items():
             score = sum(text_lower.count(kw) for kw in keywords)
             if score > 0:
                 scores[method] = score
         
+        return scores
+    
+    def _pick_payment_method(self, scores: Dict[str, int]) -> str:
         if scores:
-            return max(scores.items(), key=lambda x: x[1])[0]
+            # Ties go to the method listed first in PAYMENT_KEYWORDS
+            return max(PAYMENT_KEYWORDS, key=lambda method: scores.get(method, 0))
         
         return 'Other'
     
     def extract_invoice_number(self, text: str) -> Optional[str]:
         """Extract invoice/bill/receipt number"""
-        patterns = [
-            r'(?:invoice|bill|receipt)\s*(?:no\.?|number|#)[\s:]*([A-Z0-9/-]+)',
-            r'(?:inv|rcpt|bill)\s*#[\s:]*([A-Z0-9/-]+)',
-            r'(?:invoice|bill|receipt)[\s:]*([A-Z]{2,}\d+)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in INVOICE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1).strip()
         
@@ -312,20 +349,17 @@ class ImprovedDataExtractor:
     
     def extract_contact_info(self, text: str) -> Dict[str, Optional[str]]:
         """Extract contact information"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        phone_pattern = r'(?:\+91|91)?[\s-]?[6-9]\d{9}'
-        
         email = None
         phone = None
         
-        email_match = re.search(email_pattern, text)
+        email_match = EMAIL_RE.search(text)
         if email_match:
             email = email_match.group(0)
         
-        phone_matches = re.findall(phone_pattern, text)
+        phone_matches = PHONE_RE.findall(text)
         if phone_matches:
             # Clean up phone number
-            phone = re.sub(r'[^\d+]', '', phone_matches[0])
+            phone = _NON_PHONE_RE.sub('', phone_matches[0])
         
         return {'email': email, 'phone': phone}
     
@@ -357,48 +391,104 @@ class ImprovedDataExtractor:
     
     def extract_all_data(self, text: str) -> Optional[Dict]:
         """Extract all relevant data from text with improved accuracy"""
-        if not text or len(text.strip()) < 10:
+        if not text:
             return None
         
+        extracted_data, _, _ = self.extract_streaming([text])
+        return extracted_data
+    
+    def extract_streaming(self, pages: Iterable[str],
+                          keep_chars: Optional[int] = 2000) -> Tuple[Optional[Dict], str, int]:
+        """
+        Extract all relevant data from text delivered page by page
+        
+        Each page is scanned as it arrives and only the running best matches
+        are kept, so memory follows the largest page rather than the whole
+        document. Pages are treated as if joined with newlines; for a single
+        page the result is exactly extract_all_data()'s.
+        
+        Returns:
+            (extracted data or None, first `keep_chars` characters of the
+            text (all of it when keep_chars is None), total text length)
+        """
+        best_dates = {}
+        best_amounts = {}
+        payment_scores = Counter()
+        vendor_lines = []
+        last_taxes = [[None, None] for _ in TAX_PATTERNS]
+        invoice_number = email = phone = None
+        head = []
+        head_size = 0
+        text_length = 0
+        stripped_length = 0
+        
+        for page_num, page in enumerate(pages):
+            if page_num:
+                # Page break stands in for the newline that joined them
+                page = '\n' + page
+            
+            text_length += len(page)
+            stripped_length += len(page.strip())
+            if keep_chars is None or head_size < keep_chars:
+                piece = page if keep_chars is None else page[:keep_chars - head_size]
+                head.append(piece)
+                head_size += len(piece)
+            
+            self._scan_dates(page, best_dates)
+            self._scan_amounts(page, best_amounts)
+            payment_scores.update(self._score_payment_methods(page))
+            
+            # Vendor comes from the first 10 non-empty lines
+            if len(vendor_lines) < 10:
+                vendor_lines.extend(l for l in page.split('\n') if l.strip())
+            
+            self._scan_tax(page, last_taxes)
+            
+            if invoice_number is None:
+                invoice_number = self.extract_invoice_number(page)
+            
+            if email is None or phone is None:
+                contact_info = self.extract_contact_info(page)
+                email = email or contact_info['email']
+                phone = phone or contact_info['phone']
+        
+        head_text = ''.join(head)
+        
+        if stripped_length < 10:
+            return None, head_text, text_length
+        
         try:
             # Extract dates
-            primary_date, all_dates = self.extract_dates_with_context(text)
+            primary_date, all_dates = self._pick_dates(best_dates)
             
             # Extract amounts
-            amounts = self.extract_amounts_with_context(text)
+            amounts = self._pick_amounts(best_amounts)
             primary_amount = amounts.get('total') or amounts.get('other')
-            
-            # Extract other information
-            vendor = self.extract_vendor_name(text)
-            tax_amount, tax_percentage = self.extract_tax_info(text)
-            payment_method = self.extract_payment_method(text)
-            invoice_number = self.extract_invoice_number(text)
-            contact_info = self.extract_contact_info(text)
+            tax_amount, tax_percentage = self._pick_tax(last_taxes)
             
             extracted_data = {
                 'date': primary_date.date() if primary_date else None,
                 'all_dates': {k: v.date() for k, v in all_dates.items()},
                 'amount': primary_amount,
                 'all_amounts': amounts,
-                'vendor': vendor,
-                'payment_method': payment_method,
+                'vendor': self.extract_vendor_name('\n'.join(vendor_lines[:10])),
+                'payment_method': self._pick_payment_method(payment_scores),
                 'invoice_number': invoice_number,
                 'tax_amount': tax_amount,
                 'tax_percentage': tax_percentage,
-                'email': contact_info['email'],
-                'phone': contact_info['phone'],
-                'raw_text': text[:2000],  # Store first 2000 chars
+                'email': email,
+                'phone': phone,
+                'raw_text': head_text[:2000],  # Store first 2000 chars
             }
             
             # Calculate confidence
             extracted_data['confidence'] = self.get_extraction_confidence(extracted_data)
             
-            return extracted_data
+            return extracted_data, head_text, text_length
             
         except Exception as e:
-            print(f"Error extracting data: {e}")
-            traceback.print_exc()
-            return None
+            logger.warning("Error extracting data: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
+            return None, head_text, text_length
     
     def validate_extraction(self, extracted_data: Dict) -> List[str]:
         """Validate extracted data and return warnings"""
@@ -5,9 +5,11 @@ import cv2
 import numpy as np
 from PyPDF2 import PdfReader
 import pdf2image
-from typing import Tuple, Optional
+from typing import Iterator, Tuple, Optional
 import gc
 
+IMAGE_EXTENSIONS = ['png', 'jpg', 'jpeg', 'gif', 'bmp', 'tiff', 'webp']
+
 class ImprovedDocumentProcessor:
     """Memory-optimized OCR with full accuracy maintained"""
     
@@ -273,11 +275,76 @@ class ImprovedDocumentProcessor:
         
         if file_extension == 'pdf':
             return self.extract_text_from_pdf(file_path)
-        elif file_extension in ['png', 'jpg', 'jpeg', 'gif', 'bmp', 'tiff', 'webp']:
+        elif file_extension in IMAGE_EXTENSIONS:
             return self.extract_text_from_image(file_path)
         else:
             return None, f"Unsupported file type: {file_extension}"
     
+    def iter_pages(self, file_path: str, file_extension: str) -> Iterator[str]:
+        """
+        Yield a document's text one page at a time (streaming process_document)
+        
+        PDF pages use their text layer when it reads well and are rendered
+        and OCR'd one at a time otherwise, so at most one page image is held
+        in memory. An image is a single page. Raises ValueError for
+        unsupported types and failed image OCR.
+        """
+        file_extension = file_extension.lower().replace('.', '')
+        
+        if file_extension == 'pdf':
+            yield from self._iter_pdf_pages(file_path)
+        elif file_extension in IMAGE_EXTENSIONS:
+            text, error = self.extract_text_from_image(file_path)
+            if error:
+                raise ValueError(error)
+            if text:
+                yield text
+        else:
+            raise ValueError(f"Unsupported file type: {file_extension}")
+    
+    def _iter_pdf_pages(self, pdf_path: str) -> Iterator[str]:
+        """PDF pages from the text layer, falling back to OCR per scanned page"""
+        with open(pdf_path, 'rb') as file:
+            pdf_reader = PdfReader(file)
+            
+            for page_num, page in enumerate(pdf_reader.pages):
+                page_text = page.extract_text() or ''
+                
+                if not page_text.strip() or self.get_text_quality_score(page_text) <= 30:
+                    page_text = self._ocr_pdf_page(pdf_path, page_num + 1)
+                
+                if page_text.strip():
+                    yield page_text
+                
+                if page_num % 5 == 0:
+                    self._clean_memory()
+    
+    def _ocr_pdf_page(self, pdf_path: str, page_number: int) -> str:
+        """OCR a single (1-based) PDF page without rendering the others"""
+        images = pdf2image.convert_from_path(
+            pdf_path, dpi=200, first_page=page_number, last_page=page_number
+        )
+        if not images:
+            return ''
+        
+        image = images[0]
+        processed_image = self.preprocess_image_advanced(image)
+        
+        page_text = pytesseract.image_to_string(
+            processed_image,
+            lang='eng',
+            config=self.ocr_config['standard']
+        )
+        
+        image.close()
+        processed_image.close()
+        del images, image, processed_image
+        self._clean_memory()
+        
+        if not page_text.strip():
+            return ''
+        return f"--- Page {page_number} ---\n{page_text}"
+    
     def get_text_quality_score(self, text: str) -> float:
         """Estimate OCR quality based on text characteristics"""
         if not text:
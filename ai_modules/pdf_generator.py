@@ -26,9 +26,13 @@ class PDFGenerator:
     def _decode_base64_image(base64_data):
         """
         Safely decode base64 image data
-        Handles both raw base64 and data URI formats
+        Handles both raw base64 and data URI formats; already-decoded bytes
+        are wrapped as-is
         """
         try:
+            if isinstance(base64_data, bytes):
+                return BytesIO(base64_data)
+            
             # Remove data URI prefix if present
             if isinstance(base64_data, str):
                 if base64_data.startswith('data:image'):
@@ -43,20 +47,21 @@ class PDFGenerator:
             return None
     
     @staticmethod
-    def generate_report_pdf(report_data, report_type, charts_base64=None):
+    def generate_report_pdf(report_data, report_type, charts_base64=None, dest=None):
         """
         Generate a PDF report from report data and charts
         
         Args:
             report_data: Dictionary containing report data
             report_type: Type of report (monthly, quarterly, comparison, custom)
-            charts_base64: Dictionary with chart images as base64
+            charts_base64: Dictionary with chart images as base64 (or decoded bytes)
+            dest: Writable binary file to render into (default: a new BytesIO)
         
         Returns:
-            BytesIO object containing PDF or None on error
+            dest (or the BytesIO) rewound to the start, or None on error
         """
         try:
-            pdf_buffer = BytesIO()
+            pdf_buffer = dest if dest is not None else BytesIO()
             doc = SimpleDocTemplate(pdf_buffer, pagesize=A4)
             
             # Get styles
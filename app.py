@@ -1,4 +1,4 @@
-from flask import Flask, render_template, jsonify, request, redirect, url_for, send_from_directory
+from flask import Flask, Response, render_template, request, redirect, url_for, send_from_directory, abort
 from config import Config
 from models.database import db, init_db
 from models.document import Document
@@ -8,8 +8,16 @@ from models.budget import Budget
 from utils.db_utils import DatabaseUtils
 from utils.seed_data import SeedData
 from utils.file_handler import FileHandler
+from utils.cache_utils import init_cache, cached_view, etag_view, CacheUtils
+from utils.json_utils import ojson, OrjsonProvider
+from utils.schemas import decode_json, TransactionCreate, TransactionUpdate
+from utils.category_cache import CategoryCache
+from utils.task_queue import task_queue
+from utils.logging_utils import init_logging
 from werkzeug.utils import secure_filename
-from utils.processor import DocumentProcessingWorkflow
+from werkzeug.security import safe_join
+from urllib.parse import quote as url_quote
+from utils.processor import get_workflow
 from ai_modules.smart_nlp import EnhancedSmartNLPProcessor
 from utils.performance_monitor import perf_monitor
 from models.conversation import Conversation
@@ -17,13 +25,15 @@ from models.message import Message
 from routes.chat_routes_semantic import chat_bp
 from routes.reports import report_bp
 import os
+import operator
 from routes.budget_routes import budget_bp
 from routes.insights_routes import insights_bp
-from datetime import datetime
+from datetime import datetime, date, timedelta
 from models.notification_system import Notification, NotificationManager, BudgetNotificationManager
 from routes.notification_routes import notification_bp
 from routes.hdfc_routes import hdfc_bp
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, select, insert, update, delete, tuple_, bindparam, lambda_stmt
+from sqlalchemy.orm import raiseload, load_only
 from models.user import User
 from flask_login import LoginManager, login_required, current_user
 from routes.auth_routes import auth_bp
@@ -31,6 +41,31 @@ import psutil
 import os
 import gc
 from ai_modules.model_loader import AIModelLoader
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# NLP PROCESSOR (lazy, thread-safe singleton)
+# ============================================================================
+
+nlp_processor = None
+_nlp_lock = threading.Lock()
+
+def get_nlp():
+    """Return the shared NLP processor, building it exactly once"""
+    global nlp_processor
+
+    if nlp_processor is None:
+        with _nlp_lock:
+            if nlp_processor is None:
+                logger.info("Initializing NLP processor...")
+                nlp_processor = EnhancedSmartNLPProcessor()
+                logger.info("Smart NLP processor initialized")
+
+    return nlp_processor
 
 
 def create_app():
@@ -55,10 +90,18 @@ def create_app():
     )
 
     app.config.from_object(Config)
+    app.json = OrjsonProvider(app)
+
+    init_logging(app)
 
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
     init_db(app)
+    init_cache(app)
+    task_queue.init_app(app)
+
+    with app.app_context():
+        perf_monitor.init_app(app, db.engine)
 
     # ========================================================================
     # FLASK-LOGIN SETUP
@@ -78,14 +121,16 @@ def create_app():
     # ========================================================================
     with app.app_context():
         db.create_all()
-        print("✅ Database tables created/verified")
+        logger.info("Database tables created/verified")
 
         if Category.query.count() == 0:
             for cat_data in DEFAULT_CATEGORIES:
                 category = Category(**cat_data)
                 db.session.add(category)
             db.session.commit()
-            print("✅ Default categories created!")
+            logger.info("Default categories created")
+
+        CategoryCache.load()
 
     # ========================================================================
     # BLUEPRINT REGISTRATION
@@ -98,6 +143,16 @@ def create_app():
     app.register_blueprint(notification_bp)
     app.register_blueprint(hdfc_bp)
 
+    # ========================================================================
+    # NLP WARM-UP (opt-in: loads the models while health checks are served)
+    # ========================================================================
+    if app.config['NLP_WARMUP']:
+        def _warm_nlp():
+            with app.app_context():
+                get_nlp()
+
+        threading.Thread(target=_warm_nlp, name='nlp-warmup', daemon=True).start()
+
     return app
 
 
@@ -155,15 +210,26 @@ def upload_page():
         return render_template('upload.html')
 
     if 'file' not in request.files:
-        return jsonify({'success': False, 'error': 'No file provided'}), 400
+        return ojson({'success': False, 'error': 'No file provided'}, 400)
 
     file = request.files['file']
     file_info, error = FileHandler.save_file(file, app.config['UPLOAD_FOLDER'])
 
     if error:
-        return jsonify({'success': False, 'error': error}), 400
+        return ojson({'success': False, 'error': error}, 400)
 
     try:
+        # Same bytes already uploaded: keep the existing document
+        existing = Document.query.filter_by(content_sha256=file_info['content_sha256']).first()
+        if existing:
+            FileHandler.delete_file(file_info['file_path'])
+            return ojson({
+                'success': True,
+                'message': 'File already uploaded',
+                'duplicate': True,
+                'document': existing.to_dict()
+            })
+
         file_type = FileHandler.get_file_type(file_info['original_filename'])
 
         document = Document(
@@ -171,19 +237,22 @@ def upload_page():
             original_filename=file_info['original_filename'],
             file_type=file_type,
             file_path=file_info['file_path'],
+            content_sha256=file_info['content_sha256'],
             processed=False
         )
         db.session.add(document)
         db.session.commit()
+        # total_documents is part of the dashboard snapshot
+        CacheUtils.bump_transactions_version()
 
-        return jsonify({
+        return ojson({
             'success': True,
             'message': 'File uploaded successfully',
             'document': document.to_dict()
         })
     except Exception as e:
         FileHandler.delete_file(file_info['file_path'])
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return ojson({'success': False, 'error': str(e)}, 500)
 
 
 # ============================================================================
@@ -193,84 +262,66 @@ def upload_page():
 @app.route('/health')
 @login_required
 def health_check():
-    return jsonify({'status': 'healthy', 'database': 'connected', 'version': '1.0.0'})
+    return ojson({'status': 'healthy', 'database': 'connected', 'version': '1.0.0'})
 
 @app.route('/api/stats')
 @login_required
+@etag_view()
+@cached_view()
 def get_stats():
-    return jsonify(DatabaseUtils.get_dashboard_stats())
+    return ojson(DatabaseUtils.get_dashboard_snapshot()['stats'])
 
 @app.route('/api/category-breakdown')
 @login_required
+@etag_view()
+@cached_view()
 def get_category_breakdown():
-    return jsonify(DatabaseUtils.get_category_breakdown())
+    return ojson(DatabaseUtils.get_dashboard_snapshot()['category_breakdown'])
 
 @app.route('/api/recent-transactions')
 @login_required
+@etag_view()
+@cached_view()
 def get_recent_transactions():
     limit = request.args.get('limit', 10, type=int)
-    return jsonify(DatabaseUtils.get_recent_transactions(limit))
+    return ojson(DatabaseUtils.get_recent_transactions(limit))
 
 @app.route('/api/monthly-trend')
 @login_required
+@etag_view()
+@cached_view()
 def get_monthly_trend():
-    months = request.args.get('months', 6, type=int)
-    return jsonify(DatabaseUtils.get_monthly_trend(months))
+    months = request.args.get('months', DatabaseUtils.DASHBOARD_TREND_MONTHS, type=int)
+    if months == DatabaseUtils.DASHBOARD_TREND_MONTHS:
+        return ojson(DatabaseUtils.get_dashboard_snapshot()['monthly_trend'])
+    return ojson(DatabaseUtils.get_monthly_trend(months))
 
 @app.route('/api/categories')
 @login_required
+@etag_view(CategoryCache.json_version, bucket_seconds=None)
 def get_categories():
-    categories = Category.query.all()
-    return jsonify([cat.to_dict() for cat in categories])
+    return Response(CategoryCache.get_json(), mimetype='application/json')
 
 @app.route('/api/vendors/top')
 @login_required
+@etag_view()
+@cached_view()
 def get_top_vendors():
     try:
-        limit = request.args.get('limit', 6, type=int)
-
-        vendors = db.session.query(
-            Transaction.vendor_name.label('vendor_name'),
-            func.count(Transaction.id).label('transaction_count'),
-            func.sum(Transaction.amount).label('total_spending'),
-            func.max(Transaction.transaction_date).label('last_transaction_date')
-        ).filter(
-            Transaction.vendor_name.isnot(None),
-            Transaction.vendor_name != ''
-        ).group_by(
-            Transaction.vendor_name
-        ).order_by(
-            desc('total_spending')
-        ).limit(limit).all()
-
-        vendor_list = []
-        for v in vendors:
-            try:
-                last_date = None
-                if v.last_transaction_date:
-                    if isinstance(v.last_transaction_date, str):
-                        last_date = v.last_transaction_date
-                    else:
-                        last_date = v.last_transaction_date.isoformat()
-
-                vendor_list.append({
-                    'vendor_name': str(v.vendor_name) if v.vendor_name else 'Unknown',
-                    'transaction_count': int(v.transaction_count) if v.transaction_count else 0,
-                    'total_spending': float(v.total_spending) if v.total_spending else 0.0,
-                    'last_transaction_date': last_date
-                })
-            except Exception as e:
-                print(f"Error processing vendor {v}: {str(e)}")
-                continue
+        limit = request.args.get('limit', DatabaseUtils.DASHBOARD_TOP_VENDORS, type=int)
+        if limit == DatabaseUtils.DASHBOARD_TOP_VENDORS:
+            vendors_json = DatabaseUtils.get_dashboard_snapshot()['top_vendors_json']
+        else:
+            vendors_json = DatabaseUtils.get_top_vendors_json(limit)
 
-        print(f"✅ Found {len(vendor_list)} vendors")
-        return jsonify({'success': True, 'vendors': vendor_list})
+        return Response(
+            '{"success": true, "vendors": ' + vendors_json + '}',
+            mimetype='application/json'
+        )
 
     except Exception as e:
-        print(f"❌ Error in get_top_vendors: {str(e)}")
-        import traceback
-        print(traceback.format_exc())
-        return jsonify({'success': False, 'error': str(e)}), 500
+        logger.error("Error in get_top_vendors: %s", e, exc_info=True)
+        return ojson({'success': False, 'error': str(e)}, 500)
 
 
 # ============================================================================
@@ -282,28 +333,31 @@ def get_top_vendors():
 def seed_database():
     try:
         SeedData.generate_documents(10)
-        SeedData.generate_transactions(50)
+        rows = SeedData.generate_transactions(50)
+        CacheUtils.bump_transactions_version()
 
-        return jsonify({
+        from utils.budget_utils import BudgetUtils
+        BudgetUtils.sync_transaction_budgets_bulk(rows)
+
+        return ojson({
             'success': True,
             'message': 'Database seeded successfully!',
             'documents': Document.query.count(),
             'transactions': Transaction.query.count()
         })
     except Exception as e:
-        import traceback
-        print("❌ SEEDING ERROR:")
-        print(traceback.format_exc())
-        return jsonify({'success': False, 'error': str(e)}), 500
+        logger.error("Seeding error: %s", e, exc_info=True)
+        return ojson({'success': False, 'error': str(e)}, 500)
 
 @app.route('/admin/clear')
 @login_required
 def clear_database():
     try:
         SeedData.clear_all_data()
-        return jsonify({'success': True, 'message': 'All data cleared successfully!'})
+        CacheUtils.bump_transactions_version()
+        return ojson({'success': True, 'message': 'All data cleared successfully!'})
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return ojson({'success': False, 'error': str(e)}, 500)
 
 
 # ============================================================================
@@ -313,16 +367,20 @@ def clear_database():
 @app.route('/api/documents')
 @login_required
 def get_documents():
-    documents = Document.query.order_by(Document.upload_date.desc()).all()
-    return jsonify([doc.to_dict() for doc in documents])
+    # Plain row tuples of the listed columns: no raw_text, no ORM identity map
+    columns = [getattr(Document, name) for name in Document.SUMMARY_COLUMNS]
+    rows = db.session.execute(
+        select(*columns).order_by(Document.upload_date.desc())
+    ).all()
+    return ojson([Document.summary_dict(row) for row in rows])
 
 @app.route('/api/documents/<int:doc_id>')
 @login_required
 def get_document(doc_id):
     document = db.session.get(Document, doc_id)
     if not document:
-        return jsonify({'error': 'Document not found'}), 404
-    return jsonify(document.to_dict())
+        return ojson({'error': 'Document not found'}, 404)
+    return ojson(document.to_dict())
 
 @app.route('/api/documents/<int:doc_id>', methods=['DELETE'])
 @login_required
@@ -330,152 +388,200 @@ def delete_document(doc_id):
     try:
         document = db.session.get(Document, doc_id)
         if not document:
-            return jsonify({'success': False, 'error': 'Document not found'}), 404
+            return ojson({'success': False, 'error': 'Document not found'}, 404)
 
         FileHandler.delete_file(document.file_path)
         db.session.delete(document)
         db.session.commit()
+        CacheUtils.bump_transactions_version()
 
-        return jsonify({'success': True, 'message': 'Document deleted successfully'})
+        return ojson({'success': True, 'message': 'Document deleted successfully'})
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return ojson({'success': False, 'error': str(e)}, 500)
 
 @app.route('/uploads/<filename>')
 @login_required
 def serve_upload(filename):
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    accel_prefix = app.config.get('UPLOAD_ACCEL_REDIRECT_PREFIX')
+    if not accel_prefix:
+        return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+
+    # Auth happened above; hand the byte transfer to nginx (sendfile)
+    if safe_join(app.config['UPLOAD_FOLDER'], filename) is None:
+        abort(404)
+    response = Response()
+    response.headers['X-Accel-Redirect'] = accel_prefix.rstrip('/') + '/' + url_quote(filename)
+    del response.headers['Content-Type']  # let nginx pick it from the extension
+    return response
 
 @app.route('/api/document-details/<int:doc_id>')
 @login_required
 def get_document_details(doc_id):
+    """Document summary + its transactions (optionally paged with ?limit=&offset=)"""
     try:
-        document = db.session.get(Document, doc_id)
+        document = db.session.execute(
+            select(Document).where(Document.id == doc_id).options(
+                load_only(*[getattr(Document, name) for name in Document.SUMMARY_COLUMNS],
+                          Document.raw_text),
+                raiseload('*')
+            )
+        ).scalar_one_or_none()
         if not document:
-            return jsonify({'error': 'Document not found'}), 404
-
-        transactions = Transaction.query.filter_by(document_id=doc_id).all()
+            return ojson({'error': 'Document not found'}, 404)
+
+        limit = request.args.get('limit', type=int)
+        offset = request.args.get('offset', 0, type=int)
+
+        # Rows and the full count in one query (the window runs before LIMIT)
+        stmt = select(Transaction, func.count().over().label('total')).where(
+            Transaction.document_id == doc_id
+        ).options(raiseload('*')).order_by(Transaction.id).offset(offset)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        rows = db.session.execute(stmt).all()
+
+        if rows:
+            total = rows[0].total
+        elif offset:
+            total = db.session.scalar(
+                select(func.count()).select_from(Transaction).where(Transaction.document_id == doc_id)
+            )
+        else:
+            total = 0
 
-        return jsonify({
+        return ojson({
             'document': document.to_dict(),
             'raw_text': document.raw_text[:500] if document.raw_text else None,
-            'transactions': [t.to_dict() for t in transactions],
-            'transaction_count': len(transactions)
+            'transactions': Transaction.serialize_many(row.Transaction for row in rows),
+            'transaction_count': total
         })
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojson({'error': str(e)}, 500)
 
-# Document processing
-processor = DocumentProcessingWorkflow()
+# Document processing: the workflow (and its category model) is built on
+# first use via get_workflow(), not when this module is imported
 
 @app.route('/api/process-document/<int:doc_id>', methods=['POST'])
 @login_required
 def process_document(doc_id):
+    """Queue OCR/NLP processing; poll /api/task/<task_id> for the outcome"""
     try:
-        success, message = processor.process_document(doc_id)
-        if success:
-            return jsonify({'success': True, 'message': message})
-        else:
-            return jsonify({'success': False, 'error': message}), 400
+        # Just the flag: the task loads the document itself, in its own session
+        row = db.session.execute(select(Document.processed).where(Document.id == doc_id)).first()
+        if row is None:
+            return ojson({'success': False, 'error': 'Document not found'}, 404)
+        if row.processed:
+            return ojson({'success': False, 'error': 'Document already processed'}, 400)
+
+        task_id = task_queue.enqueue(_process_document_task, doc_id)
+        return ojson({'success': True, 'task_id': task_id, 'status': 'queued'}, 202)
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return ojson({'success': False, 'error': str(e)}, 500)
+
+def _process_document_task(doc_id):
+    """Task body for /api/process-document (runs on the task queue)"""
+    success, message, transaction_count = get_workflow().process_document(doc_id)
+    if success:
+        return {'success': True, 'message': message, 'transaction_count': transaction_count}
+    return {'success': False, 'error': message}
+
+@app.route('/api/task/<task_id>')
+@login_required
+def get_task(task_id):
+    task = task_queue.get(task_id)
+    if not task:
+        return ojson({'success': False, 'error': 'Task not found'}, 404)
+    return ojson({'success': True, 'task': task})
 
 @app.route('/api/process-all-documents', methods=['POST'])
 @login_required
 def process_all_documents():
     try:
-        documents = Document.query.filter_by(processed=False).all()
+        # Ids for the batch, names for its error messages
+        documents = db.session.execute(
+            select(Document.id, Document.original_filename).where(Document.processed == False)
+        ).all()
 
         if not documents:
-            return jsonify({'success': True, 'message': 'No documents to process', 'processed_count': 0})
+            return ojson({'success': True, 'message': 'No documents to process', 'processed_count': 0})
 
-        success_count = 0
-        failed_count = 0
-        errors = []
+        # Extraction overlaps on DOCUMENT_PROCESSING_WORKERS workers; the rows
+        # are written in BATCH_COMMIT_SIZE commits and one summary notification
+        # is sent instead of two per document
+        results = get_workflow().process_multiple_documents([doc.id for doc in documents])
 
-        for doc in documents:
-            success, message = processor.process_document(doc.id)
-            if success:
-                success_count += 1
-            else:
-                failed_count += 1
-                errors.append(f"{doc.original_filename}: {message}")
+        names = dict(documents)
+        success_count = len(results['success'])
+        failed_count = len(results['failed'])
+        transaction_count = results['total_transactions']
+        errors = [f"{names.get(failed['id'], failed['id'])}: {failed['error']}" for failed in results['failed']]
 
-        return jsonify({
+        return ojson({
             'success': True,
             'message': f'Processed {success_count} documents',
             'processed_count': success_count,
             'failed_count': failed_count,
+            'transaction_count': transaction_count,
             'errors': errors
         })
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return ojson({'success': False, 'error': str(e)}, 500)
 
 
 # ============================================================================
 # NLP / CHAT API (legacy endpoint)
 # ============================================================================
 
-nlp_processor = None
-
 @app.route('/api/query', methods=['POST'])
 @login_required
 def process_query():
     try:
-        global nlp_processor
-
-        if nlp_processor is None:
-            print("🔄 Initializing NLP Processor...")
-            nlp_processor = EnhancedSmartNLPProcessor()
-            print("✅ Smart NLP Processor initialized")
+        nlp_processor = get_nlp()
 
         data = request.get_json()
         query = data.get('query', '')
 
         if not query:
-            return jsonify({'success': False, 'error': 'No query provided'}), 400
+            return ojson({'success': False, 'error': 'No query provided'}, 400)
 
-        print(f"\n{'='*60}")
-        print(f"📝 Processing query: {query}")
-        print(f"{'='*60}")
+        logger.debug("Processing query: %s", query)
 
-        result = nlp_processor.process_query_smart(query)
+        with perf_monitor.timer('nlp'):
+            result = nlp_processor.process_query_smart(query)
 
-        print(f"✅ Query processed successfully")
-        print(f"   Intent: {result.get('intent', 'unknown')}")
-        print(f"   Confidence: {result.get('confidence', 0):.1f}%")
-        print(f"   Time: {result.get('processing_time', 'N/A')}")
-        print(f"{'='*60}\n")
+        logger.debug(
+            "Query processed: intent=%s confidence=%.1f%% time=%s",
+            result.get('intent', 'unknown'),
+            result.get('confidence', 0),
+            result.get('processing_time', 'N/A')
+        )
 
-        return jsonify({'success': True, 'result': result})
+        return ojson({'success': True, 'result': result})
 
     except Exception as e:
-        print(f"\n{'='*60}")
-        print(f"❌ QUERY PROCESSING ERROR")
-        print(f"{'='*60}")
-        print(f"Query: {data.get('query', 'N/A') if 'data' in locals() else 'N/A'}")
-        print(f"Error Type: {type(e).__name__}")
-        print(f"Error Message: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        print(f"{'='*60}\n")
-
-        return jsonify({'success': False, 'error': f"{type(e).__name__}: {str(e)}"}), 500
+        logger.error(
+            "Query processing error (query=%r): %s: %s",
+            data.get('query', 'N/A') if 'data' in locals() and data else 'N/A',
+            type(e).__name__, e,
+            exc_info=True
+        )
+
+        return ojson({'success': False, 'error': f"{type(e).__name__}: {str(e)}"}, 500)
 
 @app.route('/api/clear-context', methods=['POST'])
 @login_required
 def clear_context():
     try:
-        global nlp_processor
         if nlp_processor:
             nlp_processor.clear_context()
-        return jsonify({'success': True, 'message': 'Context cleared'})
+        return ojson({'success': True, 'message': 'Context cleared'})
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return ojson({'success': False, 'error': str(e)}, 500)
 
 @app.route('/api/performance-stats')
 @login_required
 def get_performance_stats():
-    return jsonify(perf_monitor.get_stats())
+    return ojson(perf_monitor.get_stats())
 
 
 # ============================================================================
@@ -488,6 +594,57 @@ def get_performance_stats():
 #   /api/transactions/validate-duplicate → validate_duplicate (POST)
 # ============================================================================
 
+# ?start_date=/?end_date= bounds on transaction_date (inclusive ISO dates)
+_DATE_RANGE_ARGS = (('start_date', operator.ge), ('end_date', operator.le))
+
+
+def _date_range_conditions(args):
+    """transaction_date conditions for the date-range args present; raises ValueError"""
+    return [
+        compare(Transaction.transaction_date, date.fromisoformat(args[name]))
+        for name, compare in _DATE_RANGE_ARGS if args.get(name)
+    ]
+
+
+def _parse_transaction_cursor(cursor):
+    """'<YYYY-MM-DD|none>_<id>' -> (date or None, id); raises ValueError"""
+    date_part, _, id_part = cursor.rpartition('_')
+    return (None if date_part == 'none' else date.fromisoformat(date_part)), int(id_part)
+
+
+def _keyset_transactions(query, cursor, per_page):
+    """
+    One page of transactions newest first, seeking past the cursor
+
+    Dated rows come first on an index range scan over (transaction_date, id);
+    rows without a date (unparsed documents) follow, newest id first.
+    Returns (items, next_cursor or None).
+    """
+    cur_date, cur_id = _parse_transaction_cursor(cursor) if cursor else (None, None)
+    items = []
+
+    if cur_id is None or cur_date is not None:
+        dated = query.filter(Transaction.transaction_date.isnot(None))
+        if cur_id is not None:
+            dated = dated.filter(tuple_(Transaction.transaction_date, Transaction.id) < (cur_date, cur_id))
+        items = dated.order_by(
+            Transaction.transaction_date.desc(), Transaction.id.desc()
+        ).limit(per_page + 1).all()
+
+    if len(items) <= per_page:
+        undated = query.filter(Transaction.transaction_date.is_(None))
+        if cur_id is not None and cur_date is None:
+            undated = undated.filter(Transaction.id < cur_id)
+        items += undated.order_by(Transaction.id.desc()).limit(per_page + 1 - len(items)).all()
+
+    if len(items) <= per_page:
+        return items, None
+    items = items[:per_page]
+    last = items[-1]
+    last_date = last.transaction_date.isoformat() if last.transaction_date else 'none'
+    return items, f'{last_date}_{last.id}'
+
+
 @app.route('/api/transactions', methods=['GET', 'POST'])
 @login_required
 def handle_transactions():
@@ -498,97 +655,94 @@ def handle_transactions():
             page = request.args.get('page', 1, type=int)
             per_page = request.args.get('per_page', 20, type=int)
             category_id = request.args.get('category_id', type=int)
-            start_date = request.args.get('start_date')
-            end_date = request.args.get('end_date')
             payment_method = request.args.get('payment_method')
 
-            query = Transaction.query
+            # Plain rows of just the serialized columns: no ORM instances
+            query = db.session.query(*Transaction.api_columns())
 
             if category_id:
                 query = query.filter_by(category_id=category_id)
-            if start_date:
-                query = query.filter(Transaction.transaction_date >= datetime.strptime(start_date, '%Y-%m-%d').date())
-            if end_date:
-                query = query.filter(Transaction.transaction_date <= datetime.strptime(end_date, '%Y-%m-%d').date())
+            try:
+                query = query.filter(*_date_range_conditions(request.args))
+            except ValueError:
+                return ojson({'success': False, 'error': 'Invalid date format. Use YYYY-MM-DD'}, 400)
             if payment_method:
-                query = query.filter_by(payment_method=payment_method)
-
+                query = query.filter_by(payment_method=Transaction.normalize_payment_method(payment_method))
+
+            # Keyset pagination (?cursor=, empty for the first page): no COUNT, no OFFSET
+            if 'cursor' in request.args:
+                try:
+                    items, next_cursor = _keyset_transactions(query, request.args['cursor'], per_page)
+                except ValueError:
+                    return ojson({'success': False, 'error': 'Invalid cursor'}, 400)
+                payload = {
+                    'success': True,
+                    'transactions': Transaction.serialize_many(items),
+                    'next_cursor': next_cursor,
+                    'has_next': next_cursor is not None,
+                    'per_page': per_page
+                }
+                if request.args.get('include_total', type=int):
+                    payload['total'] = query.order_by(None).count()
+                return ojson(payload)
+
+            # Legacy page numbers (the transactions page needs total/pages)
             query = query.order_by(Transaction.transaction_date.desc())
             paginated = query.paginate(page=page, per_page=per_page, error_out=False)
 
-            return jsonify({
+            return ojson({
                 'success': True,
-                'transactions': [t.to_dict() for t in paginated.items],
+                'transactions': Transaction.serialize_many(paginated.items),
                 'total': paginated.total,
                 'page': page,
                 'pages': paginated.pages,
                 'per_page': per_page
             })
         except Exception as e:
-            print(f"❌ Error fetching transactions: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({'success': False, 'error': str(e)}), 500
+            logger.error("Error fetching transactions: %s", e, exc_info=True)
+            return ojson({'success': False, 'error': str(e)}, 500)
 
     # POST
     try:
-        data = request.get_json()
-
-        for field in ['amount', 'vendor_name', 'category_id']:
-            if field not in data or not data[field]:
-                return jsonify({'success': False, 'error': f'Missing required field: {field}'}), 400
-
-        try:
-            amount = float(data['amount'])
-            if amount <= 0:
-                raise ValueError("Amount must be positive")
-        except ValueError as e:
-            return jsonify({'success': False, 'error': f'Invalid amount: {str(e)}'}), 400
-
-        transaction_date = None
-        if data.get('transaction_date'):
-            try:
-                transaction_date = datetime.strptime(data['transaction_date'], '%Y-%m-%d').date()
-            except ValueError:
-                return jsonify({'success': False, 'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        data, error = decode_json(request.get_data(), TransactionCreate)
+        if error:
+            return ojson({'success': False, 'error': error}, 400)
 
-        category = Category.query.get(data['category_id'])
-        if not category:
-            return jsonify({'success': False, 'error': 'Invalid category ID'}), 400
+        if CategoryCache.get(data.category_id) is None:
+            return ojson({'success': False, 'error': 'Invalid category ID'}, 400)
 
         transaction = Transaction(
             document_id=None,
-            transaction_date=transaction_date or datetime.now().date(),
-            amount=amount,
-            currency=data.get('currency', 'INR'),
-            vendor_name=data['vendor_name'].strip(),
-            description=data.get('description', 'Manual entry').strip(),
-            category_id=data['category_id'],
-            payment_method=data.get('payment_method', 'Other'),
-            tax_amount=float(data.get('tax_amount', 0.0)),
-            tax_percentage=float(data.get('tax_percentage', 0.0)) if data.get('tax_percentage') else None
+            transaction_date=data.transaction_date or datetime.now().date(),
+            amount=data.amount,
+            currency=data.currency,
+            vendor_name=data.vendor_name,
+            description=data.description,
+            category_id=data.category_id,
+            payment_method=data.payment_method,
+            tax_amount=data.tax_amount,
+            tax_percentage=data.tax_percentage
         )
 
+        # Insert + budget sync commit together
+        from utils.budget_utils import BudgetUtils
         db.session.add(transaction)
+        budgets = BudgetUtils.stage_budget_periods(BudgetUtils.transaction_periods([transaction]))
         db.session.commit()
+        CacheUtils.bump_transactions_version()
+        BudgetUtils.notify_budget_status(budgets)
 
-        # Auto-sync budget
-        from utils.budget_utils import BudgetUtils
-        BudgetUtils.sync_transaction_budgets(transaction)
-
-        print(f"✅ Transaction created: {transaction.vendor_name} - ₹{transaction.amount}")
+        logger.debug("Transaction created: %s - %s", transaction.vendor_name, transaction.amount)
 
-        return jsonify({
+        return ojson({
             'success': True,
             'message': 'Transaction created successfully',
             'transaction': transaction.to_dict()
         })
     except Exception as e:
         db.session.rollback()
-        print(f"❌ Error creating transaction: {e}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({'success': False, 'error': str(e)}), 500
+        logger.error("Error creating transaction: %s", e, exc_info=True)
+        return ojson({'success': False, 'error': str(e)}, 500)
 
 
 @app.route('/api/transactions/<int:trans_id>', methods=['GET', 'PUT', 'DELETE'])
@@ -596,95 +750,110 @@ def handle_transactions():
 def handle_single_transaction(trans_id):
     """GET: single transaction | PUT: update with budget sync | DELETE: delete with budget sync"""
 
-    transaction = Transaction.query.get(trans_id)
-
-    if not transaction:
-        return jsonify({'success': False, 'error': 'Transaction not found'}), 404
-
-    # ── GET ──────────────────────────────────────────────────────────────────
-    if request.method == 'GET':
-        return jsonify({'success': True, 'transaction': transaction.to_dict()})
-
     # ── PUT ───────────────────────────────────────────────────────────────────
+    # UPDATE ... RETURNING instead of loading the row and flushing changes
     if request.method == 'PUT':
         try:
-            data = request.get_json()
-
-            # Store old values for budget sync
-            old_category_id = transaction.category_id
-            old_date = transaction.transaction_date
-
-            if 'amount' in data:
-                amount = float(data['amount'])
-                if amount <= 0:
-                    return jsonify({'success': False, 'error': 'Amount must be positive'}), 400
-                transaction.amount = amount
-
-            if 'vendor_name' in data:
-                transaction.vendor_name = data['vendor_name'].strip()
-
-            if 'transaction_date' in data:
-                transaction.transaction_date = datetime.strptime(data['transaction_date'], '%Y-%m-%d').date()
-
-            if 'category_id' in data:
-                category = Category.query.get(data['category_id'])
-                if not category:
-                    return jsonify({'success': False, 'error': 'Invalid category ID'}), 400
-                transaction.category_id = data['category_id']
-
-            if 'description' in data:
-                transaction.description = data['description'].strip()
-
-            if 'payment_method' in data:
-                transaction.payment_method = data['payment_method']
-
-            if 'tax_amount' in data:
-                transaction.tax_amount = float(data['tax_amount'])
-
-            transaction.updated_at = datetime.utcnow()
-            db.session.commit()
+            data, error = decode_json(request.get_data(), TransactionUpdate)
+            if error:
+                return ojson({'success': False, 'error': error}, 400)
+            values = data.changes()
+
+            # Nothing to change: an empty UPDATE is invalid SQL, answer with the row as is
+            if not values:
+                transaction = db.session.get(Transaction, trans_id)
+                if transaction is None:
+                    return ojson({'success': False, 'error': 'Transaction not found'}, 404)
+                return ojson({
+                    'success': True,
+                    'message': 'Transaction updated successfully',
+                    'transaction': transaction.to_dict()
+                })
 
-            # Auto-sync affected budgets
+            if 'category_id' in values and CategoryCache.get(values['category_id']) is None:
+                return ojson({'success': False, 'error': 'Invalid category ID'}, 400)
+
+            # The SQLite trigger runs AFTER UPDATE, too late for RETURNING;
+            # setting the column here also makes the trigger skip the row
+            if db.engine.dialect.name == 'sqlite':
+                values['updated_at'] = datetime.utcnow()
+
+            # Moving a transaction also resyncs its previous budget period,
+            # so only then read (and lock) the old category/date first
+            old_category_id = old_date = None
+            if 'category_id' in values or 'transaction_date' in values:
+                old_row = db.session.execute(
+                    select(Transaction.category_id, Transaction.transaction_date)
+                    .where(Transaction.id == trans_id)
+                    .with_for_update()
+                ).one_or_none()
+                if old_row is None:
+                    return ojson({'success': False, 'error': 'Transaction not found'}, 404)
+                old_category_id, old_date = old_row
+
+            transaction = db.session.execute(
+                update(Transaction)
+                .where(Transaction.id == trans_id)
+                .values(**values)
+                .returning(Transaction)
+                # RETURNING does not refresh an instance already in the identity
+                # map; 'evaluate' applies the (literal) values to it in Python
+                .execution_options(synchronize_session='evaluate')
+            ).scalar_one_or_none()
+
+            if transaction is None:
+                db.session.rollback()
+                return ojson({'success': False, 'error': 'Transaction not found'}, 404)
+
+            # Update + old/new budget sync commit together
             from utils.budget_utils import BudgetUtils
-            BudgetUtils.sync_transaction_budgets(
-                transaction,
-                old_category_id=old_category_id,
-                old_date=old_date
-            )
+            periods = BudgetUtils.transaction_periods([transaction])
+            if old_category_id and old_date:
+                periods.add((old_category_id, old_date.month, old_date.year))
+            budgets = BudgetUtils.stage_budget_periods(periods)
+            db.session.commit()
+            CacheUtils.bump_transactions_version()
+            BudgetUtils.notify_budget_status(budgets)
 
-            print(f"✅ Transaction updated: {transaction.id}")
-            return jsonify({
+            logger.debug("Transaction updated: %s", transaction.id)
+            return ojson({
                 'success': True,
                 'message': 'Transaction updated successfully',
                 'transaction': transaction.to_dict()
             })
         except Exception as e:
             db.session.rollback()
-            print(f"❌ Error updating transaction: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({'success': False, 'error': str(e)}), 500
+            logger.error("Error updating transaction: %s", e, exc_info=True)
+            return ojson({'success': False, 'error': str(e)}, 500)
+
+    transaction = db.session.get(Transaction, trans_id)
+
+    if not transaction:
+        return ojson({'success': False, 'error': 'Transaction not found'}, 404)
+
+    # ── GET ──────────────────────────────────────────────────────────────────
+    if request.method == 'GET':
+        return ojson({'success': True, 'transaction': transaction.to_dict()})
 
     # ── DELETE ────────────────────────────────────────────────────────────────
     if request.method == 'DELETE':
         try:
-            # Store values before deletion for budget sync
-            category_id = transaction.category_id
-            transaction_date = transaction.transaction_date
+            # Budget period captured before deletion; delete + sync commit together
+            from utils.budget_utils import BudgetUtils
+            periods = BudgetUtils.transaction_periods([transaction])
 
             db.session.delete(transaction)
+            budgets = BudgetUtils.stage_budget_periods(periods)
             db.session.commit()
+            CacheUtils.bump_transactions_version()
+            BudgetUtils.notify_budget_status(budgets)
 
-            # Auto-sync budget
-            from utils.budget_utils import BudgetUtils
-            BudgetUtils.sync_deleted_transaction_budget(category_id, transaction_date)
-
-            print(f"✅ Transaction deleted: {trans_id}")
-            return jsonify({'success': True, 'message': 'Transaction deleted successfully'})
+            logger.debug("Transaction deleted: %s", trans_id)
+            return ojson({'success': True, 'message': 'Transaction deleted successfully'})
         except Exception as e:
             db.session.rollback()
-            print(f"❌ Error deleting transaction: {e}")
-            return jsonify({'success': False, 'error': str(e)}), 500
+            logger.error("Error deleting transaction: %s", e)
+            return ojson({'success': False, 'error': str(e)}, 500)
 
 
 @app.route('/api/transactions/bulk-delete', methods=['POST'])
@@ -695,23 +864,44 @@ def bulk_delete_transactions():
         transaction_ids = data.get('transaction_ids', [])
 
         if not transaction_ids:
-            return jsonify({'success': False, 'error': 'No transaction IDs provided'}), 400
+            return ojson({'success': False, 'error': 'No transaction IDs provided'}, 400)
 
-        deleted_count = Transaction.query.filter(
-            Transaction.id.in_(transaction_ids)
-        ).delete(synchronize_session=False)
+        try:
+            transaction_ids = [int(trans_id) for trans_id in transaction_ids]
+        except (TypeError, ValueError):
+            return ojson({'success': False, 'error': 'Transaction IDs must be integers'}, 400)
 
+        # One DELETE ... RETURNING gives the budget periods to resync
+        from utils.budget_utils import BudgetUtils
+        deleted = db.session.execute(
+            delete(Transaction)
+            .where(DatabaseUtils.id_in(Transaction.id, transaction_ids))
+            .returning(Transaction.category_id, Transaction.transaction_date)
+            .execution_options(synchronize_session=False)
+        ).all()
+        deleted_count = len(deleted)
+        periods = BudgetUtils.transaction_periods(
+            {'category_id': category_id, 'transaction_date': transaction_date}
+            for category_id, transaction_date in deleted
+        )
+
+        budgets = BudgetUtils.stage_budget_periods(periods)
         db.session.commit()
+        CacheUtils.bump_transactions_version()
+        BudgetUtils.notify_budget_status(budgets)
 
-        return jsonify({
+        return ojson({
             'success': True,
             'message': f'{deleted_count} transactions deleted',
             'deleted_count': deleted_count
         })
     except Exception as e:
         db.session.rollback()
-        print(f"❌ Error in bulk delete: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        logger.exception("Error in bulk delete: %s", e)
+        return ojson({'success': False, 'error': str(e)}, 500)
+
+
+IMPORT_BATCH_SIZE = 1000
 
 
 @app.route('/api/transactions/import', methods=['POST'])
@@ -719,82 +909,121 @@ def bulk_delete_transactions():
 def import_transactions():
     try:
         if 'file' not in request.files:
-            return jsonify({'success': False, 'error': 'No file provided'}), 400
+            return ojson({'success': False, 'error': 'No file provided'}, 400)
 
         file = request.files['file']
         filename = file.filename.lower()
 
         if not filename.endswith('.csv'):
-            return jsonify({'success': False, 'error': 'Unsupported file format. Use CSV'}), 400
+            return ojson({'success': False, 'error': 'Unsupported file format. Use CSV'}, 400)
 
         import csv
-        from io import StringIO
+        from io import TextIOWrapper
+        from utils.budget_utils import BudgetUtils
 
-        stream = StringIO(file.stream.read().decode("UTF8"), newline=None)
+        # Decode/parse lazily from the upload stream (constant memory)
+        stream = TextIOWrapper(file.stream, encoding='utf-8-sig', newline='')
         csv_reader = csv.DictReader(stream)
 
-        transactions_created = 0
+        # Rows are inserted in executemany batches and commit together
+        batch = []
+        periods = set()
         errors = []
+        transactions_created = 0
 
         for row_num, row in enumerate(csv_reader, start=2):
             try:
-                transaction = Transaction(
-                    transaction_date=datetime.strptime(row['date'], '%Y-%m-%d').date(),
-                    amount=float(row['amount']),
-                    vendor_name=row['vendor'],
-                    description=row.get('description', 'Imported from CSV'),
-                    category_id=int(row.get('category_id', 1)),
-                    payment_method=row.get('payment_method', 'Other')
-                )
-                db.session.add(transaction)
-                transactions_created += 1
+                category_id = int(row.get('category_id', 1))
+                if CategoryCache.get(category_id) is None:
+                    raise ValueError(f"invalid category_id {category_id}")
+                batch.append({
+                    'transaction_date': date.fromisoformat(row['date']),
+                    'amount': float(row['amount']),
+                    'vendor_name': row['vendor'],
+                    'description': row.get('description', 'Imported from CSV'),
+                    'category_id': category_id,
+                    'payment_method': Transaction.normalize_payment_method(row.get('payment_method'))
+                })
             except Exception as e:
                 errors.append(f"Row {row_num}: {str(e)}")
+                continue
+
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                db.session.execute(insert(Transaction), batch)
+                periods |= BudgetUtils.transaction_periods(batch)
+                transactions_created += len(batch)
+                batch = []
+
+        if batch:
+            db.session.execute(insert(Transaction), batch)
+            periods |= BudgetUtils.transaction_periods(batch)
+            transactions_created += len(batch)
+        stream.detach()
 
         db.session.commit()
+        CacheUtils.bump_transactions_version()
 
-        # Batch sync all budgets after import
-        from utils.budget_utils import BudgetUtils
-        print("🔄 Syncing all budgets after bulk import...")
-        updated_count = BudgetUtils.sync_all_budgets()
-        print(f"✅ Synced {updated_count} budgets")
+        # Budget recompute + notifications run off the request, as one job
+        # covering every period the import touched
+        budget_task_id = None
+        if periods:
+            budget_task_id = task_queue.enqueue(BudgetUtils.sync_budget_periods, sorted(periods))
+        logger.debug("Imported %d transactions, queued sync of %d budget periods",
+                    transactions_created, len(periods))
 
-        return jsonify({
+        return ojson({
             'success': True,
             'message': f'Imported {transactions_created} transactions',
             'imported_count': transactions_created,
-            'budgets_updated': updated_count,
+            'budget_periods': len(periods),
+            'budget_sync_task_id': budget_task_id,
             'errors': errors
         })
     except Exception as e:
         db.session.rollback()
-        print(f"❌ Error importing transactions: {e}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({'success': False, 'error': str(e)}), 500
+        logger.error("Error importing transactions: %s", e, exc_info=True)
+        return ojson({'success': False, 'error': str(e)}, 500)
+
+
+# Equality on (vendor, amount) + date range: one seek on ix_txn_vendor_amount_date.
+# Built once; the lambda's code location is its whole cache key, so each call
+# skips both statement construction and cache-key traversal.
+_DUPLICATE_STMT = lambda_stmt(lambda: select(*Transaction.api_columns()).where(
+    Transaction.vendor_name == bindparam('vendor'),
+    Transaction.amount == bindparam('amount'),
+    Transaction.transaction_date.between(bindparam('start'), bindparam('end'))
+).limit(5))
 
 
 @app.route('/api/transactions/validate-duplicate', methods=['POST'])
 @login_required
 def validate_duplicate():
+    """Same vendor + amount within a day of transaction_date (default: today)"""
     try:
         data = request.get_json()
 
-        similar = Transaction.query.filter(
-            Transaction.vendor_name == data['vendor_name'],
-            Transaction.amount == float(data['amount'])
-        ).all()
+        try:
+            around = date.fromisoformat(data['transaction_date']) if data.get('transaction_date') else date.today()
+        except ValueError:
+            return ojson({'success': False, 'error': 'Invalid date format. Use YYYY-MM-DD'}, 400)
+
+        similar = db.session.execute(_DUPLICATE_STMT, {
+            'vendor': data['vendor_name'],
+            'amount': float(data['amount']),
+            'start': around - timedelta(days=1),
+            'end': around + timedelta(days=1),
+        }).all()
 
         if similar:
-            return jsonify({
+            return ojson({
                 'success': True,
                 'is_duplicate': True,
-                'similar_transactions': [t.to_dict() for t in similar[:5]]
+                'similar_transactions': Transaction.serialize_many(similar)
             })
         else:
-            return jsonify({'success': True, 'is_duplicate': False})
+            return ojson({'success': True, 'is_duplicate': False})
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return ojson({'success': False, 'error': str(e)}, 500)
     
 @app.before_request
 def log_memory():
@@ -802,11 +1031,11 @@ def log_memory():
     if os.environ.get('FLASK_ENV') == 'production':
         process = psutil.Process()
         memory_mb = process.memory_info().rss / 1024 / 1024
-        print(f"📊 Memory usage: {memory_mb:.1f} MB")
+        logger.info("Memory usage: %.1f MB", memory_mb)
         
         # If approaching limit, force garbage collection
         if memory_mb > 400:  # 400MB on 512MB limit
-            print("⚠️ High memory, forcing cleanup...")
+            logger.warning("High memory (%.1f MB), forcing cleanup...", memory_mb)
             import gc
             gc.collect()
 
@@ -19,10 +19,68 @@ class Config:
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Server database connection pool. Behind pgbouncer (DB_PGBOUNCER=1) the
+    # per-checkout "SELECT 1" ping is redundant: pgbouncer owns the server
+    # connections and pool_recycle retires stale client ones.
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    if DATABASE_URL:
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            "pool_size": int(os.environ.get("DB_POOL_SIZE", 20)),
+            "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", 10)),
+            "pool_recycle": 1800,
+            "pool_pre_ping": os.environ.get("DB_PGBOUNCER", "0") != "1",
+        }
+        # libpq-only connection parameters (postgresql:// or postgresql+driver://)
+        if DATABASE_URL.startswith("postgresql"):
+            SQLALCHEMY_ENGINE_OPTIONS["connect_args"] = {
+                "sslmode": os.environ.get("DB_SSLMODE", "prefer"),
+                "application_name": "finance-ai",
+            }
+
+    # Response cache (per-process SimpleCache unless a Redis URL is provided)
+    CACHE_REDIS_URL = os.environ.get("CACHE_REDIS_URL")
+    CACHE_TYPE = "RedisCache" if CACHE_REDIS_URL else "SimpleCache"
+    CACHE_DEFAULT_TIMEOUT = 60
+
     # Uploads
     UPLOAD_FOLDER = os.path.join(BASE_DIR, "static", "uploads")
+
+    # Internal proxy location for /uploads (e.g. "/_protected_uploads/").
+    # When set, Flask only authorizes the request and nginx streams the file:
+    #   location /_protected_uploads/ { internal; alias <UPLOAD_FOLDER>/; }
+    UPLOAD_ACCEL_REDIRECT_PREFIX = os.environ.get("UPLOAD_ACCEL_REDIRECT_PREFIX")
     MAX_CONTENT_LENGTH = 10 * 1024 * 1024
 
+    # Parallel workers for /api/process-all-documents (OCR is memory hungry).
+    # "process" runs text extraction in a process pool (all cores, no GIL);
+    # "thread" keeps it in this process
+    DOCUMENT_PROCESSING_WORKERS = int(os.environ.get("DOCUMENT_PROCESSING_WORKERS", 4))
+    DOCUMENT_PROCESSING_POOL = os.environ.get("DOCUMENT_PROCESSING_POOL", "thread")
+
+    # Keep the whole extracted text in documents.raw_text instead of its
+    # first few KB (debugging extraction; costs memory per processed page)
+    STORE_FULL_RAW_TEXT = os.environ.get("STORE_FULL_RAW_TEXT", "0") == "1"
+
+    # In-process background task queue (/api/process-document)
+    TASK_QUEUE_WORKERS = int(os.environ.get("TASK_QUEUE_WORKERS", 2))
+    TASK_RESULT_TTL = 3600
+
+    # Preload the NLP models in a background thread at startup (off by default
+    # to keep memory low on small instances)
+    NLP_WARMUP = os.environ.get("NLP_WARMUP", "0") == "1"
+
+    # Profiling: Server-Timing response header (db/nlp/total ms) and, with
+    # FLASK_PROFILE=1, per-request cProfile dumps into PROFILE_DIR
+    SERVER_TIMING = os.environ.get("SERVER_TIMING", "1") == "1"
+    FLASK_PROFILE = os.environ.get("FLASK_PROFILE", "0") == "1"
+    PROFILE_DIR = os.environ.get("PROFILE_DIR", "/tmp/profiles")
+
+    # Application log level (records are written off-thread via a queue)
+    LOG_LEVEL = os.environ.get(
+        "LOG_LEVEL",
+        "WARNING" if os.environ.get("FLASK_ENV") == "production" else "INFO"
+    )
+
     # ✅ SESSION / COOKIE FIX (CRITICAL)
     SESSION_COOKIE_SECURE = True
     SESSION_COOKIE_HTTPONLY = True
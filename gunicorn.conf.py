@@ -0,0 +1,23 @@
+"""
+Gunicorn Server Hooks
+Picked up automatically by `gunicorn app:app` from the working directory;
+the command-line flags in the Dockerfile still take precedence.
+
+Under the gevent worker, sockets are monkey-patched but psycopg2 is a C
+extension and blocks the whole event loop while PostgreSQL works. Installing
+psycogreen's wait callback makes every query yield, so one worker keeps
+serving other requests during a CSV import commit or a bulk delete.
+"""
+
+
+def post_fork(server, worker):
+    """Make psycopg2 cooperative when running gevent workers"""
+    if server.cfg.worker_class_str != 'gevent':
+        return
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:
+        server.log.warning("psycogreen not installed; PostgreSQL queries will block the gevent loop")
+        return
+    patch_psycopg()
+    server.log.info("psycopg2 patched for gevent (worker %s)", worker.pid)
@@ -7,7 +7,7 @@ import re
 import imaplib
 import email
 from email.header import decode_header
-from datetime import datetime, timedelta
+from datetime import datetime, date, timedelta
 from decimal import Decimal
 from typing import List, Dict, Optional, Tuple
 import hashlib
@@ -423,6 +423,9 @@ class HDFCEmailParser:
 class HDFCTransactionSync:
     """Sync HDFC email transactions to database"""
     
+    # Rows per executemany INSERT
+    INSERT_BATCH_SIZE = 1000
+    
     def __init__(self, db_session, category_predictor=None):
         self.db = db_session
         self.category_predictor = category_predictor
@@ -435,7 +438,7 @@ class HDFCTransactionSync:
             Summary of sync operation
         """
         from models.transaction import Transaction
-        from models.category import Category
+        from sqlalchemy import insert
         
         stats = {
             'total': len(parsed_transactions),
@@ -447,10 +450,15 @@ class HDFCTransactionSync:
         
         print(f"\n🔄 Syncing {stats['total']} transactions...")
         
+        # Rows are buffered as plain dicts and written with executemany
+        # INSERTs; duplicates within this run are caught via `pending`
+        mappings = []
+        pending = set()
+        
         for trans_data in parsed_transactions:
             try:
                 # Check for duplicates
-                if self._is_duplicate(trans_data):
+                if self._pending_key(trans_data) & pending or self._is_duplicate(trans_data):
                     stats['duplicates'] += 1
                     print(f"   ⏭️  Skipped duplicate: {trans_data.get('vendor_name')}")
                     continue
@@ -458,23 +466,22 @@ class HDFCTransactionSync:
                 # Predict category using AI
                 category_id = self._predict_category(trans_data)
                 
-                # Create transaction
-                transaction = Transaction(
-                    transaction_date=datetime.strptime(trans_data['transaction_date'], '%Y-%m-%d').date(),
-                    amount=trans_data['amount'],
-                    currency='INR',
-                    vendor_name=trans_data['vendor_name'],
-                    description=f"HDFC: {trans_data.get('email_subject', 'Auto-imported')[:100]}",
-                    category_id=category_id,
-                    payment_method=trans_data.get('payment_method', 'Other'),
-                    reference_number=trans_data.get('reference_number'),
-                    account_number=trans_data.get('account_number'),
-                    transaction_hash=trans_data.get('transaction_hash'),
-                    transaction_type=trans_data.get('transaction_type', 'debit'),
-                    source='hdfc_email'
-                )
-                
-                self.db.add(transaction)
+                # Transaction row
+                mappings.append({
+                    'transaction_date': date.fromisoformat(trans_data['transaction_date']),
+                    'amount': trans_data['amount'],
+                    'currency': 'INR',
+                    'vendor_name': trans_data['vendor_name'],
+                    'description': f"HDFC: {trans_data.get('email_subject', 'Auto-imported')[:100]}",
+                    'category_id': category_id,
+                    'payment_method': trans_data.get('payment_method', 'Other'),
+                    'reference_number': trans_data.get('reference_number'),
+                    'account_number': trans_data.get('account_number'),
+                    'transaction_hash': trans_data.get('transaction_hash'),
+                    'transaction_type': trans_data.get('transaction_type', 'debit'),
+                    'source': 'hdfc_email'
+                })
+                pending |= self._pending_key(trans_data)
                 stats['added'] += 1
                 
                 print(f"   ✅ Added: ₹{trans_data['amount']} - {trans_data['vendor_name']}")
@@ -486,20 +493,22 @@ class HDFCTransactionSync:
                 print(f"   ❌ Error: {error_msg}")
                 continue
         
-        # Commit all transactions
+        # Insert and commit all transactions
         try:
+            for start in range(0, len(mappings), self.INSERT_BATCH_SIZE):
+                self.db.execute(insert(Transaction), mappings[start:start + self.INSERT_BATCH_SIZE])
             self.db.commit()
             print(f"\n✅ Sync complete!")
             print(f"   Added: {stats['added']}")
             print(f"   Duplicates: {stats['duplicates']}")
             print(f"   Errors: {stats['errors']}")
             
-            # Auto-sync budgets
+            # Auto-sync the budgets of the periods these transactions touch
             if stats['added'] > 0:
                 try:
                     from utils.budget_utils import BudgetUtils
                     print("\n🔄 Syncing budgets...")
-                    updated = BudgetUtils.sync_all_budgets()
+                    updated = BudgetUtils.sync_transaction_budgets_bulk(mappings)
                     print(f"✅ Updated {updated} budgets")
                 except Exception as e:
                     print(f"⚠️  Budget sync skipped: {e}")
@@ -512,6 +521,15 @@ class HDFCTransactionSync:
         
         return stats
     
+    @staticmethod
+    def _pending_key(trans_data: Dict) -> set:
+        """Keys _is_duplicate() would match a row on, for rows not yet inserted"""
+        keys = {('amount', trans_data.get('amount'), trans_data.get('vendor_name'),
+                 trans_data.get('transaction_date'))}
+        if trans_data.get('transaction_hash'):
+            keys.add(('hash', trans_data['transaction_hash']))
+        return keys
+    
     def _is_duplicate(self, trans_data: Dict) -> bool:
         """Check if transaction already exists"""
         from models.transaction import Transaction
@@ -528,7 +546,7 @@ class HDFCTransactionSync:
             existing = Transaction.query.filter_by(
                 amount=trans_data['amount'],
                 vendor_name=trans_data['vendor_name'],
-                transaction_date=datetime.strptime(trans_data['transaction_date'], '%Y-%m-%d').date()
+                transaction_date=date.fromisoformat(trans_data['transaction_date'])
             ).first()
             
             return existing is not None
@@ -561,21 +579,21 @@ class HDFCTransactionSync:
         except Exception as e:
             print(f"      ⚠️  Categorization error: {e}")
             # Fallback to simple categorization
-            from models.category import Category
+            from utils.category_cache import CategoryCache
             
             vendor_lower = trans_data.get('vendor_name', '').lower()
             
             # Quick fallback rules
             if any(kw in vendor_lower for kw in ['hospital', 'clinic', 'medical', 'doctor']):
-                cat = Category.query.filter_by(name='Healthcare').first()
-                if cat:
-                    return cat.id
+                cat_id = CategoryCache.get_id_by_name('Healthcare')
+                if cat_id:
+                    return cat_id
             
             if any(kw in vendor_lower for kw in ['swiggy', 'zomato', 'food', 'sweets']):
-                cat = Category.query.filter_by(name='Food & Dining').first()
-                if cat:
-                    return cat.id
+                cat_id = CategoryCache.get_id_by_name('Food & Dining')
+                if cat_id:
+                    return cat_id
             
             # Default: Uncategorized
-            cat = Category.query.filter_by(name='Uncategorized').first()
-            return cat.id if cat else 1
\ No newline at end of file
+            cat_id = CategoryCache.get_id_by_name('Uncategorized')
+            return cat_id if cat_id else 1
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""
+Add Document Content Hash
+Adds documents.content_sha256 (used to deduplicate re-uploaded files)
+to databases created before the column existed
+Run this once: python migrate_document_hash.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app import app, db
+from models.document import Document
+from sqlalchemy import inspect, text
+
+
+def add_document_hash_column():
+    """Add the content_sha256 column and its index to documents"""
+
+    print("\n" + "="*60)
+    print("🔄 ADDING DOCUMENT CONTENT HASH")
+    print("="*60 + "\n")
+
+    with app.app_context():
+        try:
+            columns = [col['name'] for col in inspect(db.engine).get_columns('documents')]
+
+            if 'content_sha256' in columns:
+                print("✅ Column 'content_sha256' already exists")
+            else:
+                with db.engine.connect() as conn:
+                    conn.execute(text("ALTER TABLE documents ADD COLUMN content_sha256 VARCHAR(64)"))
+                    conn.commit()
+                print("✅ Added 'content_sha256' column to documents")
+
+            for index in Document.__table__.indexes:
+                if 'content_sha256' in index.columns:
+                    index.create(bind=db.engine, checkfirst=True)
+                    print(f"✅ Index {index.name} ready")
+
+            print("\nExisting documents keep a NULL hash and are never matched as duplicates.")
+            print("\n" + "="*60 + "\n")
+            return True
+
+        except Exception as e:
+            print(f"\n❌ FAILED!")
+            print(f"Error: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+if __name__ == '__main__':
+    success = add_document_hash_column()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,51 @@
+"""
+Add Document Text Length
+Adds documents.text_length (length of the full extracted text, now that
+raw_text only keeps its head) to databases created before the column existed
+Run this once: python migrate_document_text_length.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app import app, db
+from sqlalchemy import inspect, text
+
+
+def add_document_text_length_column():
+    """Add the text_length column to documents"""
+
+    print("\n" + "="*60)
+    print("🔄 ADDING DOCUMENT TEXT LENGTH")
+    print("="*60 + "\n")
+
+    with app.app_context():
+        try:
+            columns = [col['name'] for col in inspect(db.engine).get_columns('documents')]
+
+            if 'text_length' in columns:
+                print("✅ Column 'text_length' already exists")
+            else:
+                with db.engine.connect() as conn:
+                    conn.execute(text("ALTER TABLE documents ADD COLUMN text_length INTEGER"))
+                    # Documents processed before streaming stored their full text
+                    conn.execute(text(
+                        "UPDATE documents SET text_length = LENGTH(raw_text) WHERE raw_text IS NOT NULL"
+                    ))
+                    conn.commit()
+                print("✅ Added 'text_length' column to documents")
+
+            print("\n" + "="*60 + "\n")
+            return True
+
+        except Exception as e:
+            print(f"\n❌ FAILED!")
+            print(f"Error: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+if __name__ == '__main__':
+    success = add_document_text_length_column()
+    sys.exit(0 if success else 1)
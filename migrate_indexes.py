@@ -0,0 +1,67 @@
+"""
+Add Aggregation Indexes
+Creates the transaction/document indexes declared on the models for
+databases that were created before they existed
+Run this once: python migrate_indexes.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app import app, db
+from models.transaction import Transaction
+from models.document import Document
+from sqlalchemy import text
+
+SUPERSEDED_INDEXES = (
+    'ix_txn_vendor_amount',  # -> ix_txn_vendor_amount_date
+    'ix_txn_date',           # -> ix_txn_date_id
+)
+
+
+def add_aggregation_indexes():
+    """Create missing indexes on transactions and documents"""
+
+    print("\n" + "="*60)
+    print("🔄 ADDING AGGREGATION INDEXES")
+    print("="*60 + "\n")
+
+    with app.app_context():
+        try:
+            for model in (Transaction, Document):
+                for index in model.__table__.indexes:
+                    print(f"🔧 {model.__tablename__}.{index.name}")
+                    index.create(bind=db.engine, checkfirst=True)
+
+            # Indexes replaced by wider composites declared on the models
+            with db.engine.connect() as conn:
+                for name in SUPERSEDED_INDEXES:
+                    conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+                conn.commit()
+
+            # Refresh planner statistics so the new indexes are picked up
+            with db.engine.connect() as conn:
+                conn.execute(text("ANALYZE"))
+                conn.commit()
+
+            print("\n" + "="*60)
+            print("✅ INDEXES ADDED SUCCESSFULLY!")
+            print("="*60)
+            if db.engine.dialect.name == 'postgresql':
+                print("\nVerify with: EXPLAIN ANALYZE on /api/vendors/top's query")
+                print("(expect an Index Only Scan on ix_txn_vendor_amount_date)")
+            print("\n" + "="*60 + "\n")
+
+            return True
+
+        except Exception as e:
+            print(f"\n❌ FAILED!")
+            print(f"Error: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+if __name__ == '__main__':
+    success = add_aggregation_indexes()
+    sys.exit(0 if success else 1)
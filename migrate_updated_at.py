@@ -0,0 +1,50 @@
+"""
+Add updated_at Trigger
+Installs the database trigger that maintains transactions.updated_at
+(UPDATED_AT_TRIGGER_DDL on the model) for databases created before it existed
+Run this once: python migrate_updated_at.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app import app, db
+from models.transaction import UPDATED_AT_TRIGGER_DDL
+from sqlalchemy import text
+
+
+def add_updated_at_trigger():
+    """Create the transactions.updated_at trigger for the current dialect"""
+
+    print("\n" + "="*60)
+    print("🔄 ADDING updated_at TRIGGER")
+    print("="*60 + "\n")
+
+    with app.app_context():
+        try:
+            dialect = db.engine.dialect.name
+            statements = UPDATED_AT_TRIGGER_DDL.get(dialect)
+            if not statements:
+                print(f"❌ No trigger defined for dialect '{dialect}'")
+                return False
+
+            with db.engine.connect() as conn:
+                for statement in statements:
+                    conn.execute(text(statement))
+                conn.commit()
+
+            print(f"✅ trg_transactions_updated_at installed ({dialect})")
+            print("\n" + "="*60 + "\n")
+            return True
+
+        except Exception as e:
+            print(f"\n❌ FAILED!")
+            print(f"Error: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+if __name__ == '__main__':
+    success = add_updated_at_trigger()
+    sys.exit(0 if success else 1)
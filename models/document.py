@@ -4,6 +4,14 @@ from datetime import datetime
 class Document(db.Model):
     """Uploaded document model"""
     __tablename__ = 'documents'
+    
+    # Partial index: only the (small) unprocessed backlog is indexed
+    __table_args__ = (
+        db.Index('ix_doc_unprocessed', 'processed',
+                 postgresql_where=db.text('processed = false'),
+                 sqlite_where=db.text('processed = 0')),
+    )
+    
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)
     id = db.Column(db.Integer, primary_key=True)
     filename = db.Column(db.String(255), nullable=False)
@@ -12,7 +20,9 @@ class Document(db.Model):
     file_path = db.Column(db.String(500), nullable=False)
     upload_date = db.Column(db.DateTime, default=datetime.utcnow)
     processed = db.Column(db.Boolean, default=False)
-    raw_text = db.Column(db.Text)
+    raw_text = db.deferred(db.Column(db.Text))  # OCR text head; loaded only when accessed
+    text_length = db.Column(db.Integer)  # length of the full extracted text
+    content_sha256 = db.Column(db.String(64), index=True)  # dedup of re-uploads
     
     # Relationship to transactions
     transactions = db.relationship('Transaction', backref='document', lazy=True, cascade='all, delete-orphan')
@@ -20,12 +30,20 @@ class Document(db.Model):
     def __repr__(self):
         return f'<Document {self.original_filename}>'
     
-    def to_dict(self):
+    # Columns needed by to_dict(); list endpoints select only these
+    SUMMARY_COLUMNS = ('id', 'filename', 'original_filename', 'file_type', 'upload_date', 'processed')
+    
+    @staticmethod
+    def summary_dict(row):
+        """Serialize a Document or a row selected with SUMMARY_COLUMNS"""
         return {
-            'id': self.id,
-            'filename': self.filename,
-            'original_filename': self.original_filename,
-            'file_type': self.file_type,
-            'upload_date': self.upload_date.strftime('%Y-%m-%d %H:%M:%S'),
-            'processed': self.processed
-        }
\ No newline at end of file
+            'id': row.id,
+            'filename': row.filename,
+            'original_filename': row.original_filename,
+            'file_type': row.file_type,
+            'upload_date': row.upload_date.strftime('%Y-%m-%d %H:%M:%S'),
+            'processed': row.processed
+        }
+    
+    def to_dict(self):
+        return Document.summary_dict(self)
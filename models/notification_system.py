@@ -7,6 +7,9 @@ from models.database import db
 from datetime import datetime
 from sqlalchemy import desc
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 class Notification(db.Model):
     """Notification model"""
@@ -101,12 +104,12 @@ class NotificationManager:
             db.session.add(notification)
             db.session.commit()
             
-            print(f"✅ Notification created: {title}")
+            logger.debug("Notification created: %s", title)
             return notification
             
         except Exception as e:
             db.session.rollback()
-            print(f"❌ Error creating notification: {e}")
+            logger.error("Error creating notification: %s", e)
             return None
     
     @staticmethod
@@ -191,20 +194,26 @@ class BudgetNotificationManager:
     def check_and_notify_budget_status(budget):
         """Check budget status and create appropriate notifications"""
         percentage = budget.percentage_used
+        if percentage < 75:
+            return
+        
+        # Name from the category snapshot: no lazy category load per budget
+        from utils.category_cache import CategoryCache
+        category_name = CategoryCache.get(budget.category_id) or 'Unknown'
         
         # 100%+ Over budget
         if percentage >= 100:
             NotificationManager.create_notification(
                 type='budget_exceeded',
                 severity='danger',
-                title=f'🚨 Budget Exceeded: {budget.category.name}',
-                message=f'You have exceeded your {budget.category.name} budget by ₹{abs(budget.remaining):,.2f}. Consider reviewing your spending.',
+                title=f'🚨 Budget Exceeded: {category_name}',
+                message=f'You have exceeded your {category_name} budget by ₹{abs(budget.remaining):,.2f}. Consider reviewing your spending.',
                 related_type='budget',
                 related_id=budget.id,
                 action_url=f'/budgets?highlight={budget.id}',
                 action_label='View Budget',
                 extra_data={
-                    'category': budget.category.name,
+                    'category': category_name,
                     'budget_amount': budget.amount,
                     'spent': budget.spent,
                     'percentage': percentage
@@ -216,14 +225,14 @@ class BudgetNotificationManager:
             NotificationManager.create_notification(
                 type='budget_warning',
                 severity='warning',
-                title=f'⚠️ Budget Alert: {budget.category.name}',
-                message=f'You have used {percentage}% of your {budget.category.name} budget. Only ₹{budget.remaining:,.2f} remaining.',
+                title=f'⚠️ Budget Alert: {category_name}',
+                message=f'You have used {percentage}% of your {category_name} budget. Only ₹{budget.remaining:,.2f} remaining.',
                 related_type='budget',
                 related_id=budget.id,
                 action_url=f'/budgets?highlight={budget.id}',
                 action_label='View Budget',
                 extra_data={
-                    'category': budget.category.name,
+                    'category': category_name,
                     'budget_amount': budget.amount,
                     'spent': budget.spent,
                     'percentage': percentage
@@ -235,14 +244,14 @@ class BudgetNotificationManager:
             NotificationManager.create_notification(
                 type='budget_approaching',
                 severity='info',
-                title=f'ℹ️ Budget Update: {budget.category.name}',
-                message=f'You have used {percentage}% of your {budget.category.name} budget.',
+                title=f'ℹ️ Budget Update: {category_name}',
+                message=f'You have used {percentage}% of your {category_name} budget.',
                 related_type='budget',
                 related_id=budget.id,
                 action_url=f'/budgets?highlight={budget.id}',
                 action_label='View Budget',
                 extra_data={
-                    'category': budget.category.name,
+                    'category': category_name,
                     'budget_amount': budget.amount,
                     'spent': budget.spent,
                     'percentage': percentage
@@ -252,6 +261,7 @@ class BudgetNotificationManager:
     @staticmethod
     def notify_transaction_added(transaction):
         """Notify when a transaction is added"""
+        from utils.category_cache import CategoryCache
         NotificationManager.create_notification(
             type='transaction_added',
             severity='success',
@@ -264,7 +274,7 @@ class BudgetNotificationManager:
             extra_data={
                 'amount': transaction.amount,
                 'vendor': transaction.vendor_name,
-                'category': transaction.category.name if transaction.category else 'Uncategorized'
+                'category': CategoryCache.get(transaction.category_id) or 'Uncategorized'
             }
         )
     
@@ -286,6 +296,26 @@ class BudgetNotificationManager:
             }
         )
     
+    @staticmethod
+    def notify_batch_processed(document_count, transaction_count, failed_count=0):
+        """One summary notification for a batch of processed documents"""
+        message = f'Successfully processed {document_count} document(s), extracted {transaction_count} transaction(s)'
+        if failed_count:
+            message += f'. {failed_count} document(s) failed.'
+        NotificationManager.create_notification(
+            type='batch_processing_complete',
+            severity='success',
+            title='📄 Batch Processing Complete',
+            message=message,
+            action_url='/upload',
+            action_label='View Documents',
+            extra_data={
+                'document_count': document_count,
+                'transaction_count': transaction_count,
+                'failed_count': failed_count
+            }
+        )
+    
     @staticmethod
     def notify_monthly_summary(month, year, total_spent, budget_exceeded_count):
         """Notify with monthly summary"""
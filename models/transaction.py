@@ -5,11 +5,27 @@ Replace your existing models/transaction.py with this
 
 from models.database import db
 from datetime import datetime
+from operator import attrgetter
+from sqlalchemy import DDL, FetchedValue, event
 
 class Transaction(db.Model):
     """Extracted transaction model with bank sync support"""
     __tablename__ = 'transactions'
     
+    # Indexes for the dashboard aggregation hot paths
+    __table_args__ = (
+        # Duplicate check seek (vendor, amount, date range); also covers the
+        # vendor GROUP BY (index-only scan for /api/vendors/top)
+        db.Index('ix_txn_vendor_amount_date', 'vendor_name', 'amount', 'transaction_date'),
+        # Recent/monthly range scans and keyset pagination on (date, id)
+        # (btree is scanned backwards for DESC)
+        db.Index('ix_txn_date_id', 'transaction_date', 'id'),
+        # Category breakdown and budget sync (category + period)
+        db.Index('ix_txn_category_date', 'category_id', 'transaction_date'),
+        # Document details / cascade deletes
+        db.Index('ix_txn_document', 'document_id'),
+    )
+    
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)
     id = db.Column(db.Integer, primary_key=True)
     document_id = db.Column(db.Integer, db.ForeignKey('documents.id'), nullable=True)
@@ -57,7 +73,9 @@ class Transaction(db.Model):
     # ============================================================================
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Maintained by the database (UPDATED_AT_TRIGGER_DDL), so Core UPDATEs and
+    # raw SQL keep it current too
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, server_onupdate=FetchedValue())
     
     # Soft delete flag (optional - for keeping history)
     is_deleted = db.Column(db.Boolean, default=False)
@@ -93,6 +111,57 @@ class Transaction(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
     
+    # API key -> attribute, for serialize_many() (same payload as to_dict())
+    API_FIELDS = (
+        ('id', 'id'), ('document_id', 'document_id'), ('date', 'transaction_date'),
+        ('amount', 'amount'), ('currency', 'currency'), ('vendor', 'vendor_name'),
+        ('description', 'description'), ('category_id', 'category_id'),
+        ('payment_method', 'payment_method'), ('tax_amount', 'tax_amount'),
+        ('tax_percentage', 'tax_percentage'), ('source', 'source'),
+        ('reference_number', 'reference_number'), ('account_number', 'account_number'),
+        ('transaction_type', 'transaction_type'), ('transaction_hash', 'transaction_hash'),
+        ('created_at', 'created_at'), ('updated_at', 'updated_at'),
+    )
+    _API_KEYS = tuple(key for key, _ in API_FIELDS)
+    _API_GETTER = attrgetter(*(attr for _, attr in API_FIELDS))
+    
+    # Labels offered by the transactions form. Writes and the list filter
+    # fold case onto these, so equality on the stored string is exact
+    PAYMENT_METHODS = ('Cash', 'Card', 'UPI', 'Net Banking', 'Wallet', 'Other')
+    _PAYMENT_METHOD_LABELS = {method.lower(): method for method in PAYMENT_METHODS}
+    
+    @staticmethod
+    def normalize_payment_method(value):
+        """Canonical label for a known method (any case), else the stripped value; '' -> 'Other'"""
+        value = (value or '').strip()
+        return Transaction._PAYMENT_METHOD_LABELS.get(value.lower(), value) or 'Other'
+    
+    @classmethod
+    def api_columns(cls):
+        """Columns for a row query that serialize_many() can consume directly"""
+        return [getattr(cls, attr) for _, attr in cls.API_FIELDS]
+    
+    @staticmethod
+    def serialize_many(transactions):
+        """
+        Serialize a list of transactions (or rows with the API_FIELDS columns)
+        for an orjson response
+        
+        One precompiled attrgetter call per row instead of to_dict()'s
+        attribute-by-attribute build. Dates/datetimes are left as objects;
+        orjson renders them exactly as to_dict() formats them. Category names
+        come from CategoryCache, so no relationship is loaded.
+        """
+        from utils.category_cache import CategoryCache
+        
+        keys, getter = Transaction._API_KEYS, Transaction._API_GETTER
+        result = []
+        for t in transactions:
+            item = dict(zip(keys, getter(t)))
+            item['category'] = CategoryCache.get(item['category_id']) or 'Uncategorized'
+            result.append(item)
+        return result
+    
     def to_dict_detailed(self):
         """Detailed dictionary with relationships"""
         base = self.to_dict()
@@ -226,6 +295,49 @@ class Transaction(db.Model):
         db.session.commit()
 
 
+# updated_at trigger per dialect. PostgreSQL sets it BEFORE UPDATE (so
+# UPDATE ... RETURNING sees the new value); SQLite has no NEW assignment and
+# rewrites the row AFTER UPDATE unless the statement set updated_at itself,
+# so RETURNING there still carries the old value: SQLite callers that return
+# the row set updated_at explicitly.
+UPDATED_AT_TRIGGER_DDL = {
+    'postgresql': (
+        """
+        CREATE OR REPLACE FUNCTION transactions_set_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at = timezone('utc', now());
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        "DROP TRIGGER IF EXISTS trg_transactions_updated_at ON transactions",
+        """
+        CREATE TRIGGER trg_transactions_updated_at
+        BEFORE UPDATE ON transactions
+        FOR EACH ROW EXECUTE FUNCTION transactions_set_updated_at()
+        """,
+    ),
+    'sqlite': (
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_updated_at
+        AFTER UPDATE ON transactions
+        FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+        BEGIN
+            UPDATE transactions SET updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now')
+            WHERE id = NEW.id;
+        END
+        """,
+    ),
+}
+
+for _dialect, _statements in UPDATED_AT_TRIGGER_DDL.items():
+    for _statement in _statements:
+        event.listen(
+            Transaction.__table__, 'after_create',
+            DDL(_statement.replace('%', '%%')).execute_if(dialect=_dialect)  # DDL %-formats
+        )
+
+
 # ============================================================================
 # DATABASE MIGRATION HELPER
 # ============================================================================
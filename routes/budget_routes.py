@@ -12,6 +12,7 @@ from models.transaction import Transaction
 from datetime import datetime
 from sqlalchemy import and_, extract, func
 from utils.budget_utils import BudgetUtils
+from utils.category_cache import CategoryCache
 
 
 budget_bp = Blueprint('budgets', __name__, url_prefix='/api/budgets')
@@ -120,8 +121,7 @@ def create_budget():
             }), 400
         
         # Check if category exists
-        category = db.session.get(Category, data['category_id'])
-        if not category:
+        if CategoryCache.get(data['category_id']) is None:
             return jsonify({
                 'success': False,
                 'error': 'Category not found'
@@ -10,6 +10,7 @@ from flask_login import login_required, current_user
 from models.database import db
 from integrations.hdfc_email_parser import HDFCEmailParser, HDFCTransactionSync
 from models.bank_credentials import CredentialManager
+from utils.cache_utils import CacheUtils
 from datetime import datetime
 
 # Create blueprint
@@ -113,6 +114,8 @@ def sync_transactions():
         # Sync to database with user_id
         sync_engine = HDFCTransactionSync(db.session, current_user.id)
         stats = sync_engine.sync_transactions(transactions)
+        if stats.get('added'):
+            CacheUtils.bump_transactions_version()
         
         # Update last sync time
         CredentialManager.update_last_sync(current_user.id)
@@ -17,8 +17,14 @@ from flask import Blueprint, jsonify, request, send_file
 from flask_login import login_required, current_user
 from ai_modules.report_generator import ReportGenerator
 from ai_modules.pdf_generator import PDFGenerator
-from datetime import datetime
+from utils.cache_utils import cached_view, etag_view, CacheUtils
+from cachetools import TTLCache
+from datetime import datetime, date, timedelta
+import base64
+import hashlib
 import logging
+import tempfile
+import threading
 import traceback
 
 logger = logging.getLogger(__name__)
@@ -26,9 +32,97 @@ logger = logging.getLogger(__name__)
 # Create blueprint
 report_bp = Blueprint('reports', __name__, url_prefix='/api/reports')
 
+CHART_CACHE_TIMEOUT = 3600
+CHART_CACHE_BYTES = 16 * 1024 * 1024
+REPORT_CACHE_TIMEOUT = 3600
+
+# Decoded chart PNGs are kept out of the shared response cache: they are large
+# and would push the small JSON entries (and the transactions version stamp)
+# out of it. This per-process cache is bounded by total bytes, not entries.
+_chart_cache = TTLCache(maxsize=CHART_CACHE_BYTES, ttl=CHART_CACHE_TIMEOUT, getsizeof=len)
+_chart_cache_lock = threading.Lock()
+
+
+def _month_end(year, month):
+    """Last day of the given month"""
+    return date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+
+
+def _monthly_period(args):
+    """Resolved (start, end) days of a monthly report request, None if invalid"""
+    year = args.get('year', type=int)
+    month = args.get('month', type=int)
+    if not year or not month or not (1 <= month <= 12):
+        return None
+    try:
+        return date(year, month, 1), _month_end(year, month)
+    except ValueError:
+        return None
+
+
+def _quarterly_period(args):
+    """Resolved (start, end) days of a quarterly report request, None if invalid"""
+    year = args.get('year', type=int)
+    quarter = args.get('quarter', type=int)
+    if not year or not quarter or not (1 <= quarter <= 4):
+        return None
+    try:
+        return date(year, quarter * 3 - 2, 1), _month_end(year, quarter * 3)
+    except ValueError:
+        return None
+
+
+def _custom_period(args):
+    """Resolved (start, end) days of a custom report request, None if invalid"""
+    try:
+        return (date.fromisoformat(args.get('start_date', '')[:10]),
+                date.fromisoformat(args.get('end_date', '')[:10]))
+    except ValueError:
+        return None
+
+
+def _period_key(period):
+    """Period bounds plus today's date: reports are rebuilt at least daily"""
+    start, end = period or ('', '')
+    return f'{start}/{end}/d{date.today().isoformat()}'
+
+
+def _report_version(resolve_period):
+    """etag_view version_func keyed on the resolved period, not the raw query string"""
+    def version():
+        period_key = _period_key(resolve_period(request.args)).replace('/', '-')
+        return f'{CacheUtils.get_transactions_version()}-{period_key}'
+    return version
+
+
+def _decode_charts(charts_base64):
+    """
+    Decode chart data URIs to PNG bytes, reusing cached bytes for charts
+    seen recently (re-exports and retries send the same images)
+    """
+    charts = {}
+    for name, data in charts_base64.items():
+        if not isinstance(data, str) or not data:
+            continue
+        key = hashlib.blake2b(data.encode(), digest_size=16).digest()
+        with _chart_cache_lock:
+            png = _chart_cache.get(key)
+        if png is None:
+            try:
+                png = base64.b64decode(data.partition(',')[2] if data.startswith('data:') else data)
+            except ValueError:
+                logger.warning("Could not decode chart image: %s", name)
+                continue
+            if len(png) <= CHART_CACHE_BYTES:
+                with _chart_cache_lock:
+                    _chart_cache[key] = png
+        charts[name] = png
+    return charts
+
 
 @report_bp.route('/monthly', methods=['GET'])
 @login_required
+@etag_view(_report_version(_monthly_period), bucket_seconds=None)
 def monthly_report():
     """Generate monthly report"""
     try:
@@ -49,7 +143,11 @@ def monthly_report():
             }), 400
         
         # FIX: Removed current_user.id — method only takes (year, month)
-        report = ReportGenerator.generate_monthly_report(year, month)
+        report = CacheUtils.get_or_build(
+            f'report/monthly/{_period_key(_monthly_period(request.args))}',
+            lambda: ReportGenerator.generate_monthly_report(year, month),
+            timeout=REPORT_CACHE_TIMEOUT
+        )
         
         return jsonify({
             'success': True,
@@ -67,6 +165,7 @@ def monthly_report():
 
 @report_bp.route('/quarterly', methods=['GET'])
 @login_required
+@etag_view(_report_version(_quarterly_period), bucket_seconds=None)
 def quarterly_report():
     """Generate quarterly report"""
     try:
@@ -87,7 +186,11 @@ def quarterly_report():
             }), 400
         
         # FIX: Removed current_user.id — method only takes (year, quarter)
-        report = ReportGenerator.generate_quarterly_report(year, quarter)
+        report = CacheUtils.get_or_build(
+            f'report/quarterly/{_period_key(_quarterly_period(request.args))}',
+            lambda: ReportGenerator.generate_quarterly_report(year, quarter),
+            timeout=REPORT_CACHE_TIMEOUT
+        )
         
         return jsonify({
             'success': True,
@@ -105,6 +208,7 @@ def quarterly_report():
 
 @report_bp.route('/comparison', methods=['GET'])
 @login_required
+@cached_view(timeout=300)
 def comparison_report():
     """Generate comparison report"""
     try:
@@ -143,6 +247,7 @@ def comparison_report():
 
 @report_bp.route('/custom', methods=['GET'])
 @login_required
+@etag_view(_report_version(_custom_period), bucket_seconds=None)
 def custom_report():
     """Generate custom range report"""
     try:
@@ -156,8 +261,21 @@ def custom_report():
                 'error': 'Missing start_date or end_date parameter'
             }), 400
         
+        # Day granularity: timestamps within the same day share one cache entry
+        period = _custom_period(request.args)
+        if period is None:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid date format. Use YYYY-MM-DD'
+            }), 400
+        start_date, end_date = (day.isoformat() for day in period)
+        
         # FIX: Removed current_user.id — method only takes (start_date, end_date)
-        report = ReportGenerator.generate_custom_report(start_date, end_date)
+        report = CacheUtils.get_or_build(
+            f'report/custom/{_period_key(period)}',
+            lambda: ReportGenerator.generate_custom_report(start_date, end_date),
+            timeout=REPORT_CACHE_TIMEOUT
+        )
         
         return jsonify({
             'success': True,
@@ -240,11 +358,13 @@ def export_pdf():
         
         logger.info(f"Generating PDF report - Type: {report_type}, Charts: {len(charts_base64)}")
         
-        # Generate PDF
+        # Render into an anonymous temp file (removed as soon as it is closed)
+        # so the PDF is streamed from disk instead of held in memory
         pdf_file = PDFGenerator.generate_report_pdf(
             report_data,
             report_type,
-            charts_base64 if charts_base64 else None
+            _decode_charts(charts_base64) if charts_base64 else None,
+            dest=tempfile.TemporaryFile()
         )
         
         if not pdf_file:
@@ -438,7 +438,12 @@ async function processDocument(docId) {
             method: 'POST'
         });
         
-        const data = await response.json();
+        let data = await response.json();
+        
+        // Processing runs in the background; wait for the task to finish
+        if (data.success && data.task_id) {
+            data = await waitForTask(data.task_id);
+        }
         
         if (data.success) {
             showNotification('✅ Document processed successfully!', 'success');
@@ -458,6 +463,28 @@ async function processDocument(docId) {
     }
 }
 
+// Poll a background task until it finishes; resolves to its result payload
+async function waitForTask(taskId, intervalMs = 1500) {
+    while (true) {
+        const response = await fetch(`/api/task/${taskId}`);
+        const data = await response.json();
+        
+        if (!data.success) {
+            return data;
+        }
+        
+        const task = data.task;
+        if (task.status === 'finished') {
+            return task.result;
+        }
+        if (task.status === 'failed') {
+            return { success: false, error: task.error };
+        }
+        
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+    }
+}
+
 // Process all unprocessed documents
 async function processAllDocuments() {
     const unprocessedCount = allDocuments.filter(doc => !doc.processed).length;
@@ -0,0 +1,92 @@
+"""
+Shared pytest fixtures
+
+The app module builds its Flask app at import time from config.Config, so the
+database and upload folder are pointed at a throwaway directory before the
+first `import app`. Tests never touch the development finance_app.db.
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+os.environ.setdefault('SECRET_KEY', 'test')
+
+import config
+
+_TMP_DIR = tempfile.mkdtemp(prefix='finance-ai-tests-')
+config.Config.SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(_TMP_DIR, 'test.db')
+config.Config.SQLALCHEMY_ENGINE_OPTIONS = {}
+config.Config.UPLOAD_FOLDER = os.path.join(_TMP_DIR, 'uploads')
+config.Config.SESSION_COOKIE_SECURE = False
+config.Config.REMEMBER_COOKIE_SECURE = False
+
+
+@pytest.fixture
+def app():
+    """The module-level app, with seeded tables and a fresh response cache per test"""
+    from app import app as flask_app
+    from models.category import Category, DEFAULT_CATEGORIES
+    from models.database import db
+    from utils.cache_utils import cache
+    from utils.category_cache import CategoryCache
+
+    flask_app.config['TESTING'] = True
+    with flask_app.app_context():
+        # Other suites drop_all() on the shared engine in their tearDown
+        db.create_all()
+        if Category.query.count() == 0:
+            db.session.add_all(Category(**cat_data) for cat_data in DEFAULT_CATEGORIES)
+            db.session.commit()
+        CategoryCache.load()
+        cache.clear()
+        yield flask_app
+        _clear_data()
+
+
+def _clear_data():
+    from models.budget import Budget
+    from models.database import db
+    from models.document import Document
+    from models.transaction import Transaction
+    from models.user import User
+
+    db.session.rollback()
+    for model in (Transaction, Budget, Document, User):
+        db.session.query(model).delete()
+    db.session.commit()
+
+
+def make_user(username):
+    from models.database import db
+    from models.user import User
+
+    user = User(username=username, email=f'{username}@example.com')
+    user.set_password('secret')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def user(app):
+    return make_user('alice')
+
+
+@pytest.fixture
+def other_user(app):
+    return make_user('bob')
+
+
+@pytest.fixture
+def client(app, user):
+    """Test client logged in as `user`"""
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(user.id)
+        sess['_fresh'] = True
+    return client
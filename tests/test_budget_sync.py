@@ -0,0 +1,164 @@
+"""
+Budget sync tests
+
+stage_budget_periods() sums every affected period in one grouped query; its
+results must match the per-budget SUM it replaced.
+
+Run with: pytest tests/test_budget_sync.py -v
+"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import extract, func
+
+from models.budget import Budget
+from models.database import db
+from models.transaction import Transaction
+from utils.budget_utils import BudgetUtils
+
+
+def add_budget(category_id, month, year, amount=1000.0):
+    budget = Budget(category_id=category_id, month=month, year=year, amount=amount, spent=0.0)
+    db.session.add(budget)
+    db.session.commit()
+    return budget
+
+
+def add_transactions(*rows):
+    transactions = [
+        Transaction(category_id=category_id, transaction_date=transaction_date,
+                    amount=amount, vendor_name='Store')
+        for category_id, transaction_date, amount in rows
+    ]
+    db.session.add_all(transactions)
+    db.session.commit()
+    return transactions
+
+
+def per_budget_sum(budget):
+    """Spending as the per-budget sync computed it before the grouped query"""
+    spent = db.session.query(func.sum(Transaction.amount)).filter(
+        Transaction.category_id == budget.category_id,
+        extract('month', Transaction.transaction_date) == budget.month,
+        extract('year', Transaction.transaction_date) == budget.year
+    ).scalar()
+    return spent if spent else 0.0
+
+
+@pytest.fixture
+def boundary_data(app):
+    """Budgets on both sides of month and year boundaries, spending on the edges"""
+    budgets = [
+        add_budget(1, 12, 2024),
+        add_budget(1, 1, 2025),
+        add_budget(1, 2, 2025),
+        add_budget(2, 1, 2025),
+        add_budget(3, 3, 2025),  # no spending
+    ]
+    add_transactions(
+        (1, date(2024, 11, 30), 7.0),   # before the first budget period
+        (1, date(2024, 12, 1), 10.0),
+        (1, date(2024, 12, 31), 20.0),
+        (1, date(2025, 1, 1), 30.0),
+        (1, date(2025, 1, 31), 40.0),
+        (1, date(2025, 2, 1), 50.0),
+        (1, date(2025, 2, 28), 60.0),
+        (1, date(2025, 3, 1), 70.0),    # after the last budget period
+        (2, date(2025, 1, 15), 80.0),
+        (2, date(2024, 1, 15), 90.0),   # same month, other year
+        (3, date(2025, 4, 1), 100.0),
+        (None, date(2025, 1, 10), 5.0),
+    )
+    return budgets
+
+
+class TestStageBudgetPeriods:
+
+    def test_matches_per_budget_sum(self, boundary_data):
+        periods = [(b.category_id, b.month, b.year) for b in boundary_data]
+
+        synced = BudgetUtils.stage_budget_periods(periods)
+        db.session.commit()
+
+        assert {b.id for b in synced} == {b.id for b in boundary_data}
+        for budget in boundary_data:
+            assert budget.spent == per_budget_sum(budget), (budget.category_id, budget.month, budget.year)
+
+    def test_period_boundaries(self, boundary_data):
+        dec, jan, feb, other_category, empty = boundary_data
+
+        BudgetUtils.stage_budget_periods([(b.category_id, b.month, b.year) for b in boundary_data])
+
+        assert dec.spent == 30.0
+        assert jan.spent == 70.0
+        assert feb.spent == 110.0
+        assert other_category.spent == 80.0
+        assert empty.spent == 0.0
+
+    def test_only_requested_periods(self, boundary_data):
+        dec, jan, feb, _, _ = boundary_data
+
+        synced = BudgetUtils.stage_budget_periods([(1, 1, 2025), (1, 6, 2025)])
+
+        assert synced == [jan]
+        assert jan.spent == 70.0
+        assert dec.spent == 0.0 and feb.spent == 0.0
+
+    def test_no_periods(self, app):
+        assert BudgetUtils.stage_budget_periods([]) == []
+
+    def test_sync_all_budgets(self, boundary_data):
+        assert BudgetUtils.sync_all_budgets() == len(boundary_data)
+
+        for budget in boundary_data:
+            db.session.refresh(budget)
+            assert budget.spent == per_budget_sum(budget)
+
+
+class TestTransactionBudgetSync:
+
+    def test_bulk_sync_touches_each_period_once(self, app):
+        jan = add_budget(1, 1, 2025)
+        feb = add_budget(1, 2, 2025)
+        untouched = add_budget(2, 1, 2025)
+        transactions = add_transactions(
+            (1, date(2025, 1, 5), 10.0),
+            (1, date(2025, 1, 6), 15.0),
+            (1, date(2025, 2, 1), 20.0),
+            (2, date(2025, 1, 31), 0.5),
+        )
+
+        synced = BudgetUtils.sync_transaction_budgets_bulk(transactions[:3])
+
+        assert synced == 2
+        assert (jan.spent, feb.spent, untouched.spent) == (25.0, 20.0, 0.0)
+
+    def test_category_move_resyncs_old_period(self, app):
+        old_budget = add_budget(1, 1, 2025)
+        new_budget = add_budget(2, 2, 2025)
+        transaction, = add_transactions((1, date(2025, 1, 31), 40.0))
+        BudgetUtils.sync_transaction_budgets(transaction)
+        assert old_budget.spent == 40.0
+
+        transaction.category_id = 2
+        transaction.transaction_date = date(2025, 2, 1)
+        assert BudgetUtils.sync_transaction_budgets(
+            transaction, old_category_id=1, old_date=date(2025, 1, 31)
+        )
+
+        assert old_budget.spent == 0.0
+        assert new_budget.spent == 40.0
+
+    def test_category_move_via_api(self, client):
+        old_budget = add_budget(1, 1, 2025)
+        new_budget = add_budget(2, 1, 2025)
+        transaction, = add_transactions((1, date(2025, 1, 1), 40.0))
+        BudgetUtils.sync_transaction_budgets(transaction)
+
+        response = client.put(f'/api/transactions/{transaction.id}', json={'category_id': 2})
+
+        assert response.status_code == 200
+        db.session.expire_all()
+        assert db.session.get(Budget, old_budget.id).spent == 0.0
+        assert db.session.get(Budget, new_budget.id).spent == 40.0
@@ -0,0 +1,66 @@
+"""
+Categorizer prediction cache tests
+
+Run with: pytest tests/test_categorizer.py -v
+"""
+
+import pytest
+
+import ai_modules.categorizer
+from ai_modules.categorizer import TransactionCategorizer
+
+
+@pytest.fixture(scope='module')
+def categorizer():
+    categorizer = TransactionCategorizer()
+    categorizer.train()
+    return categorizer
+
+
+@pytest.fixture
+def transforms(categorizer, monkeypatch):
+    """Texts passed to the vectorizer (one per model inference)"""
+    calls = []
+    transform = categorizer.vectorizer.transform
+
+    def spy(texts):
+        calls.extend(texts)
+        return transform(texts)
+
+    categorizer.clear_prediction_cache()
+    monkeypatch.setattr(categorizer.vectorizer, 'transform', spy)
+    return calls
+
+
+class TestPredictionCache:
+
+    def test_repeat_is_served_from_cache(self, categorizer, transforms):
+        first = categorizer.predict_category('Swiggy', 'dinner order')
+        again = categorizer.predict_category('Swiggy', 'dinner order')
+
+        assert again == first
+        assert len(transforms) == 1
+
+    def test_different_text_is_predicted(self, categorizer, transforms):
+        categorizer.predict_category('Swiggy', 'dinner order')
+        categorizer.predict_category('Uber', 'ride to airport')
+        categorizer.predict_category('Swiggy', 'dinner order', amount=20000)
+
+        assert len(transforms) == 3
+
+    def test_bounded_lru(self, categorizer, transforms, monkeypatch):
+        monkeypatch.setattr(ai_modules.categorizer, 'PREDICTION_CACHE_SIZE', 2)
+
+        for vendor in ('Swiggy', 'Uber', 'Amazon', 'Swiggy'):
+            categorizer.predict_category(vendor)
+
+        assert len(categorizer._predictions) == 2
+        assert len(transforms) == 4  # Swiggy was evicted by Amazon
+
+    def test_training_clears_cache(self, categorizer, transforms):
+        categorizer.predict_category('Swiggy', 'dinner order')
+
+        categorizer.train()
+        categorizer.predict_category('Swiggy', 'dinner order')
+
+        assert len(transforms) == 2
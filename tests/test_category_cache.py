@@ -0,0 +1,104 @@
+"""
+Category cache tests
+
+Run with: pytest tests/test_category_cache.py -v
+"""
+
+import pytest
+
+from models.category import Category
+from models.database import db
+from utils.category_cache import CategoryCache
+
+
+@pytest.fixture
+def extra_category(app):
+    """A category added for one test (seeded categories are kept across tests)"""
+    category = Category(name='Pets', icon='🐾', color='#000000', description='Vet, food')
+    db.session.add(category)
+    db.session.commit()
+    yield category
+    db.session.delete(category)
+    db.session.commit()
+
+
+class TestCategoryCache:
+
+    def test_lookups(self, app):
+        assert CategoryCache.get(1) == 'Food & Dining'
+        assert CategoryCache.get('2') == 'Transportation'
+        assert CategoryCache.get(999) is None
+        assert CategoryCache.get('food') is None
+        assert CategoryCache.get(None) is None
+
+    def test_get_id_by_name(self, app):
+        assert CategoryCache.get_id_by_name('Shopping') == 3
+        assert CategoryCache.get_id_by_name('shop') is None
+        assert CategoryCache.get_id_by_name('shop', fuzzy=True) == 3
+        assert CategoryCache.get_id_by_name('&', fuzzy=True) == 1
+        assert CategoryCache.get_id_by_name('Nope', fuzzy=True, default='Other') == \
+            CategoryCache.get_id_by_name('Other')
+
+    def test_no_query_once_loaded(self, app):
+        from sqlalchemy import event
+
+        CategoryCache.get(1)
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            CategoryCache.get(2)
+            CategoryCache.get_id_by_name('Shopping')
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+        assert statements == []
+
+    def test_category_write_invalidates(self, extra_category):
+        version = CategoryCache.version
+
+        assert CategoryCache.get(extra_category.id) == 'Pets'
+
+        extra_category.name = 'Pet Care'
+        db.session.commit()
+
+        assert CategoryCache.version > version
+        assert CategoryCache.get(extra_category.id) == 'Pet Care'
+        assert CategoryCache.get_id_by_name('Pets') is None
+
+
+class TestCategoriesEndpoint:
+    """GET /api/categories (cached payload, ETag on categories + transactions)"""
+
+    def test_payload(self, client):
+        body = client.get('/api/categories').get_json()
+
+        assert [c['id'] for c in body] == sorted(c['id'] for c in body)
+        assert body[0]['name'] == 'Food & Dining'
+        assert set(body[0]) == {'id', 'name', 'description', 'icon', 'color', 'monthly_budget', 'total_spent'}
+
+    def test_unchanged_is_304(self, client):
+        first = client.get('/api/categories')
+
+        again = client.get('/api/categories', headers={'If-None-Match': first.headers['ETag']})
+
+        assert again.status_code == 304
+
+    def test_transaction_write_refreshes_total_spent(self, client):
+        first = client.get('/api/categories')
+        client.post('/api/transactions', json={'amount': 42.5, 'vendor_name': 'Cafe', 'category_id': 1})
+
+        second = client.get('/api/categories', headers={'If-None-Match': first.headers['ETag']})
+
+        assert second.status_code == 200
+        assert second.get_json()[0]['total_spent'] == first.get_json()[0]['total_spent'] + 42.5
+
+    def test_category_write_refreshes_payload(self, client, extra_category):
+        first = client.get('/api/categories')
+
+        extra_category.color = '#FFFFFF'
+        db.session.commit()
+        second = client.get('/api/categories', headers={'If-None-Match': first.headers['ETag']})
+
+        assert second.status_code == 200
+        assert second.get_json()[-1]['color'] == '#FFFFFF'
@@ -0,0 +1,50 @@
+"""
+Config tests
+
+config.py is re-executed with runpy so each case reads its own environment
+without replacing the config module the app was built from.
+
+Run with: pytest tests/test_config.py -v
+"""
+
+import os
+import runpy
+
+import pytest
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'config.py')
+
+
+def engine_options(monkeypatch, database_url):
+    if database_url is None:
+        monkeypatch.delenv('DATABASE_URL', raising=False)
+    else:
+        monkeypatch.setenv('DATABASE_URL', database_url)
+    return runpy.run_path(CONFIG_PATH)['Config'].SQLALCHEMY_ENGINE_OPTIONS
+
+
+class TestEngineOptions:
+
+    @pytest.mark.parametrize('url', [
+        'postgres://u:p@db/finance',
+        'postgresql://u:p@db/finance',
+        'postgresql+psycopg2://u:p@db/finance',
+    ])
+    def test_postgres_gets_libpq_args(self, monkeypatch, url):
+        options = engine_options(monkeypatch, url)
+
+        assert options['connect_args'] == {'sslmode': 'prefer', 'application_name': 'finance-ai'}
+        assert options['pool_size'] == 20
+
+    @pytest.mark.parametrize('url', [
+        'mysql+pymysql://u:p@db/finance',
+        'sqlite:////tmp/finance.db',
+    ])
+    def test_other_databases_get_no_libpq_args(self, monkeypatch, url):
+        options = engine_options(monkeypatch, url)
+
+        assert 'connect_args' not in options
+        assert options['pool_recycle'] == 1800
+
+    def test_default_sqlite(self, monkeypatch):
+        assert engine_options(monkeypatch, None) == {}
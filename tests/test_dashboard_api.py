@@ -0,0 +1,95 @@
+"""
+Dashboard API tests
+
+Run with: pytest tests/test_dashboard_api.py -v
+"""
+
+from datetime import date
+
+from models.database import db
+from models.transaction import Transaction
+
+
+def add_transactions(*rows):
+    """(vendor_name, amount, transaction_date) rows"""
+    db.session.add_all(
+        Transaction(vendor_name=vendor, amount=amount, transaction_date=transaction_date, category_id=1)
+        for vendor, amount, transaction_date in rows
+    )
+    db.session.commit()
+
+
+class TestTopVendors:
+    """GET /api/vendors/top (aggregated and JSON-encoded in SQL)"""
+
+    def test_totals_and_order(self, client):
+        add_transactions(
+            ('Cafe', 10.0, date(2025, 1, 1)),
+            ('Cafe', 15.5, date(2025, 3, 2)),
+            ('Grocer', 100.0, date(2025, 2, 1)),
+            ('Taxi', 5.0, None),
+            ('', 999.0, date(2025, 1, 1)),
+            (None, 999.0, date(2025, 1, 1)),
+        )
+
+        response = client.get('/api/vendors/top')
+
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body['success'] is True
+        assert body['vendors'] == [
+            {'vendor_name': 'Grocer', 'transaction_count': 1, 'total_spending': 100.0,
+             'last_transaction_date': '2025-02-01'},
+            {'vendor_name': 'Cafe', 'transaction_count': 2, 'total_spending': 25.5,
+             'last_transaction_date': '2025-03-02'},
+            {'vendor_name': 'Taxi', 'transaction_count': 1, 'total_spending': 5.0,
+             'last_transaction_date': None},
+        ]
+
+    def test_limit(self, client):
+        add_transactions(*[(f'Vendor {i}', float(i), date(2025, 1, 1)) for i in range(1, 10)])
+
+        default = client.get('/api/vendors/top').get_json()['vendors']
+        two = client.get('/api/vendors/top?limit=2').get_json()['vendors']
+
+        assert len(default) == 6
+        assert [v['vendor_name'] for v in two] == ['Vendor 9', 'Vendor 8']
+
+    def test_no_transactions(self, client):
+        assert client.get('/api/vendors/top').get_json() == {'success': True, 'vendors': []}
+
+
+def months_back(count):
+    """(year, month) `count` calendar months before the current one"""
+    today = date.today()
+    index = today.year * 12 + today.month - 1 - count
+    return index // 12, index % 12 + 1
+
+
+class TestMonthlyTrend:
+    """GET /api/monthly-trend (one grouped query, zero-filled months)"""
+
+    def test_zero_filled_calendar_months(self, client):
+        this_year, this_month = months_back(0)
+        two_year, two_month = months_back(2)
+        old_year, old_month = months_back(6)
+        add_transactions(
+            ('Cafe', 10.0, date(this_year, this_month, 1)),
+            ('Cafe', 2.5, date(this_year, this_month, 1)),
+            ('Grocer', 40.0, date(two_year, two_month, 28)),
+            ('Grocer', 99.0, date(old_year, old_month, 15)),  # outside the window
+        )
+
+        trend = client.get('/api/monthly-trend').get_json()
+
+        assert [(m['year'], m['month']) for m in trend] == [
+            (y, date(y, m, 1).strftime('%B')) for y, m in (months_back(n) for n in range(5, -1, -1))
+        ]
+        assert [m['total'] for m in trend] == [0.0, 0.0, 0.0, 40.0, 0.0, 12.5]
+
+    def test_months_parameter(self, client):
+        this_year, this_month = months_back(0)
+        add_transactions(('Cafe', 10.0, date(this_year, this_month, 1)))
+
+        assert [m['total'] for m in client.get('/api/monthly-trend?months=2').get_json()] == [0.0, 10.0]
+        assert client.get('/api/monthly-trend?months=0').get_json() == []
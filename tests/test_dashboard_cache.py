@@ -0,0 +1,126 @@
+"""
+Dashboard response cache tests
+
+Run with: pytest tests/test_dashboard_cache.py -v
+"""
+
+import pytest
+
+from utils.cache_utils import CacheUtils, cache
+
+
+def fill_cache(count=600):
+    """Push the response cache past its entry threshold"""
+    for i in range(count):
+        cache.set(f'filler/{i}', i, timeout=60)
+
+
+class TestTransactionsVersion:
+
+    def test_version_survives_cache_pressure(self, app):
+        version = CacheUtils.bump_transactions_version()
+
+        fill_cache()
+
+        assert CacheUtils.get_transactions_version() == version
+
+    def test_evicted_version_is_never_reused(self, app):
+        version = CacheUtils.bump_transactions_version()
+
+        cache.delete('txn_version')
+
+        assert CacheUtils.get_transactions_version() not in (None, 0, version)
+
+    def test_etag_changes_after_write_under_cache_pressure(self, client):
+        first = client.get('/api/stats')
+        assert first.status_code == 200
+        fill_cache()
+
+        created = client.post('/api/transactions',
+                              json={'amount': 10, 'vendor_name': 'Cafe', 'category_id': 1})
+        assert created.status_code == 200
+        fill_cache()
+
+        second = client.get('/api/stats', headers={'If-None-Match': first.headers['ETag']})
+        assert second.status_code == 200
+        assert second.headers['ETag'] != first.headers['ETag']
+
+
+class TestETag:
+    """etag_view on the dashboard endpoints"""
+
+    def test_unchanged_poll_is_304(self, client):
+        for url in ('/api/stats', '/api/category-breakdown', '/api/monthly-trend',
+                    '/api/recent-transactions', '/api/vendors/top'):
+            first = client.get(url)
+            assert first.status_code == 200, url
+            assert first.cache_control.private and first.cache_control.no_cache
+
+            again = client.get(url, headers={'If-None-Match': first.headers['ETag']})
+            assert again.status_code == 304, url
+            assert again.data == b''
+            assert again.headers['ETag'] == first.headers['ETag']
+
+    def test_etag_is_per_user(self, app, client, other_user):
+        from flask import g
+
+        other = app.test_client()
+        with other.session_transaction() as sess:
+            sess['_user_id'] = str(other_user.id)
+            sess['_fresh'] = True
+
+        mine = client.get('/api/stats')
+        # Requests share the fixture's app context, where Flask-Login keeps
+        # the loaded user
+        g.pop('_login_user', None)
+        theirs = other.get('/api/stats', headers={'If-None-Match': mine.headers['ETag']})
+
+        assert theirs.status_code == 200
+        assert theirs.headers['ETag'] != mine.headers['ETag']
+
+    def test_time_bucket_expires_etag(self, client, monkeypatch):
+        import time
+        from utils import cache_utils
+
+        first = client.get('/api/stats')
+        later = time.time() + cache_utils.ETAG_BUCKET_SECONDS
+        monkeypatch.setattr(cache_utils.time, 'time', lambda: later)
+
+        second = client.get('/api/stats', headers={'If-None-Match': first.headers['ETag']})
+
+        assert second.status_code == 200
+
+
+class TestDashboardSnapshot:
+    """All dashboard aggregates are computed together once per version"""
+
+    def test_widgets_share_one_build(self, client, monkeypatch):
+        from utils.db_utils import DatabaseUtils
+
+        builds = []
+        get_stats = DatabaseUtils.get_dashboard_stats
+
+        def counting_stats():
+            builds.append(1)
+            return get_stats()
+
+        monkeypatch.setattr(DatabaseUtils, 'get_dashboard_stats', staticmethod(counting_stats))
+
+        for url in ('/api/stats', '/api/category-breakdown', '/api/monthly-trend', '/api/vendors/top'):
+            assert client.get(url).status_code == 200
+        assert len(builds) == 1
+
+        client.post('/api/transactions', json={'amount': 10, 'vendor_name': 'Cafe', 'category_id': 1})
+        stats = client.get('/api/stats').get_json()
+
+        assert len(builds) == 2
+        assert stats['total_transactions'] == 1
+
+    def test_non_default_parameters_bypass_snapshot(self, client, monkeypatch):
+        from utils.db_utils import DatabaseUtils
+
+        monkeypatch.setattr(DatabaseUtils, 'get_dashboard_snapshot',
+                            staticmethod(lambda: pytest.fail('snapshot used')))
+
+        assert len(client.get('/api/monthly-trend?months=3').get_json()) == 3
+        assert client.get('/api/vendors/top?limit=2').get_json()['vendors'] == []
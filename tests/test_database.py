@@ -0,0 +1,28 @@
+"""
+Database setup tests
+
+Run with: pytest tests/test_database.py -v
+"""
+
+from sqlalchemy import create_engine, text
+
+from models.database import db
+
+
+class TestSqlitePragmas:
+
+    def test_app_engine(self, app):
+        with db.engine.connect() as conn:
+            assert conn.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+            assert conn.execute(text('PRAGMA synchronous')).scalar() == 1  # NORMAL
+            assert conn.execute(text('PRAGMA temp_store')).scalar() == 2  # MEMORY
+
+    def test_every_new_connection(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+        try:
+            for _ in range(2):
+                with engine.connect() as conn:
+                    assert conn.execute(text('PRAGMA synchronous')).scalar() == 1
+                engine.dispose()
+        finally:
+            engine.dispose()
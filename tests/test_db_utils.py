@@ -0,0 +1,51 @@
+"""
+DatabaseUtils tests
+
+Run with: pytest tests/test_db_utils.py -v
+"""
+
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+import utils.db_utils
+from models.database import db
+from models.transaction import Transaction
+from utils.db_utils import DatabaseUtils
+
+
+def dialect_named(monkeypatch, name):
+    """Make id_in() see an engine of the given dialect"""
+    monkeypatch.setattr(utils.db_utils, 'db',
+                        SimpleNamespace(engine=SimpleNamespace(dialect=SimpleNamespace(name=name))))
+
+
+class TestIdIn:
+
+    def test_postgres_binds_one_array(self, monkeypatch):
+        dialect_named(monkeypatch, 'postgresql')
+
+        compiled = DatabaseUtils.id_in(Transaction.id, range(1000)).compile(dialect=postgresql.dialect())
+
+        assert 'ANY' in str(compiled)
+        assert list(compiled.params.values()) == [list(range(1000))]
+
+    def test_other_databases_use_in(self, monkeypatch):
+        dialect_named(monkeypatch, 'sqlite')
+
+        compiled = DatabaseUtils.id_in(Transaction.id, [1, 2, 3]).compile(dialect=sqlite.dialect())
+
+        assert ' IN ' in str(compiled)
+        assert 'ANY' not in str(compiled)
+
+    def test_large_bulk_delete(self, client):
+        rows = [Transaction(amount=10.0, vendor_name='Store', category_id=1) for _ in range(3)]
+        db.session.add_all(rows)
+        db.session.commit()
+        ids = [row.id for row in rows]
+
+        response = client.post('/api/transactions/bulk-delete',
+                               json={'transaction_ids': ids + list(range(10 ** 6, 10 ** 6 + 5000))})
+
+        assert response.status_code == 200
+        assert response.get_json()['deleted_count'] == 3
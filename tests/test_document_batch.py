@@ -0,0 +1,208 @@
+"""
+Batch document processing tests
+
+process_multiple_documents() stages extraction results and writes them in
+BATCH_COMMIT_SIZE commits. Extraction itself is replaced by a fake keyed on
+the file name, so no OCR or category model is involved.
+
+Run with: pytest tests/test_document_batch.py -v
+"""
+
+from datetime import date
+
+import pytest
+
+from models.database import db
+from models.document import Document
+from models.transaction import Transaction
+from utils.processor import DocumentProcessingWorkflow
+
+DOC_VALUES = {'raw_text': 'text', 'text_length': 4}
+
+
+def add_document(name, processed=False):
+    document = Document(filename=name, original_filename=name, file_type='receipt',
+                        file_path=f'/nonexistent/{name}', processed=processed)
+    db.session.add(document)
+    db.session.commit()
+    return document
+
+
+def fake_workflow(outcomes):
+    """
+    A workflow whose _extract_document() returns outcomes[filename]:
+    'txn' (document and transaction), 'no-amount' (document only),
+    'unparsed' (text but no data) or 'unreadable' (no text)
+    """
+    workflow = DocumentProcessingWorkflow.__new__(DocumentProcessingWorkflow)
+
+    def extract(document):
+        outcome = outcomes[document.filename]
+        if outcome == 'unreadable':
+            return None, None, 'No text extracted from document'
+        if outcome == 'unparsed':
+            return DOC_VALUES, None, 'Could not extract data from text'
+        if outcome == 'no-amount':
+            return DOC_VALUES, None, None
+        return DOC_VALUES, {
+            'document_id': document.id, 'transaction_date': date(2025, 1, 15),
+            'amount': 10.0, 'currency': 'INR', 'vendor_name': 'Store',
+            'description': f'Extracted from {document.original_filename}',
+            'category_id': 1, 'payment_method': 'Other',
+            'tax_amount': 0.0, 'tax_percentage': None,
+        }, None
+
+    workflow._extract_document = extract
+    return workflow
+
+
+@pytest.fixture
+def commits(monkeypatch):
+    """Document ids passed to each _commit_batch() call"""
+    calls = []
+    commit_batch = DocumentProcessingWorkflow._commit_batch
+
+    def spy(documents, transactions, document_ids, results):
+        calls.append([doc['id'] for doc in documents])
+        return commit_batch(documents, transactions, document_ids, results)
+
+    monkeypatch.setattr(DocumentProcessingWorkflow, '_commit_batch', staticmethod(spy))
+    return calls
+
+
+class TestProcessMultipleDocuments:
+
+    def test_commits_in_batches(self, app, commits):
+        documents = [add_document(f'doc{i}.pdf') for i in range(5)]
+        workflow = fake_workflow({d.filename: 'txn' for d in documents})
+        ids = [d.id for d in documents]
+
+        results = workflow.process_multiple_documents(ids, commit_every=2)
+
+        assert commits == [ids[0:2], ids[2:4], ids[4:]]
+        assert results['success'] == ids
+        assert results['failed'] == []
+        assert results['total_transactions'] == 5
+        db.session.expire_all()
+        assert all(db.session.get(Document, i).processed for i in ids)
+        assert db.session.query(Transaction).count() == 5
+
+    def test_outcomes(self, app, commits):
+        txn, no_amount, unparsed, unreadable = (
+            add_document(name) for name in ('txn.pdf', 'no-amount.pdf', 'unparsed.pdf', 'unreadable.pdf')
+        )
+        done = add_document('done.pdf', processed=True)
+        workflow = fake_workflow({d.filename: d.filename[:-4] for d in (txn, no_amount, unparsed, unreadable)})
+
+        results = workflow.process_multiple_documents(
+            [txn.id, no_amount.id, unparsed.id, unreadable.id, done.id, 999999]
+        )
+
+        assert results['success'] == [txn.id, no_amount.id]
+        assert results['total_transactions'] == 1
+        assert {f['id']: f['error'] for f in results['failed']} == {
+            unparsed.id: 'Could not extract data from text',
+            unreadable.id: 'No text extracted from document',
+            done.id: 'Document already processed',
+            999999: 'Document not found',
+        }
+        db.session.expire_all()
+        # Unparsed text still marks the document processed; unreadable files stay queued
+        assert db.session.get(Document, unparsed.id).processed
+        assert not db.session.get(Document, unreadable.id).processed
+
+    def test_failed_commit_rolls_back_and_records_once(self, app, commits, monkeypatch):
+        from utils.budget_utils import BudgetUtils
+
+        good = add_document('txn.pdf')
+        unparsed = add_document('unparsed.pdf')
+        workflow = fake_workflow({'txn.pdf': 'txn', 'unparsed.pdf': 'unparsed'})
+
+        def broken(periods):
+            raise RuntimeError('budget sync failed')
+
+        monkeypatch.setattr(BudgetUtils, 'stage_budget_periods', staticmethod(broken))
+
+        results = workflow.process_multiple_documents([good.id, unparsed.id])
+
+        assert results['success'] == []
+        assert results['total_transactions'] == 0
+        assert sorted(f['id'] for f in results['failed']) == sorted([good.id, unparsed.id])
+        assert {f['id']: f['error'] for f in results['failed']}[good.id] == 'budget sync failed'
+        db.session.expire_all()
+        assert not db.session.get(Document, good.id).processed
+        assert not db.session.get(Document, unparsed.id).processed
+        assert db.session.query(Transaction).count() == 0
+
+
+class TestWorkerPool:
+
+    def test_extraction_overlaps_across_workers(self, app, monkeypatch):
+        import threading
+
+        monkeypatch.setitem(app.config, 'DOCUMENT_PROCESSING_WORKERS', 2)
+        documents = [add_document(f'doc{i}.pdf') for i in range(2)]
+        workflow = fake_workflow({d.filename: 'no-amount' for d in documents})
+        extract = workflow._extract_document
+        both_started = threading.Barrier(2, timeout=5)
+
+        def overlapping(document):
+            # Raises BrokenBarrierError (a failed document) if run one at a time
+            both_started.wait()
+            return extract(document)
+
+        workflow._extract_document = overlapping
+
+        results = workflow.process_multiple_documents([d.id for d in documents])
+
+        assert results['failed'] == []
+        assert results['success'] == [d.id for d in documents]
+
+
+class TestProcessAllDocumentsEndpoint:
+    """POST /api/process-all-documents"""
+
+    def test_runs_batch_workflow(self, client, monkeypatch):
+        txn = add_document('txn.pdf')
+        add_document('unreadable.pdf')
+        add_document('done.pdf', processed=True)
+        workflow = fake_workflow({'txn.pdf': 'txn', 'unreadable.pdf': 'unreadable'})
+        monkeypatch.setattr('app.get_workflow', lambda: workflow)
+
+        response = client.post('/api/process-all-documents')
+
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body['processed_count'] == 1
+        assert body['failed_count'] == 1
+        assert body['transaction_count'] == 1
+        assert body['errors'] == ['unreadable.pdf: No text extracted from document']
+        assert db.session.query(Transaction).filter_by(document_id=txn.id).count() == 1
+
+    def test_nothing_to_process(self, client):
+        add_document('done.pdf', processed=True)
+
+        response = client.post('/api/process-all-documents')
+
+        assert response.get_json()['processed_count'] == 0
+
+
+class TestProcessPool:
+    """DOCUMENT_PROCESSING_POOL=process"""
+
+    def test_never_forks(self):
+        from utils.processor import _process_pool_context
+
+        assert _process_pool_context().get_start_method() in ('forkserver', 'spawn')
+
+    def test_extracts_in_worker_process(self, app, monkeypatch):
+        monkeypatch.setitem(app.config, 'DOCUMENT_PROCESSING_POOL', 'process')
+        missing = add_document('missing.pdf')
+        workflow = DocumentProcessingWorkflow.__new__(DocumentProcessingWorkflow)
+
+        results = workflow.process_multiple_documents([missing.id], max_workers=1)
+
+        failure, = results['failed']
+        assert failure['id'] == missing.id
+        assert failure['error']
+        assert results['success'] == []
@@ -0,0 +1,206 @@
+"""
+Document API tests
+
+Run with: pytest tests/test_documents_api.py -v
+"""
+
+import hashlib
+import os
+from datetime import datetime
+from io import BytesIO
+
+import pytest
+
+from models.database import db
+from models.document import Document
+from utils.file_handler import FileHandler
+
+
+def add_document(name, **fields):
+    values = {
+        'filename': name,
+        'original_filename': name,
+        'file_type': 'receipt',
+        'file_path': f'/nonexistent/{name}',
+        'processed': False,
+    }
+    values.update(fields)
+    document = Document(**values)
+    db.session.add(document)
+    db.session.commit()
+    return document
+
+
+class TestDocumentList:
+    """GET /api/documents (summary columns only)"""
+
+    def test_newest_first(self, client):
+        old = add_document('old.pdf', upload_date=datetime(2025, 1, 1, 9, 30))
+        new = add_document('new.pdf', upload_date=datetime(2025, 2, 1, 8, 0), processed=True,
+                           raw_text='x' * 10000)
+
+        response = client.get('/api/documents')
+
+        assert response.status_code == 200
+        assert response.get_json() == [
+            {'id': new.id, 'filename': 'new.pdf', 'original_filename': 'new.pdf',
+             'file_type': 'receipt', 'upload_date': '2025-02-01 08:00:00', 'processed': True},
+            {'id': old.id, 'filename': 'old.pdf', 'original_filename': 'old.pdf',
+             'file_type': 'receipt', 'upload_date': '2025-01-01 09:30:00', 'processed': False},
+        ]
+
+    def test_single_document_matches_list_entry(self, client):
+        document = add_document('one.pdf')
+
+        listed, = client.get('/api/documents').get_json()
+        single = client.get(f'/api/documents/{document.id}').get_json()
+
+        assert single == listed
+        assert client.get('/api/documents/999999').status_code == 404
+
+
+class TestServeUpload:
+    """GET /uploads/<filename>"""
+
+    def test_served_by_flask_without_prefix(self, app, client, monkeypatch):
+        monkeypatch.setitem(app.config, 'UPLOAD_ACCEL_REDIRECT_PREFIX', None)
+        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+        with open(os.path.join(app.config['UPLOAD_FOLDER'], 'scan.png'), 'wb') as fp:
+            fp.write(b'png bytes')
+
+        response = client.get('/uploads/scan.png')
+
+        assert response.status_code == 200
+        assert response.data == b'png bytes'
+        assert 'X-Accel-Redirect' not in response.headers
+
+    def test_handed_to_nginx_with_prefix(self, app, client, monkeypatch):
+        monkeypatch.setitem(app.config, 'UPLOAD_ACCEL_REDIRECT_PREFIX', '/protected-uploads/')
+
+        response = client.get('/uploads/my%20scan.png')
+
+        assert response.status_code == 200
+        assert response.headers['X-Accel-Redirect'] == '/protected-uploads/my%20scan.png'
+        assert 'Content-Type' not in response.headers
+        assert response.data == b''
+
+    def test_traversal_rejected(self, app, client, monkeypatch):
+        monkeypatch.setitem(app.config, 'UPLOAD_ACCEL_REDIRECT_PREFIX', '/protected-uploads/')
+
+        assert client.get('/uploads/..%2Fconfig.py').status_code == 404
+
+    def test_login_required(self, app):
+        assert app.test_client().get('/uploads/scan.png').status_code in (302, 401)
+
+
+class TestUpload:
+    """POST /upload (streamed to disk, deduplicated by content hash)"""
+
+    def upload(self, client, data, name='receipt.png'):
+        return client.post('/upload', data={'file': (BytesIO(data), name)},
+                           content_type='multipart/form-data')
+
+    def test_stored_with_hash(self, app, client):
+        response = self.upload(client, b'receipt bytes')
+
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body['success'] is True and 'duplicate' not in body
+        document = db.session.get(Document, body['document']['id'])
+        assert document.content_sha256 == hashlib.sha256(b'receipt bytes').hexdigest()
+        assert document.file_type == 'receipt'
+        with open(document.file_path, 'rb') as fp:
+            assert fp.read() == b'receipt bytes'
+        assert os.path.dirname(document.file_path) == app.config['UPLOAD_FOLDER']
+
+    def test_same_bytes_reuse_document(self, app, client):
+        first = self.upload(client, b'same bytes', name='a.png').get_json()
+        files = set(os.listdir(app.config['UPLOAD_FOLDER']))
+
+        second = self.upload(client, b'same bytes', name='b.png').get_json()
+
+        assert second['duplicate'] is True
+        assert second['document']['id'] == first['document']['id']
+        assert set(os.listdir(app.config['UPLOAD_FOLDER'])) == files
+        assert db.session.query(Document).count() == 1
+
+    def test_rejections(self, client):
+        assert self.upload(client, b'x', name='notes.txt').status_code == 400
+        assert client.post('/upload', data={}, content_type='multipart/form-data').status_code == 400
+
+
+class TestStreamToDisk:
+
+    def test_chunked_copy_and_hash(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(FileHandler, 'CHUNK_SIZE', 4)
+        data = b'0123456789abcdef-'
+        path = tmp_path / 'copy.bin'
+
+        size, digest = FileHandler.stream_to_disk(BytesIO(data), str(path))
+
+        assert size == len(data)
+        assert digest == hashlib.sha256(data).hexdigest()
+        assert path.read_bytes() == data
+
+    def test_oversized_stream_removes_partial_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(FileHandler, 'CHUNK_SIZE', 4)
+        monkeypatch.setattr(FileHandler, 'MAX_FILE_SIZE', 10)
+        path = tmp_path / 'big.bin'
+
+        with pytest.raises(ValueError):
+            FileHandler.stream_to_disk(BytesIO(b'x' * 11), str(path))
+
+        assert not path.exists()
+
+
+class TestDocumentDetails:
+    """GET /api/document-details/<id> (rows and total in one windowed query)"""
+
+    def add_transactions(self, document, count):
+        from models.transaction import Transaction
+
+        rows = [Transaction(document_id=document.id, vendor_name=f'Vendor {i}', amount=10.0 + i,
+                            category_id=1) for i in range(count)]
+        db.session.add_all(rows)
+        db.session.commit()
+        return [row.id for row in rows]
+
+    def get(self, client, document, **args):
+        response = client.get(f'/api/document-details/{document.id}', query_string=args)
+        assert response.status_code == 200
+        return response.get_json()
+
+    def test_all_transactions(self, client):
+        document = add_document('bill.pdf', processed=True, raw_text='t' * 600)
+        ids = self.add_transactions(document, 3)
+        add_document('other.pdf')
+
+        body = self.get(client, document)
+
+        assert body['document']['id'] == document.id
+        assert body['raw_text'] == 't' * 500
+        assert [t['id'] for t in body['transactions']] == ids
+        assert body['transaction_count'] == 3
+
+    def test_paging_keeps_full_count(self, client):
+        document = add_document('bill.pdf')
+        ids = self.add_transactions(document, 5)
+
+        page = self.get(client, document, limit=2, offset=2)
+        past_end = self.get(client, document, limit=2, offset=10)
+
+        assert [t['id'] for t in page['transactions']] == ids[2:4]
+        assert page['transaction_count'] == 5
+        assert past_end['transactions'] == []
+        assert past_end['transaction_count'] == 5
+
+    def test_no_transactions(self, client):
+        document = add_document('empty.pdf')
+
+        body = self.get(client, document)
+
+        assert body['transactions'] == [] and body['transaction_count'] == 0
+        assert body['raw_text'] is None
+
+    def test_missing_document(self, client):
+        assert client.get('/api/document-details/999999').status_code == 404
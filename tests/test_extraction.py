@@ -0,0 +1,158 @@
+"""
+Data extraction regression tests
+
+Multi-page documents streamed through extract_streaming() must extract the
+same data as the pre-streaming extractor did on the joined text. EXPECTED
+holds that extractor's results (raw_text aside).
+
+Run with: pytest tests/test_extraction.py -v
+"""
+
+from datetime import date
+
+import pytest
+
+from ai_modules.data_extractor import DataExtractor
+
+MULTI_PAGE_DOCUMENTS = {
+    'invoice_two_pages': [
+        "SHARMA ELECTRONICS PVT LTD\n"
+        "12 MG Road, Bengaluru\n"
+        "Tax Invoice\n"
+        "Invoice No: INV-2024/0457\n"
+        "Invoice Date: 14/03/2024\n"
+        "Contact: billing@sharmaelectronics.in\n"
+        "Item                Qty     Price\n"
+        "LED Monitor 24in    1       Rs. 11,500.00\n",
+        "Subtotal: Rs. 11,500.00\n"
+        "CGST @ 9%: Rs. 1,035.00\n"
+        "SGST @ 9%: Rs. 1,035.00\n"
+        "Total: Rs. 13,570.00\n"
+        "Paid via UPI (GPay) - UPI transaction ref 4021\n"
+        "Due Date: 2024-04-13\n",
+    ],
+    'statement_three_pages': [
+        "Greenleaf Grocers\n"
+        "Monthly Statement\n"
+        "Statement period 01 Feb 2025 to 28 Feb 2025\n",
+        "Purchase date 2025-02-03   Rs 450.00  card\n"
+        "Purchase date 2025-02-17   Rs 1,230.50 debit card\n"
+        "Customer care 9876543210\n"
+        "tax 5%\n",
+        "Amount payable INR 1,680.50\n"
+        "Paid on 2025-02-28 by net banking (NEFT)\n"
+        "GST: 80.02\n"
+        "Email: accounts@greenleaf.example\n",
+    ],
+    'vendor_spans_pages': [
+        "\n\nPage 1 of 3\n",
+        "",
+        "Blue Bottle Cafe\n"
+        "Koramangala Outlet\n"
+        "Bill # BB1123\n"
+        "Dated: March 5, 2025\n"
+        "2 x Cappuccino   $ 9.00\n"
+        "Total amount 9.00\n"
+        "cash\n",
+    ],
+    # Cash and Card tie; Card is listed first in PAYMENT_KEYWORDS
+    'payment_tie_across_pages': [
+        "Corner Pharmacy\nReceipt\ncash\n",
+        "Total Rs. 240.00\nvisa\n",
+    ],
+}
+
+EXPECTED = {
+    'invoice_two_pages': {
+        'date': date(2024, 3, 14),
+        'all_dates': {'invoice': date(2024, 3, 14), 'due': date(2024, 4, 13)},
+        'amount': 11500.0,
+        'all_amounts': {'total': 11500.0, 'tax': 1035.0, 'other': 11500.0},
+        'vendor': 'SHARMA ELECTRONICS PVT LTD',
+        'payment_method': 'UPI',
+        'invoice_number': 'INV-2024/0457',
+        'tax_amount': None,
+        'tax_percentage': 9.0,
+        'email': 'billing@sharmaelectronics.in',
+        'phone': None,
+        'confidence': 100,
+    },
+    'statement_three_pages': {
+        'date': date(2025, 3, 2),
+        'all_dates': {'transaction': date(2025, 3, 2), 'other': date(2025, 2, 1)},
+        'amount': 1680.5,
+        'all_amounts': {'total': 1680.5, 'tax': 5.0, 'other': 450.0},
+        'vendor': 'Greenleaf Grocers',
+        'payment_method': 'Card',
+        'invoice_number': None,
+        'tax_amount': None,
+        'tax_percentage': 5.0,
+        'email': 'accounts@greenleaf.example',
+        'phone': '9876543210',
+        'confidence': 85,
+    },
+    'vendor_spans_pages': {
+        'date': date(2025, 3, 5),
+        'all_dates': {'invoice': date(2025, 3, 5)},
+        'amount': 9.0,
+        'all_amounts': {'total': 9.0, 'other': 9.0},
+        'vendor': 'Blue Bottle Cafe',
+        'payment_method': 'Cash',
+        'invoice_number': 'BB1123',
+        'tax_amount': None,
+        'tax_percentage': None,
+        'email': None,
+        'phone': None,
+        'confidence': 90,
+    },
+    'payment_tie_across_pages': {
+        'date': None,
+        'all_dates': {},
+        'amount': 240.0,
+        'all_amounts': {'total': 240.0},
+        'vendor': 'Corner Pharmacy',
+        'payment_method': 'Card',
+        'invoice_number': None,
+        'tax_amount': None,
+        'tax_percentage': None,
+        'email': None,
+        'phone': None,
+        'confidence': 55,
+    },
+}
+
+
+@pytest.fixture(scope='module')
+def extractor():
+    return DataExtractor()
+
+
+@pytest.mark.parametrize('name', sorted(MULTI_PAGE_DOCUMENTS))
+def test_joined_text_matches_baseline(extractor, name):
+    text = '\n'.join(MULTI_PAGE_DOCUMENTS[name])
+
+    data = extractor.extract_all_data(text)
+
+    assert data.pop('raw_text') == text[:2000]
+    assert data == EXPECTED[name]
+
+
+@pytest.mark.parametrize('name', sorted(MULTI_PAGE_DOCUMENTS))
+def test_streamed_pages_match_baseline(extractor, name):
+    pages = MULTI_PAGE_DOCUMENTS[name]
+    text = '\n'.join(pages)
+
+    data, head, text_length = extractor.extract_streaming(iter(pages), keep_chars=40)
+
+    assert head == text[:40]
+    assert text_length == len(text)
+    assert data.pop('raw_text') == text[:40]
+    assert data == EXPECTED[name]
+
+
+def test_blank_pages_yield_no_data(extractor):
+    data, head, text_length = extractor.extract_streaming(['  ', '\n', 'abc'])
+
+    assert data is None
+    assert head == '  \n\n\nabc'
+    assert text_length == 8
@@ -0,0 +1,82 @@
+"""
+Lazy, thread-safe singleton tests
+
+Run with: pytest tests/test_lazy_init.py -v
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import app as app_module
+
+
+def slow_class(built):
+    """A stand-in whose construction is slow enough for callers to overlap"""
+    class Slow:
+        def __init__(self):
+            built.append(self)
+            time.sleep(0.05)
+    return Slow
+
+
+def call_concurrently(func, count=8):
+    start = threading.Barrier(count)
+
+    def call():
+        start.wait()
+        return func()
+
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        return list(executor.map(lambda _: call(), range(count)))
+
+
+class TestGetNlp:
+
+    def test_built_once_under_concurrency(self, monkeypatch):
+        built = []
+        monkeypatch.setattr(app_module, 'EnhancedSmartNLPProcessor', slow_class(built))
+        monkeypatch.setattr(app_module, 'nlp_processor', None)
+
+        results = call_concurrently(app_module.get_nlp)
+
+        assert len(built) == 1
+        assert all(result is built[0] for result in results)
+        assert app_module.get_nlp() is built[0]
+
+    def test_not_built_at_import(self):
+        # NLP_WARMUP is off by default: importing the app loads no models
+        assert not app_module.app.config['NLP_WARMUP']
+        assert 'nlp-warmup' not in {thread.name for thread in threading.enumerate()}
+
+
+class TestGetWorkflow:
+
+    def test_built_once_under_concurrency(self, monkeypatch):
+        import utils.processor
+
+        built = []
+        monkeypatch.setattr(utils.processor, 'DocumentProcessingWorkflow', slow_class(built))
+        monkeypatch.setattr(utils.processor, '_workflow', None)
+
+        results = call_concurrently(utils.processor.get_workflow)
+
+        assert len(built) == 1
+        assert all(result is built[0] for result in results)
+
+    def test_loads_saved_model(self, tmp_path, monkeypatch):
+        from utils.processor import DocumentProcessingWorkflow
+
+        monkeypatch.chdir(tmp_path)
+        first = DocumentProcessingWorkflow()
+        assert (tmp_path / 'ml_models' / 'category_classifier.pkl').exists()
+
+        trained = []
+        monkeypatch.setattr(first.categorizer.__class__, 'train',
+                            lambda self, *args, **kwargs: trained.append(self))
+        second = DocumentProcessingWorkflow()
+
+        assert trained == []
+        assert second.categorizer.trained
+        assert second.categorizer.predict_category('Uber', 'ride') == \
+            first.categorizer.predict_category('Uber', 'ride')
@@ -0,0 +1,84 @@
+"""
+Request profiling tests (Server-Timing header, ProfilerMiddleware)
+
+Run with: pytest tests/test_performance_monitor.py -v
+"""
+
+import re
+
+from flask import Flask
+from sqlalchemy import create_engine, text
+
+from utils.performance_monitor import PerformanceMonitor
+
+
+def make_app(**config):
+    """A bare app and in-memory engine wired to a fresh PerformanceMonitor"""
+    app = Flask(__name__)
+    app.config.update(config)
+    engine = create_engine('sqlite://')
+    monitor = PerformanceMonitor()
+    monitor.init_app(app, engine)
+
+    @app.route('/work')
+    def work():
+        with engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+        with monitor.timer('nlp'):
+            pass
+        return 'ok'
+
+    @app.route('/plain')
+    def plain():
+        return 'ok'
+
+    return app
+
+
+def timings(response):
+    """{name: ms} from a Server-Timing header"""
+    return {
+        name: float(ms)
+        for name, ms in re.findall(r'(\w+);dur=([\d.]+)', response.headers['Server-Timing'])
+    }
+
+
+class TestServerTiming:
+
+    def test_db_nlp_and_total(self):
+        response = make_app(SERVER_TIMING=True).test_client().get('/work')
+
+        assert set(timings(response)) == {'db', 'nlp', 'total'}
+        assert timings(response)['total'] >= timings(response)['db']
+
+    def test_only_total_without_work(self):
+        response = make_app(SERVER_TIMING=True).test_client().get('/plain')
+
+        assert set(timings(response)) == {'total'}
+
+    def test_off(self):
+        response = make_app(SERVER_TIMING=False).test_client().get('/work')
+
+        assert 'Server-Timing' not in response.headers
+
+    def test_app_sends_header(self, client):
+        response = client.get('/api/stats')
+
+        assert 'db' in timings(response)
+
+
+class TestProfiler:
+
+    def test_profile_dumped_per_request(self, tmp_path):
+        app = make_app(FLASK_PROFILE=True, PROFILE_DIR=str(tmp_path / 'profiles'))
+
+        app.test_client().get('/plain')
+
+        assert len(list((tmp_path / 'profiles').glob('*.prof'))) == 1
+
+    def test_off_by_default(self, tmp_path):
+        app = make_app(PROFILE_DIR=str(tmp_path / 'profiles'))
+
+        app.test_client().get('/plain')
+
+        assert not (tmp_path / 'profiles').exists()
@@ -367,6 +367,124 @@ class TestDataValidation:
         print(f"✓ Invalid base64 images handled gracefully")
 
 
+class TestReportCaching:
+    """Report ETags and cache entries follow the resolved period"""
+
+    def test_equivalent_queries_share_etag(self, client):
+        first = client.get('/api/reports/monthly?year=2025&month=3')
+        assert first.status_code == 200
+        same = client.get('/api/reports/monthly?year=2025&month=03',
+                          headers={'If-None-Match': first.headers['ETag']})
+        assert same.status_code == 304
+
+    def test_etag_changes_with_period(self, client):
+        march = client.get('/api/reports/monthly?year=2025&month=3')
+        april = client.get('/api/reports/monthly?year=2025&month=4',
+                           headers={'If-None-Match': march.headers['ETag']})
+        assert april.status_code == 200
+        assert april.headers['ETag'] != march.headers['ETag']
+
+    def test_etag_changes_with_date(self, client, monkeypatch):
+        from datetime import date
+        import routes.reports as reports_routes
+
+        first = client.get('/api/reports/custom?start_date=2025-01-01&end_date=2025-01-31')
+
+        class Tomorrow(date):
+            @classmethod
+            def today(cls):
+                return date.today() + timedelta(days=1)
+
+        monkeypatch.setattr(reports_routes, 'date', Tomorrow)
+        second = client.get('/api/reports/custom?start_date=2025-01-01&end_date=2025-01-31',
+                            headers={'If-None-Match': first.headers['ETag']})
+        assert second.status_code == 200
+        assert second.headers['ETag'] != first.headers['ETag']
+
+    def test_quarter_bounds(self):
+        from werkzeug.datastructures import MultiDict
+        from datetime import date
+        from routes.reports import _quarterly_period
+
+        assert _quarterly_period(MultiDict({'year': '2024', 'quarter': '1'})) == \
+            (date(2024, 1, 1), date(2024, 3, 31))
+        assert _quarterly_period(MultiDict({'year': '2024', 'quarter': '4'})) == \
+            (date(2024, 10, 1), date(2024, 12, 31))
+        assert _quarterly_period(MultiDict({'year': '2024', 'quarter': '5'})) is None
+
+
+class TestChartCache:
+    """Decoded chart PNGs live in their own byte-bounded cache"""
+
+    def test_charts_stay_out_of_response_cache(self, app, monkeypatch):
+        import base64
+        import routes.reports as reports_routes
+        from cachetools import TTLCache
+        from utils.cache_utils import cache
+
+        monkeypatch.setattr(reports_routes, '_chart_cache',
+                            TTLCache(maxsize=1024, ttl=60, getsizeof=len))
+        png = b'\x89PNG' + b'\x00' * 100
+        data = 'data:image/png;base64,' + base64.b64encode(png).decode()
+
+        assert reports_routes._decode_charts({'a': data, 'b': data}) == {'a': png, 'b': png}
+        assert len(reports_routes._chart_cache) == 1
+        assert not cache.cache._cache
+
+    def test_byte_limit(self, monkeypatch):
+        import base64
+        import routes.reports as reports_routes
+        from cachetools import TTLCache
+
+        monkeypatch.setattr(reports_routes, 'CHART_CACHE_BYTES', 256)
+        monkeypatch.setattr(reports_routes, '_chart_cache',
+                            TTLCache(maxsize=256, ttl=60, getsizeof=len))
+        charts = {
+            f'chart{i}': base64.b64encode(bytes([i]) * 100).decode() for i in range(5)
+        }
+        charts['huge'] = base64.b64encode(b'x' * 1000).decode()
+
+        decoded = reports_routes._decode_charts(charts)
+
+        assert decoded['huge'] == b'x' * 1000
+        assert len(decoded) == 6
+        assert reports_routes._chart_cache.currsize <= 256
+
+
+class TestPdfExport:
+    """POST /api/reports/export-pdf renders to a temp file and streams it"""
+
+    def test_streams_pdf_attachment(self, client):
+        report = client.get('/api/reports/monthly?year=2025&month=1').get_json()['report']
+
+        response = client.post('/api/reports/export-pdf',
+                               json={'report_data': report, 'report_type': 'monthly'})
+
+        assert response.status_code == 200
+        assert response.mimetype == 'application/pdf'
+        assert response.is_streamed
+        assert 'filename=Report_January_2025.pdf' in response.headers['Content-Disposition']
+        assert response.get_data().startswith(b'%PDF')
+        response.close()
+
+    def test_renders_into_given_file(self, app):
+        import tempfile
+
+        report = ReportGenerator.generate_monthly_report(2025, 1)
+        with tempfile.TemporaryFile() as dest:
+            result = PDFGenerator.generate_report_pdf(report, 'monthly', dest=dest)
+
+            assert result is dest
+            assert dest.tell() == 0
+            assert dest.read(4) == b'%PDF'
+
+    def test_rejects_bad_payloads(self, client):
+        assert client.post('/api/reports/export-pdf', json={'report_type': 'monthly'}).status_code == 400
+        assert client.post('/api/reports/export-pdf',
+                           json={'report_data': {'period': {}, 'summary': {}}, 'report_type': 'yearly'}
+                           ).status_code == 400
+
+
 if __name__ == '__main__':
     # Run tests
     pytest.main([__file__, '-v', '--tb=short'])
\ No newline at end of file
@@ -0,0 +1,78 @@
+"""
+JSON serialization tests
+
+Run with: pytest tests/test_serialization.py -v
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+
+import orjson
+import pytest
+from flask import jsonify, request
+
+from models.database import db
+from models.transaction import Transaction
+from utils.json_utils import dumps
+
+
+def add_transactions():
+    rows = [
+        Transaction(amount=12.5, vendor_name='Cafe', category_id=1, transaction_date=date(2025, 1, 2),
+                    payment_method='UPI', tax_amount=1.25, tax_percentage=10.0,
+                    reference_number='REF1', created_at=datetime(2025, 1, 2, 3, 4, 5, 678901)),
+        Transaction(amount=3.0, vendor_name='Kiosk', category_id=None, transaction_date=None),
+    ]
+    db.session.add_all(rows)
+    db.session.commit()
+    return rows
+
+
+class TestSerializeMany:
+    """Transaction.serialize_many() is wire-identical to to_dict()"""
+
+    def test_orm_instances(self, app):
+        rows = add_transactions()
+
+        assert orjson.loads(dumps(Transaction.serialize_many(rows))) == \
+            orjson.loads(dumps([t.to_dict() for t in rows]))
+
+    def test_column_rows(self, app):
+        rows = add_transactions()
+        column_rows = db.session.query(*Transaction.api_columns()).order_by(Transaction.id).all()
+
+        assert orjson.loads(dumps(Transaction.serialize_many(column_rows))) == \
+            orjson.loads(dumps([t.to_dict() for t in rows]))
+
+    def test_category_names(self, app):
+        cafe, kiosk = Transaction.serialize_many(add_transactions())
+
+        assert cafe['category'] == 'Food & Dining'
+        assert kiosk['category'] == 'Uncategorized'
+        assert kiosk['date'] is None
+
+
+class TestOrjsonProvider:
+    """app.json is the orjson provider; jsonify() and get_json() go through it"""
+
+    def test_jsonify(self, app):
+        with app.test_request_context():
+            response = jsonify(when=datetime(2025, 1, 2, 3, 4, 5), day=date(2025, 1, 2),
+                               price=Decimal('9.50'), label='Café', ids={1: 'a'})
+
+        assert response.mimetype == 'application/json'
+        assert orjson.loads(response.data) == {
+            'when': '2025-01-02T03:04:05', 'day': '2025-01-02',
+            'price': 9.5, 'label': 'Café', 'ids': {'1': 'a'},
+        }
+
+    def test_sort_keys(self, app):
+        assert app.json.dumps({'b': 1, 'a': 2}, sort_keys=True) == '{"a":2,"b":1}'
+
+    def test_request_json(self, app):
+        with app.test_request_context(json={'amount': 1.5, 'tags': ['x']}):
+            assert request.get_json() == {'amount': 1.5, 'tags': ['x']}
+
+    def test_unserializable(self, app):
+        with pytest.raises(TypeError):
+            app.json.dumps({'x': object()})
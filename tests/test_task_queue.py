@@ -0,0 +1,114 @@
+"""
+Background task queue tests
+
+Run with: pytest tests/test_task_queue.py -v
+"""
+
+import threading
+import time
+
+from flask import Flask
+
+from models.database import db
+from models.document import Document
+from utils.task_queue import TaskQueue
+
+
+def wait_for(queue, task_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while True:
+        task = queue.get(task_id)
+        if task['status'] in ('finished', 'failed') or time.monotonic() > deadline:
+            return task
+        time.sleep(0.01)
+
+
+def make_queue(**config):
+    app = Flask(__name__)
+    app.config.update(config)
+    queue = TaskQueue()
+    queue.init_app(app)
+    return queue
+
+
+class TestTaskQueue:
+
+    def test_lifecycle(self):
+        queue = make_queue(TASK_QUEUE_WORKERS=1)
+        release = threading.Event()
+        blocker = queue.enqueue(release.wait, 5)
+        waiting = queue.enqueue(lambda a, b=0: a + b, 2, b=3)
+
+        assert queue.get(waiting)['status'] == 'queued'
+        release.set()
+
+        assert wait_for(queue, blocker)['status'] == 'finished'
+        task = wait_for(queue, waiting)
+        assert task == {'id': waiting, 'status': 'finished', 'result': 5, 'error': None}
+
+    def test_failure_recorded(self):
+        queue = make_queue()
+
+        task = wait_for(queue, queue.enqueue(lambda: 1 / 0))
+
+        assert task['status'] == 'failed'
+        assert task['error'] == 'division by zero'
+
+    def test_runs_in_app_context(self):
+        from flask import current_app
+
+        queue = make_queue()
+
+        task = wait_for(queue, queue.enqueue(lambda: current_app.name))
+
+        assert task['result'] == __name__
+
+    def test_unknown_and_expired(self, monkeypatch):
+        from cachetools import TTLCache
+        import utils.task_queue
+
+        clock = [0.0]
+        monkeypatch.setattr(utils.task_queue, 'TTLCache',
+                            lambda maxsize, ttl: TTLCache(maxsize, ttl, timer=lambda: clock[0]))
+        queue = make_queue(TASK_RESULT_TTL=60)
+        task_id = queue.enqueue(lambda: None)
+        wait_for(queue, task_id)
+
+        assert queue.get('nope') is None
+        clock[0] = 61.0
+        assert queue.get(task_id) is None
+
+
+class TestProcessDocumentEndpoint:
+    """POST /api/process-document/<id> queues the work; /api/task/<id> reports it"""
+
+    def test_queued_and_polled(self, client, monkeypatch):
+        document = Document(filename='a.pdf', original_filename='a.pdf', file_type='receipt',
+                            file_path='/nonexistent/a.pdf', processed=False)
+        db.session.add(document)
+        db.session.commit()
+        monkeypatch.setattr('app._process_document_task',
+                            lambda doc_id: {'success': True, 'message': 'done', 'doc_id': doc_id})
+
+        response = client.post(f'/api/process-document/{document.id}')
+
+        assert response.status_code == 202
+        body = response.get_json()
+        assert body['status'] == 'queued'
+        deadline = time.monotonic() + 10
+        while True:
+            task = client.get(f"/api/task/{body['task_id']}").get_json()['task']
+            if task['status'] == 'finished' or time.monotonic() > deadline:
+                break
+            time.sleep(0.01)
+        assert task['result'] == {'success': True, 'message': 'done', 'doc_id': document.id}
+
+    def test_rejected_up_front(self, client):
+        document = Document(filename='b.pdf', original_filename='b.pdf', file_type='receipt',
+                            file_path='/nonexistent/b.pdf', processed=True)
+        db.session.add(document)
+        db.session.commit()
+
+        assert client.post('/api/process-document/999999').status_code == 404
+        assert client.post(f'/api/process-document/{document.id}').status_code == 400
+        assert client.get('/api/task/unknown').status_code == 404
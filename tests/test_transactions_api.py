@@ -0,0 +1,504 @@
+"""
+Transaction API tests
+
+Run with: pytest tests/test_transactions_api.py -v
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+
+from models.database import db
+from models.transaction import Transaction
+
+
+def add_transaction(**fields):
+    values = {
+        'amount': 100.0,
+        'vendor_name': 'Store',
+        'transaction_date': date(2025, 1, 15),
+        'category_id': 1,
+    }
+    values.update(fields)
+    transaction = Transaction(**values)
+    db.session.add(transaction)
+    db.session.commit()
+    return transaction
+
+
+class TestUpdateTransaction:
+    """PUT /api/transactions/<id>"""
+
+    def test_empty_body_returns_current_row(self, client):
+        transaction = add_transaction(vendor_name='Cafe')
+
+        response = client.put(f'/api/transactions/{transaction.id}', json={})
+
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body['success'] is True
+        assert body['transaction']['id'] == transaction.id
+        assert body['transaction']['vendor'] == 'Cafe'
+
+    def test_empty_body_missing_row_is_404(self, client):
+        response = client.put('/api/transactions/999999', json={})
+
+        assert response.status_code == 404
+
+    def test_update_returns_fresh_updated_at(self, client):
+        stale = datetime(2020, 1, 1)
+        transaction = add_transaction(updated_at=stale)
+
+        response = client.put(f'/api/transactions/{transaction.id}', json={'amount': 250})
+
+        assert response.status_code == 200
+        returned = response.get_json()['transaction']
+        assert returned['amount'] == 250
+        assert returned['updated_at'] is not None
+        assert not returned['updated_at'].startswith('2020-01-01')
+
+        db.session.expire_all()
+        stored = db.session.get(Transaction, transaction.id).updated_at
+        assert stored > stale
+        assert datetime.utcnow() - stored < timedelta(minutes=5)
+
+    def test_vendor_and_date(self, client):
+        transaction = add_transaction(vendor_name='Cafe')
+
+        response = client.put(f'/api/transactions/{transaction.id}',
+                              json={'vendor_name': '  Bakery ', 'transaction_date': '2025-02-03'})
+
+        assert response.status_code == 200
+        updated = response.get_json()['transaction']
+        assert updated['vendor'] == 'Bakery'
+        assert updated['date'] == '2025-02-03'
+
+    def test_invalid_payloads(self, client):
+        transaction = add_transaction(vendor_name='Cafe')
+
+        for payload in ({'vendor_name': ''}, {'vendor_name': '   '},
+                        {'transaction_date': ''}, {'transaction_date': '03/02/2025'},
+                        {'amount': 0}):
+            response = client.put(f'/api/transactions/{transaction.id}', json=payload)
+            assert response.status_code == 400, payload
+
+        db.session.expire_all()
+        assert db.session.get(Transaction, transaction.id).vendor_name == 'Cafe'
+
+
+class TestCreateTransaction:
+    """POST /api/transactions (msgspec TransactionCreate)"""
+
+    def post(self, client, **payload):
+        body = {'amount': 120.5, 'vendor_name': 'Cafe', 'category_id': 1}
+        body.update(payload)
+        return client.post('/api/transactions', json=body)
+
+    def test_valid_payload(self, client):
+        response = self.post(client, transaction_date='2025-02-03', description='  Lunch  ')
+
+        assert response.status_code == 200
+        created = response.get_json()['transaction']
+        assert created['amount'] == 120.5
+        assert created['date'] == '2025-02-03'
+        assert created['description'] == 'Lunch'
+        assert created['payment_method'] == 'Other'
+        assert db.session.get(Transaction, created['id']) is not None
+
+    def test_defaults_date_to_today(self, client):
+        for payload in ({}, {'transaction_date': None}):
+            response = self.post(client, **payload)
+
+            assert response.status_code == 200
+            assert response.get_json()['transaction']['date'] == date.today().isoformat()
+
+    def test_payment_method_normalized(self, client):
+        assert self.post(client, payment_method='upi').get_json()['transaction']['payment_method'] == 'UPI'
+        assert self.post(client, payment_method=' net banking ').get_json()['transaction']['payment_method'] == 'Net Banking'
+        assert self.post(client, payment_method='Crypto').get_json()['transaction']['payment_method'] == 'Crypto'
+        assert self.post(client, payment_method='').get_json()['transaction']['payment_method'] == 'Other'
+
+    def test_category_normalized(self, client):
+        response = self.post(client, category_id='2', amount='99.5')
+
+        assert response.status_code == 200
+        created = response.get_json()['transaction']
+        assert created['category_id'] == 2
+        assert created['category'] == 'Transportation'
+        assert created['amount'] == 99.5
+
+    def test_unknown_category_rejected(self, client):
+        response = self.post(client, category_id=999)
+
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'Invalid category ID'
+
+    def test_unknown_fields_ignored(self, client):
+        response = self.post(client, user_id=42, source='hdfc_email', nonsense=True)
+
+        assert response.status_code == 200
+        created = db.session.get(Transaction, response.get_json()['transaction']['id'])
+        assert created.user_id is None
+        assert created.source == 'manual'
+
+    def test_invalid_payloads(self, client):
+        cases = [
+            {'amount': 0},
+            {'amount': -5},
+            {'amount': 'abc'},
+            {'vendor_name': ''},
+            {'vendor_name': '   '},
+            {'category_id': 'food'},
+            {'transaction_date': '03/02/2025'},
+        ]
+        for payload in cases:
+            response = self.post(client, **payload)
+            assert response.status_code == 400, payload
+            assert response.get_json()['success'] is False
+
+    def test_missing_required_field(self, client):
+        response = client.post('/api/transactions', json={'amount': 10, 'category_id': 1})
+
+        assert response.status_code == 400
+        assert 'vendor_name' in response.get_json()['error']
+
+    def test_malformed_json(self, client):
+        response = client.post('/api/transactions', data=b'{"amount": ',
+                               content_type='application/json')
+
+        assert response.status_code == 400
+        assert db.session.query(Transaction).count() == 0
+
+
+class TestKeysetPagination:
+    """GET /api/transactions?cursor= (_keyset_transactions)"""
+
+    def walk(self, client, per_page, **args):
+        """Follow next_cursor from the first page; returns (ids, pages)"""
+        ids, pages, cursor = [], 0, ''
+        while True:
+            response = client.get('/api/transactions', query_string={
+                'cursor': cursor, 'per_page': per_page, **args
+            })
+            assert response.status_code == 200
+            body = response.get_json()
+            ids += [t['id'] for t in body['transactions']]
+            pages += 1
+            assert body['has_next'] == (body['next_cursor'] is not None)
+            if not body['has_next']:
+                return ids, pages
+            cursor = body['next_cursor']
+
+    def test_ties_on_date(self, client):
+        same_day = [add_transaction(transaction_date=date(2025, 3, 1)).id for _ in range(5)]
+        older = add_transaction(transaction_date=date(2025, 2, 1)).id
+
+        ids, pages = self.walk(client, per_page=2)
+
+        assert ids == sorted(same_day, reverse=True) + [older]
+        assert pages == 3
+
+    def test_undated_rows_follow_dated(self, client):
+        undated = [add_transaction(transaction_date=None).id for _ in range(3)]
+        dated = [add_transaction(transaction_date=date(2025, 1, day)).id for day in (1, 2)]
+
+        ids, _ = self.walk(client, per_page=2)
+
+        assert ids == list(reversed(dated)) + sorted(undated, reverse=True)
+
+    def test_cursor_round_trip(self, client):
+        first = add_transaction(transaction_date=date(2025, 1, 2))
+        second = add_transaction(transaction_date=date(2025, 1, 1))
+
+        page = client.get('/api/transactions?cursor=&per_page=1').get_json()
+        assert [t['id'] for t in page['transactions']] == [first.id]
+        assert page['next_cursor'] == f'2025-01-02_{first.id}'
+
+        page = client.get('/api/transactions', query_string={
+            'cursor': page['next_cursor'], 'per_page': 1
+        }).get_json()
+        assert [t['id'] for t in page['transactions']] == [second.id]
+        assert page['next_cursor'] is None
+
+    def test_exact_page_has_no_next(self, client):
+        for day in (1, 2):
+            add_transaction(transaction_date=date(2025, 1, day))
+
+        page = client.get('/api/transactions?cursor=&per_page=2').get_json()
+
+        assert len(page['transactions']) == 2
+        assert page['has_next'] is False
+
+    def test_include_total(self, client):
+        for day in (1, 2, 3):
+            add_transaction(transaction_date=date(2025, 1, day))
+
+        page = client.get('/api/transactions?cursor=&per_page=1&include_total=1').get_json()
+
+        assert page['total'] == 3
+
+    def test_invalid_cursor(self, client):
+        for cursor in ('garbage', '2025-13-01_5', '2025-01-01_x', '_'):
+            response = client.get('/api/transactions', query_string={'cursor': cursor})
+            assert response.status_code == 400, cursor
+            assert response.get_json()['error'] == 'Invalid cursor'
+
+    def test_date_range_filters(self, client):
+        ids = {day: add_transaction(transaction_date=date(2025, 1, day)).id for day in (1, 15, 31)}
+
+        found, _ = self.walk(client, per_page=10, start_date='2025-01-15', end_date='2025-01-31')
+
+        assert found == [ids[31], ids[15]]
+
+    def test_invalid_date_range(self, client):
+        response = client.get('/api/transactions?cursor=&start_date=2025-1-1x')
+
+        assert response.status_code == 400
+
+
+class TestBulkDelete:
+    """POST /api/transactions/bulk-delete"""
+
+    def test_deletes_only_requested_rows(self, client):
+        requested = [add_transaction().id for _ in range(3)]
+        untouched = add_transaction()
+
+        response = client.post('/api/transactions/bulk-delete',
+                               json={'transaction_ids': requested + [999999]})
+
+        assert response.status_code == 200
+        assert response.get_json()['deleted_count'] == 3
+        remaining = {row.id for row in db.session.query(Transaction.id)}
+        assert remaining == {untouched.id}
+
+    def test_resyncs_budgets_of_deleted_rows(self, client):
+        from models.budget import Budget
+        from utils.budget_utils import BudgetUtils
+
+        jan = Budget(category_id=1, month=1, year=2025, amount=500.0)
+        feb = Budget(category_id=2, month=2, year=2025, amount=500.0)
+        db.session.add_all([jan, feb])
+        deleted = add_transaction(category_id=1, transaction_date=date(2025, 1, 31), amount=40.0)
+        kept = add_transaction(category_id=1, transaction_date=date(2025, 1, 1), amount=25.0)
+        emptied = add_transaction(category_id=2, transaction_date=date(2025, 2, 1), amount=70.0)
+        BudgetUtils.sync_transaction_budgets_bulk([deleted, kept, emptied])
+        assert (jan.spent, feb.spent) == (65.0, 70.0)
+
+        response = client.post('/api/transactions/bulk-delete',
+                               json={'transaction_ids': [deleted.id, emptied.id]})
+
+        assert response.status_code == 200
+        db.session.expire_all()
+        assert db.session.get(Budget, jan.id).spent == 25.0
+        assert db.session.get(Budget, feb.id).spent == 0.0
+
+    def test_invalid_ids(self, client):
+        assert client.post('/api/transactions/bulk-delete', json={'transaction_ids': []}).status_code == 400
+        assert client.post('/api/transactions/bulk-delete', json={'transaction_ids': ['x']}).status_code == 400
+
+    def test_error_logs_traceback(self, client, monkeypatch, caplog):
+        from utils.db_utils import DatabaseUtils
+
+        def broken(*args):
+            raise RuntimeError('boom')
+
+        monkeypatch.setattr(DatabaseUtils, 'id_in', broken)
+
+        with caplog.at_level(logging.ERROR, logger='app'):
+            response = client.post('/api/transactions/bulk-delete', json={'transaction_ids': [1]})
+
+        assert response.status_code == 500
+        record, = [r for r in caplog.records if r.getMessage().startswith('Error in bulk delete')]
+        assert record.exc_info is not None
+
+
+def wait_for_task(client, task_id, timeout=10):
+    """Poll /api/task/<id> until the task finishes or fails"""
+    import time
+
+    deadline = time.monotonic() + timeout
+    while True:
+        task = client.get(f'/api/task/{task_id}').get_json()['task']
+        if task['status'] in ('finished', 'failed') or time.monotonic() > deadline:
+            return task
+        time.sleep(0.05)
+
+
+def import_csv(client, text, filename='import.csv'):
+    from io import BytesIO
+
+    data = text.encode('utf-8') if isinstance(text, str) else text
+    return client.post('/api/transactions/import', data={'file': (BytesIO(data), filename)},
+                       content_type='multipart/form-data')
+
+
+class TestImport:
+    """POST /api/transactions/import"""
+
+    def test_rows_inserted_in_batches(self, client, monkeypatch):
+        from sqlalchemy import event
+        import app as app_module
+
+        monkeypatch.setattr(app_module, 'IMPORT_BATCH_SIZE', 2)
+        batches = []
+
+        def count_inserts(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith('INSERT INTO transactions'):
+                batches.append(len(parameters) if executemany else 1)
+
+        rows = ''.join(f'2025-01-{day:02d},{day}.5,Vendor {day},2,upi\n' for day in range(1, 6))
+        event.listen(db.engine, 'before_cursor_execute', count_inserts)
+        try:
+            response = import_csv(client, 'date,amount,vendor,category_id,payment_method\n' + rows)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count_inserts)
+
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body['imported_count'] == 5 and body['errors'] == []
+        assert batches == [2, 2, 1]
+        stored = db.session.query(Transaction).order_by(Transaction.transaction_date).all()
+        assert [(t.transaction_date.day, t.amount, t.vendor_name, t.category_id, t.payment_method)
+                for t in stored] == [(day, day + 0.5, f'Vendor {day}', 2, 'UPI') for day in range(1, 6)]
+
+    def test_bad_rows_reported_and_skipped(self, client):
+        response = import_csv(client, (
+            'date,amount,vendor,category_id\n'
+            '2025-01-01,10,Good,1\n'
+            '01/02/2025,10,Bad date,1\n'
+            '2025-01-03,abc,Bad amount,1\n'
+            '2025-01-04,10,Bad category,999\n'
+            '2025-01-05,20,Also good,1\n'
+        ))
+
+        body = response.get_json()
+        assert body['imported_count'] == 2
+        assert [error.split(':')[0] for error in body['errors']] == ['Row 3', 'Row 4', 'Row 5']
+        assert 'invalid category_id 999' in body['errors'][2]
+        assert {t.vendor_name for t in db.session.query(Transaction)} == {'Good', 'Also good'}
+
+    def test_decoded_from_the_upload_stream(self, client):
+        # Excel-style export: UTF-8 BOM, CRLF line ends, a quoted multi-line field
+        data = (
+            '\ufeffdate,amount,vendor,description\r\n'
+            '2025-01-01,10,Café,"Lunch,\r\nwith team"\r\n'
+            '2025-01-02,20,Taxi,Ride\r\n'
+        ).encode('utf-8')
+
+        body = import_csv(client, data).get_json()
+
+        assert body['imported_count'] == 2 and body['errors'] == []
+        stored = {t.vendor_name: t.description for t in db.session.query(Transaction)}
+        assert stored == {'Café': 'Lunch,\r\nwith team', 'Taxi': 'Ride'}
+
+    def test_budget_sync_runs_as_one_task(self, client):
+        from models.budget import Budget
+
+        jan = Budget(category_id=1, month=1, year=2025, amount=500.0, spent=0.0)
+        feb = Budget(category_id=1, month=2, year=2025, amount=500.0, spent=0.0)
+        db.session.add_all([jan, feb])
+        db.session.commit()
+
+        body = import_csv(client, (
+            'date,amount,vendor,category_id\n'
+            '2025-01-05,10,A,1\n'
+            '2025-01-20,15,B,1\n'
+            '2025-02-01,30,C,1\n'
+            '2025-02-01,99,D,2\n'
+        )).get_json()
+
+        assert body['budget_periods'] == 3
+        task = wait_for_task(client, body['budget_sync_task_id'])
+        assert task['status'] == 'finished'
+        assert task['result'] == 2
+        db.session.expire_all()
+        assert db.session.get(Budget, jan.id).spent == 25.0
+        assert db.session.get(Budget, feb.id).spent == 30.0
+
+    def test_no_task_without_rows(self, client):
+        body = import_csv(client, 'date,amount,vendor\n').get_json()
+
+        assert body['imported_count'] == 0
+        assert body['budget_sync_task_id'] is None
+
+    def test_rejects_non_csv(self, client):
+        assert import_csv(client, 'x', filename='import.xlsx').status_code == 400
+
+
+class TestValidateDuplicate:
+    """POST /api/transactions/validate-duplicate"""
+
+    def check(self, client, **payload):
+        body = {'vendor_name': 'Cafe', 'amount': 120.0, 'transaction_date': '2025-01-15'}
+        body.update(payload)
+        response = client.post('/api/transactions/validate-duplicate', json=body)
+        assert response.status_code == 200
+        return response.get_json()
+
+    def test_same_vendor_and_amount_within_a_day(self, client):
+        existing = add_transaction(vendor_name='Cafe', amount=120.0, transaction_date=date(2025, 1, 14))
+
+        body = self.check(client)
+
+        assert body['is_duplicate'] is True
+        assert [t['id'] for t in body['similar_transactions']] == [existing.id]
+
+    def test_not_duplicates(self, client):
+        add_transaction(vendor_name='Cafe', amount=120.0, transaction_date=date(2025, 1, 12))
+        add_transaction(vendor_name='Cafe', amount=120.5, transaction_date=date(2025, 1, 15))
+        add_transaction(vendor_name='Bakery', amount=120.0, transaction_date=date(2025, 1, 15))
+
+        assert self.check(client) == {'success': True, 'is_duplicate': False}
+
+    def test_defaults_to_today(self, client):
+        add_transaction(vendor_name='Cafe', amount=120.0, transaction_date=date.today())
+
+        assert self.check(client, transaction_date=None)['is_duplicate'] is True
+        assert self.check(client, transaction_date='')['is_duplicate'] is True
+
+    def test_at_most_five_matches(self, client):
+        for _ in range(7):
+            add_transaction(vendor_name='Cafe', amount=120.0, transaction_date=date(2025, 1, 15))
+
+        assert len(self.check(client)['similar_transactions']) == 5
+
+    def test_cached_statement_binds_each_call(self, client):
+        # _DUPLICATE_STMT is built once; every value must come from bindparams
+        cafe = add_transaction(vendor_name='Cafe', amount=120.0, transaction_date=date(2025, 1, 15))
+        bakery = add_transaction(vendor_name='Bakery', amount=80.0, transaction_date=date(2025, 3, 1))
+
+        for _ in range(2):
+            first = self.check(client)
+            second = self.check(client, vendor_name='Bakery', amount=80, transaction_date='2025-03-02')
+            third = self.check(client, vendor_name='Bakery', amount=80, transaction_date='2025-03-05')
+
+            assert [t['id'] for t in first['similar_transactions']] == [cafe.id]
+            assert [t['id'] for t in second['similar_transactions']] == [bakery.id]
+            assert third['is_duplicate'] is False
+
+    def test_invalid_date(self, client):
+        response = client.post('/api/transactions/validate-duplicate',
+                               json={'vendor_name': 'Cafe', 'amount': 1, 'transaction_date': '15/01/2025'})
+
+        assert response.status_code == 400
+
+
+class TestPaymentMethod:
+    """Canonical payment_method labels on write and in the list filter"""
+
+    def test_normalize(self):
+        normalize = Transaction.normalize_payment_method
+
+        assert normalize('upi') == 'UPI'
+        assert normalize(' NET BANKING ') == 'Net Banking'
+        assert normalize('Crypto') == 'Crypto'
+        assert normalize('') == 'Other'
+        assert normalize(None) == 'Other'
+
+    def test_list_filter_any_case(self, client):
+        upi = add_transaction(payment_method='UPI')
+        add_transaction(payment_method='Cash')
+
+        for value in ('UPI', 'upi', ' Upi '):
+            body = client.get('/api/transactions', query_string={'payment_method': value}).get_json()
+            assert [t['id'] for t in body['transactions']] == [upi.id], value
+            assert body['total'] == 1
@@ -4,12 +4,16 @@ Automatically sync budget spending when transactions are added/modified
 ✅ NOW WITH NOTIFICATION INTEGRATION
 """
 
+import logging
+
 from models.database import db
 from models.budget import Budget
 from models.transaction import Transaction
 from sqlalchemy import extract, func
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 
 class BudgetUtils:
     """Utility functions for budget management"""
@@ -54,47 +58,31 @@ class BudgetUtils:
                 from models.notification_system import BudgetNotificationManager
                 BudgetNotificationManager.check_and_notify_budget_status(budget)
             except Exception as e:
-                print(f"⚠️ Notification error (non-critical): {e}")
+                logger.warning("Notification error (non-critical): %s", e)
             
             return budget
             
         except Exception as e:
             db.session.rollback()
-            print(f"❌ Error syncing budget: {e}")
+            logger.error("Error syncing budget: %s", e)
             return None
     
     @staticmethod
     def sync_all_budgets():
-        """Sync all budgets with current spending"""
+        """
+        Sync all budgets with current spending
+        
+        Spending for every budget comes from one grouped query (see
+        stage_budget_periods()) rather than a SUM per budget.
+        """
         try:
-            budgets = Budget.query.all()
-            updated_count = 0
-            
-            for budget in budgets:
-                spent = db.session.query(func.sum(Transaction.amount)).filter(
-                    Transaction.category_id == budget.category_id,
-                    extract('month', Transaction.transaction_date) == budget.month,
-                    extract('year', Transaction.transaction_date) == budget.year
-                ).scalar()
-                
-                budget.spent = spent if spent else 0.0
-                updated_count += 1
-                
-                # ✅ NOTIFICATION: Check each budget status
-                try:
-                    from models.notification_system import BudgetNotificationManager
-                    BudgetNotificationManager.check_and_notify_budget_status(budget)
-                except Exception as e:
-                    print(f"⚠️ Notification error for budget {budget.id}: {e}")
-            
-            db.session.commit()
-            print(f"✅ Synced {updated_count} budgets")
-            return updated_count
-            
+            periods = [tuple(row) for row in db.session.query(Budget.category_id, Budget.month, Budget.year)]
         except Exception as e:
             db.session.rollback()
-            print(f"❌ Error syncing all budgets: {e}")
+            logger.error("Error syncing all budgets: %s", e)
             return 0
+        
+        return BudgetUtils.sync_budget_periods(periods)
     
     @staticmethod
     def auto_create_budgets_from_history(month, year, lookback_months=3):
@@ -185,15 +173,15 @@ class BudgetUtils:
                         action_url='/budgets',
                         action_label='View Budgets'
                     )
-                    print(f"✅ Notification sent: {len(created_budgets)} budgets auto-created")
+                    logger.debug("Notification sent: %d budgets auto-created", len(created_budgets))
                 except Exception as e:
-                    print(f"⚠️ Notification error: {e}")
+                    logger.warning("Notification error: %s", e)
             
             return created_budgets
             
         except Exception as e:
             db.session.rollback()
-            print(f"❌ Error auto-creating budgets: {e}")
+            logger.error("Error auto-creating budgets: %s", e)
             return []
     
     @staticmethod
@@ -261,7 +249,7 @@ class BudgetUtils:
             }
             
         except Exception as e:
-            print(f"❌ Error calculating budget health: {e}")
+            logger.error("Error calculating budget health: %s", e)
             return {
                 'score': 0,
                 'status': 'error',
@@ -342,9 +330,95 @@ class BudgetUtils:
             }
             
         except Exception as e:
-            print(f"❌ Error generating recommendations: {e}")
+            logger.error("Error generating recommendations: %s", e)
             return None
         
+    @staticmethod
+    def transaction_periods(transactions):
+        """
+        Budget periods touched by some transactions
+        
+        Args:
+            transactions: Transaction objects or row dicts with
+                          'category_id' and 'transaction_date'
+        
+        Returns:
+            Set of (category_id, month, year)
+        """
+        periods = set()
+        
+        for t in transactions:
+            if isinstance(t, dict):
+                category_id, transaction_date = t.get('category_id'), t.get('transaction_date')
+            else:
+                category_id, transaction_date = t.category_id, t.transaction_date
+            
+            if category_id and transaction_date:
+                periods.add((category_id, transaction_date.month, transaction_date.year))
+        
+        return periods
+    
+    @staticmethod
+    def stage_budget_periods(periods):
+        """
+        Recompute spent for the budgets of some periods without committing
+        
+        The updates join the caller's DB transaction, so a transaction write
+        and its budget sync commit (or roll back) together. One query loads
+        the budgets and one grouped query sums their spending, however many
+        periods are affected. Call notify_budget_status() after committing.
+        
+        Args:
+            periods: Iterable of (category_id, month, year)
+            
+        Returns:
+            List of updated budgets
+        """
+        periods = set(periods)
+        if not periods:
+            return []
+        
+        category_ids = {category_id for category_id, _, _ in periods}
+        budgets = [
+            b for b in Budget.query.filter(Budget.category_id.in_(category_ids)).all()
+            if (b.category_id, b.month, b.year) in periods
+        ]
+        if not budgets:
+            return []
+        
+        first_year, first_month = min((b.year, b.month) for b in budgets)
+        last_year, last_month = max((b.year, b.month) for b in budgets)
+        next_year, next_month = (last_year, last_month + 1) if last_month < 12 else (last_year + 1, 1)
+        
+        year_col = extract('year', Transaction.transaction_date)
+        month_col = extract('month', Transaction.transaction_date)
+        rows = db.session.query(
+            Transaction.category_id, year_col, month_col, func.sum(Transaction.amount)
+        ).filter(
+            Transaction.category_id.in_({b.category_id for b in budgets}),
+            Transaction.transaction_date >= datetime(first_year, first_month, 1).date(),
+            Transaction.transaction_date < datetime(next_year, next_month, 1).date()
+        ).group_by(Transaction.category_id, year_col, month_col).all()
+        spent_by_period = {
+            (category_id, int(month), int(year)): total
+            for category_id, year, month, total in rows
+        }
+        
+        for budget in budgets:
+            budget.spent = spent_by_period.get((budget.category_id, budget.month, budget.year)) or 0.0
+        
+        return budgets
+    
+    @staticmethod
+    def notify_budget_status(budgets):
+        """Run budget notifications for budgets synced by stage_budget_periods()"""
+        for budget in budgets:
+            try:
+                from models.notification_system import BudgetNotificationManager
+                BudgetNotificationManager.check_and_notify_budget_status(budget)
+            except Exception as e:
+                logger.warning("Notification error for budget %s: %s", budget.id, e)
+    
     @staticmethod
     def sync_transaction_budgets(transaction, old_category_id=None, old_date=None):
         """
@@ -360,43 +434,77 @@ class BudgetUtils:
         - New transactions: Sync the target budget
         - Updated transactions: Sync both old and new budgets (if changed)
         - Deleted transactions: Sync the source budget
+        
+        Commits any pending changes in the session together with the budgets.
         """
         try:
-            budgets_to_sync = set()  # Use set to avoid duplicates
-            
-            # Current transaction budget
-            if transaction.category_id and transaction.transaction_date:
-                budgets_to_sync.add((
-                    transaction.category_id,
-                    transaction.transaction_date.month,
-                    transaction.transaction_date.year
-                ))
+            budgets_to_sync = BudgetUtils.transaction_periods([transaction])
             
             # Previous budget (if transaction was moved)
             if old_category_id and old_date:
-                budgets_to_sync.add((
-                    old_category_id,
-                    old_date.month,
-                    old_date.year
-                ))
-            
-            # Sync all affected budgets
-            synced_budgets = []
-            for category_id, month, year in budgets_to_sync:
-                budget = BudgetUtils.sync_budget_spending(category_id, month, year)
-                if budget:
-                    synced_budgets.append(budget)
-                    print(f"✅ Budget synced: {budget.category.name if budget.category else 'Unknown'} - {month}/{year}")
+                budgets_to_sync.add((old_category_id, old_date.month, old_date.year))
+            
+            synced_budgets = BudgetUtils.stage_budget_periods(budgets_to_sync)
+            db.session.commit()
+            BudgetUtils.notify_budget_status(synced_budgets)
+            
+            logger.debug("Synced %d budgets", len(synced_budgets))
             
             return True
             
         except Exception as e:
-            print(f"❌ Error syncing transaction budgets: {e}")
-            import traceback
-            traceback.print_exc()
+            db.session.rollback()
+            logger.error("Error syncing transaction budgets: %s", e, exc_info=True)
             return False
 
 
+    @staticmethod
+    def sync_transaction_budgets_bulk(transactions):
+        """
+        Sync budgets affected by many new transactions at once
+        
+        Args:
+            transactions: Transaction objects or row dicts with
+                          'category_id' and 'transaction_date'
+        
+        Each affected (category, month, year) budget is recomputed once,
+        however many of the transactions fall into it.
+        
+        Returns:
+            Number of budgets synced
+        """
+        return BudgetUtils.sync_budget_periods(BudgetUtils.transaction_periods(transactions))
+    
+    @staticmethod
+    def sync_budget_periods(periods):
+        """
+        Recompute, commit and notify the budgets of some periods
+        
+        Self-contained (own commit), so it can run as a background task
+        after the transactions it depends on are committed.
+        
+        Args:
+            periods: Iterable of (category_id, month, year)
+            
+        Returns:
+            Number of budgets synced
+        """
+        periods = set(periods)
+        
+        try:
+            synced_budgets = BudgetUtils.stage_budget_periods(periods)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Error syncing budgets: %s", e)
+            return 0
+        
+        BudgetUtils.notify_budget_status(synced_budgets)
+        
+        if synced_budgets:
+            logger.debug("Synced %d budgets for %d affected period(s)", len(synced_budgets), len(periods))
+        return len(synced_budgets)
+    
     @staticmethod
     def sync_deleted_transaction_budget(category_id, transaction_date):
         """
@@ -415,7 +523,7 @@ class BudgetUtils:
             )
             
             if budget:
-                print(f"✅ Budget synced after deletion: {budget.category.name if budget.category else 'Unknown'}")
+                logger.debug("Budget %s synced after deletion", budget.id)
             
             return budget
         return False
@@ -452,13 +560,13 @@ class BudgetUtils:
                         alerts_created += 1
                         
                 except Exception as e:
-                    print(f"⚠️ Error checking budget {budget.id}: {e}")
+                    logger.warning("Error checking budget %s: %s", budget.id, e)
             
-            print(f"✅ Checked {len(budgets)} budgets, created {alerts_created} alerts")
+            logger.debug("Checked %d budgets, created %d alerts", len(budgets), alerts_created)
             return alerts_created
             
         except Exception as e:
-            print(f"❌ Error checking budget alerts: {e}")
+            logger.error("Error checking budget alerts: %s", e)
             return 0
     
     @staticmethod
@@ -495,7 +603,7 @@ class BudgetUtils:
             return overspending
             
         except Exception as e:
-            print(f"❌ Error getting overspending categories: {e}")
+            logger.error("Error getting overspending categories: %s", e)
             return []
     
     @staticmethod
@@ -550,5 +658,5 @@ class BudgetUtils:
             }
             
         except Exception as e:
-            print(f"❌ Error getting budget summary: {e}")
+            logger.error("Error getting budget summary: %s", e)
             return None
\ No newline at end of file
@@ -0,0 +1,145 @@
+"""
+Response Cache Utilities
+Flask-Caching instance for the dashboard aggregate endpoints
+
+Cached entries are keyed on the current user, the request path/args and a
+"transactions version" stamp. Every write path bumps the stamp, so stale
+entries simply stop being addressed (O(1) invalidation, no key enumeration)
+and age out on their own timeout.
+
+The same stamp doubles as a weak ETag (etag_view) so browsers polling the
+dashboard revalidate with If-None-Match and get an empty 304 when nothing
+has changed. The ETag also carries a coarse time bucket: aggregates such as
+"this month" or the trend window move with the clock even when no write
+happens, so a client copy is never trusted for longer than one bucket.
+"""
+
+import time
+from functools import wraps
+
+from flask import Response, make_response, request
+from flask_caching import Cache
+from flask_login import current_user
+
+cache = Cache()
+
+TXN_VERSION_KEY = 'txn_version'
+
+# Explicit (long) timeout for the version stamp. SimpleCache evicts entries in
+# expiry order once it passes its threshold, and timeout=0 is stored as
+# expiry 0, i.e. first in line.
+TXN_VERSION_TIMEOUT = 30 * 24 * 3600
+
+# Matches the dashboard snapshot timeout (CacheUtils.get_or_build default)
+ETAG_BUCKET_SECONDS = 300
+
+
+def init_cache(app):
+    """Initialize response cache with app"""
+    cache.init_app(app)
+
+
+class CacheUtils:
+    """Helpers for versioned response caching"""
+
+    @staticmethod
+    def get_transactions_version():
+        """
+        Current transactions version stamp
+
+        A missing stamp (first use, or evicted) is replaced by a fresh one,
+        never by a default: falling back to a fixed value would make entries
+        and ETags from before the eviction current again.
+        """
+        version = cache.get(TXN_VERSION_KEY)
+        if version is None:
+            version = time.time_ns()
+            if not cache.add(TXN_VERSION_KEY, version, timeout=TXN_VERSION_TIMEOUT):
+                # Another worker seeded it first
+                version = cache.get(TXN_VERSION_KEY) or version
+        return version
+
+    @staticmethod
+    def bump_transactions_version():
+        """
+        Invalidate every cached aggregate after transactions change
+
+        A fresh nanosecond stamp is stored instead of incrementing a counter,
+        so concurrent writers never lose an update and the key never expires
+        back into a previously used value.
+        """
+        version = time.time_ns()
+        cache.set(TXN_VERSION_KEY, version, timeout=TXN_VERSION_TIMEOUT)
+        return version
+
+    @staticmethod
+    def get_or_build(name, builder, timeout=300):
+        """
+        Return a cached value for the current transactions version,
+        building it once with builder() on a miss
+        """
+        key = f'{name}|v{CacheUtils.get_transactions_version()}'
+        value = cache.get(key)
+        if value is None:
+            value = builder()
+            cache.set(key, value, timeout=timeout)
+        return value
+
+    @staticmethod
+    def make_cache_key(*args, **kwargs):
+        """Cache key: endpoint + sorted query args + user + transactions version"""
+        user_id = current_user.get_id() if current_user else None
+        args_key = '&'.join(f'{k}={v}' for k, v in sorted(request.args.items(multi=True)))
+        version = CacheUtils.get_transactions_version()
+        return f'view/{request.path}?{args_key}|u{user_id}|v{version}'
+
+    @staticmethod
+    def is_cacheable(response):
+        """Only cache successful responses"""
+        if isinstance(response, tuple):
+            return False
+        return getattr(response, 'status_code', 200) == 200
+
+
+def cached_view(timeout=60):
+    """Decorator for read-only JSON views backed by transaction aggregates"""
+    return cache.cached(
+        timeout=timeout,
+        make_cache_key=CacheUtils.make_cache_key,
+        response_filter=CacheUtils.is_cacheable
+    )
+
+
+def etag_view(version_func=None, bucket_seconds=ETAG_BUCKET_SECONDS):
+    """
+    Decorator: weak ETag from a version stamp, 304 when the client copy is current
+
+    version_func defaults to the transactions version. bucket_seconds adds a
+    time bucket so time-dependent responses are rebuilt at least that often;
+    pass None for views that depend on the version stamp alone. The check runs
+    before the view (and before cached_view), so an unchanged poll costs one
+    cache get.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            version = (version_func or CacheUtils.get_transactions_version)()
+            user_id = current_user.get_id() if current_user else None
+            etag = f'u{user_id}-v{version}'
+            if bucket_seconds:
+                etag += f'-t{int(time.time()) // bucket_seconds}'
+
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            # Always revalidate: a max-age would hide writes made in another tab
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
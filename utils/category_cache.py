@@ -0,0 +1,99 @@
+"""
+Category Cache
+Process-local snapshot of the categories table
+
+Categories are seeded once at startup and almost never change, so write
+paths validate category ids against this snapshot instead of issuing a
+SELECT per request. Any ORM insert/update/delete on Category drops the
+snapshot; it is rebuilt lazily on the next lookup.
+
+The serialized /api/categories payload is kept alongside it, so that
+endpoint skips both the query and per-row to_dict() once warm. That payload
+carries total_spent, so it is also tied to the transactions version.
+"""
+
+from sqlalchemy import event
+
+from models.database import db
+from models.category import Category
+from utils.json_utils import dumps
+from utils.cache_utils import CacheUtils
+
+
+class CategoryCache:
+    """In-memory {id: name} / {name: id} maps of categories"""
+
+    _by_id = None
+    _by_name = None
+    _json = None
+    version = 0
+
+    @classmethod
+    def load(cls):
+        """(Re)build the snapshot from the database (needs an app context)"""
+        by_id = {cat_id: name for cat_id, name in db.session.query(Category.id, Category.name)}
+        cls._by_name = {name: cat_id for cat_id, name in by_id.items()}
+        cls._by_id = by_id
+        return by_id
+
+    @classmethod
+    def get(cls, category_id):
+        """Category name for an id, or None if the id is unknown/invalid"""
+        by_id = cls._by_id if cls._by_id is not None else cls.load()
+        try:
+            return by_id.get(int(category_id))
+        except (TypeError, ValueError):
+            return None
+
+    @classmethod
+    def json_version(cls):
+        """Version of the categories payload (categories + transactions)"""
+        return f'{cls.version}.{CacheUtils.get_transactions_version()}'
+
+    @classmethod
+    def get_id_by_name(cls, name, fuzzy=False, default=None):
+        """
+        Category id for a name, or None
+
+        fuzzy=True falls back to the first (lowest id) category whose name
+        contains `name`, case-insensitively (the ILIKE '%name%' lookup).
+        default names a fallback category (e.g. 'Other') whose id is returned
+        when nothing matches.
+        """
+        if cls._by_id is None:
+            cls.load()
+        by_name = cls._by_name
+        if name in by_name:
+            return by_name[name]
+        if fuzzy and name:
+            needle = name.lower()
+            matches = [cat_id for cat_name, cat_id in by_name.items() if needle in cat_name.lower()]
+            if matches:
+                return min(matches)
+        return by_name.get(default)
+
+    @classmethod
+    def get_json(cls):
+        """Serialized [Category.to_dict(), ...] as JSON bytes"""
+        version = cls.json_version()
+        cached = cls._json
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        payload = dumps([cat.to_dict() for cat in Category.query.all()])
+        cls._json = (version, payload)
+        return payload
+
+    @classmethod
+    def invalidate(cls):
+        """Drop the snapshot after categories change"""
+        cls._by_id = None
+        cls._by_name = None
+        cls._json = None
+        cls.version += 1
+
+
+@event.listens_for(Category, 'after_insert')
+@event.listens_for(Category, 'after_update')
+@event.listens_for(Category, 'after_delete')
+def _invalidate_category_cache(mapper, connection, target):
+    CategoryCache.invalidate()
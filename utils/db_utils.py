@@ -4,7 +4,8 @@ from models.transaction import Transaction
 from models.category import Category
 from models.budget import Budget
 from datetime import datetime, timedelta
-from sqlalchemy import func, extract
+from sqlalchemy import func, extract, text, any_, bindparam, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
 
 class DatabaseUtils:
     """Utility functions for database operations"""
@@ -49,6 +50,32 @@ class DatabaseUtils:
             'change_percentage': round(change_percentage, 2)
         }
     
+    # Defaults used by the dashboard page; other parameters bypass the snapshot
+    DASHBOARD_TREND_MONTHS = 6
+    DASHBOARD_TOP_VENDORS = 6
+    
+    @staticmethod
+    def get_dashboard_snapshot():
+        """
+        Get all dashboard aggregates, computed together once per transactions version
+        
+        Every write bumps the version, so the first dashboard request after
+        a change rebuilds the snapshot and the remaining widgets (and other
+        users) read it from the cache. The short timeout bounds staleness
+        of the current/last month figures across a month boundary.
+        """
+        from utils.cache_utils import CacheUtils
+        
+        def build():
+            return {
+                'stats': DatabaseUtils.get_dashboard_stats(),
+                'category_breakdown': DatabaseUtils.get_category_breakdown(),
+                'monthly_trend': DatabaseUtils.get_monthly_trend(DatabaseUtils.DASHBOARD_TREND_MONTHS),
+                'top_vendors_json': DatabaseUtils.get_top_vendors_json(DatabaseUtils.DASHBOARD_TOP_VENDORS)
+            }
+        
+        return CacheUtils.get_or_build('dashboard_snapshot', build)
+    
     @staticmethod
     def get_category_breakdown():
         """Get category-wise expense breakdown"""
@@ -77,34 +104,46 @@ class DatabaseUtils:
     @staticmethod
     def get_recent_transactions(limit=10):
         """Get recent transactions"""
-        transactions = Transaction.query.order_by(
+        transactions = db.session.query(*Transaction.api_columns()).order_by(
             Transaction.transaction_date.desc(),
             Transaction.created_at.desc()
         ).limit(limit).all()
         
-        return [t.to_dict() for t in transactions]
+        return Transaction.serialize_many(transactions)
     
     @staticmethod
     def get_monthly_trend(months=6):
-        """Get monthly spending trend"""
+        """Get monthly spending trend (one grouped query, zero-filled months)"""
         today = datetime.now()
-        trends = []
         
-        for i in range(months):
-            month_date = today - timedelta(days=30*i)
-            month_total = db.session.query(func.sum(Transaction.amount)).filter(
-                extract('month', Transaction.transaction_date) == month_date.month,
-                extract('year', Transaction.transaction_date) == month_date.year
-            ).scalar() or 0.0
-            
-            trends.append({
-                'month': month_date.strftime('%B'),
-                'year': month_date.year,
-                'total': round(month_total, 2)
-            })
-        
-        trends.reverse()
-        return trends
+        # Calendar months oldest -> newest, ending with the current month
+        month_keys = []
+        year, month = today.year, today.month
+        for _ in range(months):
+            month_keys.append((year, month))
+            year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+        month_keys.reverse()
+        if not month_keys:
+            return []
+        
+        first_year, first_month = month_keys[0]
+        year_col = extract('year', Transaction.transaction_date)
+        month_col = extract('month', Transaction.transaction_date)
+        rows = db.session.query(
+            year_col, month_col, func.sum(Transaction.amount)
+        ).filter(
+            Transaction.transaction_date >= datetime(first_year, first_month, 1).date()
+        ).group_by(year_col, month_col).all()
+        totals = {(int(y), int(m)): total or 0.0 for y, m, total in rows}
+        
+        return [
+            {
+                'month': datetime(y, m, 1).strftime('%B'),
+                'year': y,
+                'total': round(totals.get((y, m), 0.0), 2)
+            }
+            for y, m in month_keys
+        ]
     
     @staticmethod
     def get_top_vendors(limit=5):
@@ -126,4 +165,62 @@ class DatabaseUtils:
                 'transaction_count': v.count
             }
             for v in vendors
-        ]
\ No newline at end of file
+        ]
+    
+    @staticmethod
+    def id_in(column, ids):
+        """
+        Membership filter for a (possibly long) list of integer ids
+        
+        On PostgreSQL this is ``column = ANY(:ids)`` with the whole list bound
+        as one array parameter: the statement text and plan stay the same size
+        however many ids are passed. Other databases get a regular IN list.
+        """
+        if db.engine.dialect.name == 'postgresql':
+            return column == any_(bindparam(None, list(ids), type_=ARRAY(Integer)))
+        return column.in_(ids)
+    
+    @staticmethod
+    def get_top_vendors_json(limit=6):
+        """
+        Get top vendors by spending as a ready-to-send JSON array string
+        
+        Aggregation and JSON encoding both happen in the database, so no
+        rows are hydrated in Python. Dates come back ISO formatted.
+        """
+        if db.engine.dialect.name == 'postgresql':
+            json_sql = """
+                SELECT COALESCE(json_agg(json_build_object(
+                    'vendor_name', vendor_name,
+                    'transaction_count', c,
+                    'total_spending', s,
+                    'last_transaction_date', d
+                ) ORDER BY s DESC), '[]'::json)::text
+                FROM v
+            """
+        else:
+            json_sql = """
+                SELECT COALESCE(json_group_array(json_object(
+                    'vendor_name', vendor_name,
+                    'transaction_count', c,
+                    'total_spending', s,
+                    'last_transaction_date', d
+                )), '[]')
+                FROM (SELECT * FROM v ORDER BY s DESC)
+            """
+        
+        stmt = text("""
+            WITH v AS (
+                SELECT vendor_name,
+                       COUNT(id) AS c,
+                       COALESCE(SUM(amount), 0.0) AS s,
+                       MAX(transaction_date) AS d
+                FROM transactions
+                WHERE vendor_name IS NOT NULL AND vendor_name <> ''
+                GROUP BY vendor_name
+                ORDER BY s DESC
+                LIMIT :lim
+            )
+        """ + json_sql)
+        
+        return db.session.execute(stmt, {'lim': limit}).scalar() or '[]'
@@ -1,4 +1,5 @@
 import os
+import hashlib
 from werkzeug.utils import secure_filename
 from datetime import datetime
 import uuid
@@ -8,19 +9,18 @@ class FileHandler:
     
     ALLOWED_EXTENSIONS = {'pdf', 'png', 'jpg', 'jpeg', 'gif', 'bmp', 'tiff'}
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB in bytes
+    CHUNK_SIZE = 1024 * 1024  # 1MB streaming copy buffer
     
     @staticmethod
     def allowed_file(filename):
         """Check if file extension is allowed"""
-        return '.' in filename and \
-               filename.rsplit('.', 1)[1].lower() in FileHandler.ALLOWED_EXTENSIONS
+        return FileHandler.get_file_extension(filename) in FileHandler.ALLOWED_EXTENSIONS
     
     @staticmethod
     def get_file_extension(filename):
         """Get file extension"""
-        if '.' in filename:
-            return filename.rsplit('.', 1)[1].lower()
-        return None
+        _, dot, ext = filename.rpartition('.')
+        return ext.lower() if dot else None
     
     @staticmethod
     def generate_unique_filename(original_filename):
@@ -46,6 +46,32 @@ class FileHandler:
         file.seek(0)
         return round(file_size / (1024 * 1024), 2)
     
+    @staticmethod
+    def stream_to_disk(stream, file_path):
+        """
+        Copy a stream to disk in fixed-size chunks, hashing as it goes
+        
+        Memory stays at one chunk regardless of file size. Raises ValueError
+        (and removes the partial file) if MAX_FILE_SIZE is exceeded.
+        
+        Returns:
+            (size_in_bytes, sha256_hexdigest)
+        """
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(file_path, 'wb') as fp:
+                while chunk := stream.read(FileHandler.CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > FileHandler.MAX_FILE_SIZE:
+                        raise ValueError(f"File too large. Maximum size: {FileHandler.MAX_FILE_SIZE / (1024*1024)}MB")
+                    digest.update(chunk)
+                    fp.write(chunk)
+        except Exception:
+            FileHandler.delete_file(file_path)
+            raise
+        return size, digest.hexdigest()
+    
     @staticmethod
     def save_file(file, upload_folder):
         """Save file and return file info"""
@@ -69,21 +95,22 @@ class FileHandler:
             # Create upload folder if not exists
             os.makedirs(upload_folder, exist_ok=True)
             
-            # Save file
+            # Stream to disk and hash in a single pass
             file_path = os.path.join(upload_folder, unique_filename)
-            file.save(file_path)
-            
-            # Get file info
-            file_size = FileHandler.get_file_size_mb(file)
+            file.stream.seek(0)
+            size, content_sha256 = FileHandler.stream_to_disk(file.stream, file_path)
             
             return {
                 'original_filename': original_filename,
                 'saved_filename': unique_filename,
                 'file_path': file_path,
-                'file_size': file_size,
-                'file_extension': FileHandler.get_file_extension(original_filename)
+                'file_size': round(size / (1024 * 1024), 2),
+                'file_extension': FileHandler.get_file_extension(original_filename),
+                'content_sha256': content_sha256
             }, None
             
+        except ValueError as e:
+            return None, str(e)
         except Exception as e:
             return None, f"Error saving file: {str(e)}"
     
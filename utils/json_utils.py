@@ -0,0 +1,48 @@
+"""
+JSON Response Utilities
+orjson-backed replacement for Flask's jsonify on hot API endpoints, and an
+orjson JSON provider so jsonify()/request.get_json() in the blueprints use
+it too
+"""
+
+from decimal import Decimal
+
+import orjson
+from flask import Response
+from flask.json.provider import JSONProvider
+
+# Naive datetimes are emitted like datetime.isoformat() (no UTC offset added)
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj):
+    """Fallback for types orjson does not handle natively"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj):
+    """Serialize to UTF-8 JSON bytes"""
+    return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS)
+
+
+def ojson(obj, status=200):
+    """Build a JSON response (drop-in for ``jsonify(obj), status``)"""
+    return Response(dumps(obj), status=status, mimetype='application/json')
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson (install with ``app.json = OrjsonProvider(app)``)"""
+
+    def dumps(self, obj, **kwargs):
+        option = ORJSON_OPTIONS | (orjson.OPT_SORT_KEYS if kwargs.get('sort_keys') else 0)
+        return orjson.dumps(obj, default=_default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """jsonify(): encode straight to bytes, skipping the str round-trip"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype='application/json')
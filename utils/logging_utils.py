@@ -0,0 +1,40 @@
+"""
+Logging Utilities
+Non-blocking application logging
+
+Request handlers only enqueue log records (QueueHandler); a single
+QueueListener thread formats them and writes to stderr, so slow terminals or
+log collectors never stall a request the way synchronous print() did.
+"""
+
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+_listener = None
+
+
+def init_logging(app):
+    """Route root logging through a background queue listener (idempotent)"""
+    global _listener
+
+    root = logging.getLogger()
+    root.setLevel(app.config.get('LOG_LEVEL', 'INFO'))
+
+    if _listener is not None:
+        return _listener
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    root.addHandler(QueueHandler(log_queue))
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
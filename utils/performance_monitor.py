@@ -1,6 +1,11 @@
+import os
 import time
+from contextlib import contextmanager
 from functools import wraps
 
+from flask import g, has_app_context
+from sqlalchemy import event
+
 class PerformanceMonitor:
     """Monitor query processing performance"""
     
@@ -26,6 +31,58 @@ class PerformanceMonitor:
             return result
         return wrapper
     
+    def init_app(self, app, engine):
+        """
+        Per-request timing for production profiling
+        
+        - Server-Timing header (db / nlp / total, in ms) when SERVER_TIMING is on,
+          so browser dev tools show where each request spent its time
+        - Werkzeug ProfilerMiddleware when FLASK_PROFILE=1, dumping cProfile
+          stats for every request into PROFILE_DIR
+        """
+        if app.config.get('FLASK_PROFILE'):
+            from werkzeug.middleware.profiler import ProfilerMiddleware
+            profile_dir = app.config.get('PROFILE_DIR', '/tmp/profiles')
+            os.makedirs(profile_dir, exist_ok=True)
+            app.wsgi_app = ProfilerMiddleware(app.wsgi_app, restrictions=[30], profile_dir=profile_dir)
+        
+        if not app.config.get('SERVER_TIMING'):
+            return
+        
+        @event.listens_for(engine, 'before_cursor_execute')
+        def _query_start(conn, cursor, statement, parameters, context, executemany):
+            context._query_start = time.perf_counter()
+        
+        @event.listens_for(engine, 'after_cursor_execute')
+        def _query_end(conn, cursor, statement, parameters, context, executemany):
+            if has_app_context() and 'server_timing' in g:
+                g.server_timing['db'] = g.server_timing.get('db', 0.0) + time.perf_counter() - context._query_start
+        
+        @app.before_request
+        def _start_server_timing():
+            g.server_timing = {}
+            g.server_timing_start = time.perf_counter()
+        
+        @app.after_request
+        def _add_server_timing(response):
+            timings = g.pop('server_timing', None)
+            if timings is not None:
+                timings['total'] = time.perf_counter() - g.server_timing_start
+                response.headers['Server-Timing'] = ', '.join(
+                    f'{name};dur={seconds * 1000:.1f}' for name, seconds in timings.items()
+                )
+            return response
+    
+    @contextmanager
+    def timer(self, name):
+        """Add the duration of a block to this request's Server-Timing entry"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if has_app_context() and 'server_timing' in g:
+                g.server_timing[name] = g.server_timing.get(name, 0.0) + time.perf_counter() - start
+    
     def get_stats(self):
         """Get performance statistics"""
         if self.metrics['queries_processed'] == 0:
@@ -9,8 +9,84 @@ from ai_modules.categorizer import TransactionCategorizer
 from models.database import db
 from models.document import Document
 from models.transaction import Transaction
-from models.category import Category
+from models.notification_system import NotificationManager, BudgetNotificationManager
+from utils.budget_utils import BudgetUtils
+from utils.cache_utils import CacheUtils
+from utils.category_cache import CategoryCache
+from flask import current_app
+from sqlalchemy import insert, select, update
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import logging
+import multiprocessing
 import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Documents per commit in process_multiple_documents
+BATCH_COMMIT_SIZE = 500
+
+# Characters of extracted text kept in documents.raw_text (see STORE_FULL_RAW_TEXT)
+RAW_TEXT_HEAD_CHARS = 4096
+
+# Document attributes _extract_document() reads
+_DocumentFile = namedtuple('_DocumentFile', 'id filename original_filename file_path')
+
+# DocumentProcessor/DataExtractor of a pool worker process
+_process_extractors = None
+
+
+def _extract_text(doc_processor, data_extractor, file_path, file_extension, keep_chars):
+    """
+    Read a file page by page and scan it; no app, session or ORM objects
+    
+    Returns:
+        (extracted data or None, text head, text length, error)
+    """
+    try:
+        extracted_data, text, text_length = data_extractor.extract_streaming(
+            doc_processor.iter_pages(file_path, file_extension),
+            keep_chars=keep_chars
+        )
+    except ValueError as e:
+        return None, None, 0, str(e)
+    except Exception as e:
+        return None, None, 0, f"Error extracting text from document: {e}"
+    
+    return extracted_data, text, text_length, None
+
+
+def _extract_text_in_process(file_path, file_extension, keep_chars):
+    """_extract_text() in a ProcessPoolExecutor worker (primitives in and out)"""
+    global _process_extractors
+    if _process_extractors is None:
+        _process_extractors = (DocumentProcessor(), DataExtractor())
+    return _extract_text(*_process_extractors, file_path, file_extension, keep_chars)
+
+
+def _process_pool_context():
+    """
+    forkserver where available, else spawn
+
+    Never fork: the app process runs request, task-queue and extraction
+    threads, and a child forked while one of them holds a lock (logging,
+    the DB pool, a C library) can deadlock. Workers import only this module
+    and the extractors, not the app.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def _file_extension(document):
+    return document.filename.rpartition('.')[2].lower()
+
+
+def _raw_text_keep_chars():
+    """Characters of text to keep for documents.raw_text (None = all)"""
+    return None if current_app.config.get('STORE_FULL_RAW_TEXT') else RAW_TEXT_HEAD_CHARS
+
 
 class DocumentProcessingWorkflow:
     """Complete workflow for processing documents"""
@@ -29,126 +105,160 @@ class DocumentProcessingWorkflow:
             os.makedirs('ml_models', exist_ok=True)
             self.categorizer.save_model(model_path)
     
-    def process_document(self, document_id):
-        """Process a single document"""
+    def _extract_document(self, document):
+        """
+        OCR, extraction and categorization for one document; touches
+        neither the document nor the session
+        
+        Pages are streamed from the file into the extractor, so only the
+        head of the text (RAW_TEXT_HEAD_CHARS, or all of it with
+        STORE_FULL_RAW_TEXT) is ever held in memory.
+        
+        Returns:
+            (document values, transaction values or None, error). Document
+            values ({'raw_text', 'text_length'}) are None when no text could
+            be read (the document stays unprocessed); an error alongside them
+            means the text could not be parsed (the document is still marked
+            processed).
+        """
+        # Step 1 + 2: Extract text page by page and scan it as it arrives
+        logger.info("Processing %s", document.original_filename)
+        
+        extraction = _extract_text(
+            self.doc_processor, self.data_extractor,
+            document.file_path, _file_extension(document), _raw_text_keep_chars()
+        )
+        return self._document_values(document, extraction)
+    
+    def _document_values(self, document, extraction):
+        """
+        Categorize an _extract_text() result and build the row values
+        (runs in the app; returns what _extract_document() does)
+        """
+        extracted_data, text, text_length, error = extraction
+        
+        if error:
+            return None, None, error
+        
+        if not text_length:
+            return None, None, "No text extracted from document"
+        
+        logger.debug("Extracted %d characters", text_length)
+        doc_values = {'raw_text': text, 'text_length': text_length}
+        
+        if not extracted_data:
+            return doc_values, None, "Could not extract data from text"
+        
+        logger.debug("Extracted: %s", extracted_data)
+        
+        # Step 3: Categorize on the retained head of the text: the full text
+        # for documents up to RAW_TEXT_HEAD_CHARS, the first page or so of
+        # longer ones (where the vendor and line items are)
+        vendor = extracted_data.get('vendor', 'Unknown')
+        category_name, confidence = self.categorizer.predict_category(vendor, text)
+        
+        logger.debug("Category: %s (confidence: %.1f%%)", category_name, confidence)
+        
+        # Resolve category id from the in-memory snapshot
+        category_id = CategoryCache.get_id_by_name(category_name, default='Other')
+        
+        # Step 4: Transaction values
+        amount = extracted_data.get('amount')
+        
+        if not amount:
+            logger.info("No amount found in %s, transaction not created", document.original_filename)
+            return doc_values, None, None
+        
+        logger.debug("Transaction extracted: %s - %s", vendor, amount)
+        return doc_values, {
+            'document_id': document.id,
+            'transaction_date': extracted_data.get('date'),
+            'amount': amount,
+            'currency': 'INR',
+            'vendor_name': vendor,
+            'description': f"Extracted from {document.original_filename}",
+            'category_id': category_id,
+            'payment_method': extracted_data.get('payment_method'),
+            'tax_amount': extracted_data.get('tax_amount') or 0.0,
+            'tax_percentage': extracted_data.get('tax_percentage')
+        }, None
+    
+    def process_document(self, document_or_id, emit_notifications=True):
+        """
+        Process a single document; returns (success, message, transaction_count)
+        
+        Accepts a Document already loaded in the current session or its id.
+        Batch callers pass emit_notifications=False and send one
+        BudgetNotificationManager.notify_batch_processed() summary instead
+        of the two per-document notifications.
+        """
         transaction_count = 0
         
         try:
-            # Get document from database
-            document = db.session.get(Document, document_id)
+            # Get document from database (unless the caller already has it)
+            if isinstance(document_or_id, Document):
+                document = document_or_id
+            else:
+                document = db.session.get(Document, document_or_id)
             
             if not document:
-                return False, "Document not found"
+                return False, "Document not found", 0
             
             if document.processed:
-                return False, "Document already processed"
+                return False, "Document already processed", 0
+            
+            doc_values, values, error = self._extract_document(document)
             
-            # Step 1: Extract text
-            print(f"📄 Processing: {document.original_filename}")
+            if doc_values is None:
+                return False, error, 0
             
-            file_extension = document.filename.split('.')[-1].lower()
-            text, error = self.doc_processor.process_document(
-                document.file_path,
-                file_extension
+            # Store the text head and mark as processed in one UPDATE; the
+            # text never enters the identity map or attribute history
+            db.session.execute(
+                update(Document)
+                .where(Document.id == document.id)
+                .values(processed=True, **doc_values)
+                .execution_options(synchronize_session=False)
             )
             
             if error:
-                return False, error
-            
-            if not text:
-                return False, "No text extracted from document"
-            
-            # Store raw text
-            document.raw_text = text
-            
-            print(f"✅ Extracted {len(text)} characters")
-            
-            # Step 2: Extract structured data
-            print("🔍 Extracting structured data...")
-            
-            extracted_data = self.data_extractor.extract_all_data(text)
-            
-            if not extracted_data:
-                document.processed = True
                 db.session.commit()
-                return False, "Could not extract data from text"
-            
-            print(f"✅ Extracted: {extracted_data}")
+                return False, error, 0
             
-            # Step 3: Categorize
-            vendor = extracted_data.get('vendor', 'Unknown')
-            category_name, confidence = self.categorizer.predict_category(vendor, text)
-            
-            print(f"🏷️ Category: {category_name} (confidence: {confidence:.1f}%)")
-            
-            # Get category from database
-            category = Category.query.filter_by(name=category_name).first()
-            
-            if not category:
-                category = Category.query.filter_by(name='Other').first()
-            
-            # Step 4: Create transaction
-            amount = extracted_data.get('amount')
             transaction = None
+            budgets = []
             
-            if amount:
-                transaction = Transaction(
-                    document_id=document.id,
-                    transaction_date=extracted_data.get('date'),
-                    amount=amount,
-                    currency='INR',
-                    vendor_name=vendor,
-                    description=f"Extracted from {document.original_filename}",
-                    category_id=category.id if category else None,
-                    payment_method=extracted_data.get('payment_method'),
-                    tax_amount=extracted_data.get('tax_amount') or 0.0,
-                    tax_percentage=extracted_data.get('tax_percentage')
-                )
-                
+            if values:
+                transaction = Transaction(**values)
                 db.session.add(transaction)
                 transaction_count = 1
-                print(f"💰 Transaction created: {vendor} - ₹{amount}")
-            else:
-                print("⚠️ No amount found, transaction not created")
+                
+                # ✅ AUTO-SYNC BUDGET: staged into the transaction's commit
+                budgets = BudgetUtils.stage_budget_periods(BudgetUtils.transaction_periods([transaction]))
             
-            # Mark as processed
-            document.processed = True
             db.session.commit()
+            CacheUtils.bump_transactions_version()
+            BudgetUtils.notify_budget_status(budgets)
             
-            # ✅ AUTO-SYNC BUDGET (if transaction was created)
-            if amount and transaction:
-                from utils.budget_utils import BudgetUtils
-                BudgetUtils.sync_transaction_budgets(transaction)
-                print(f"✅ Budget synced for {category.name if category else 'Unknown'}")
+            if not emit_notifications:
+                return True, "Document processed successfully", transaction_count
             
             # ✅ NOTIFICATION: Document processed successfully
-            try:
-                from models.notification_system import BudgetNotificationManager
-                BudgetNotificationManager.notify_document_processed(document, transaction_count)
-                print(f"✅ Notification sent: Document processed")
-            except Exception as e:
-                print(f"⚠️ Notification error (non-critical): {e}")
+            # (create_notification rolls back and logs its own send failures)
+            BudgetNotificationManager.notify_document_processed(document, transaction_count)
             
             # ✅ NOTIFICATION: Transaction added
             if transaction:
-                try:
-                    from models.notification_system import BudgetNotificationManager
-                    BudgetNotificationManager.notify_transaction_added(transaction)
-                    print(f"✅ Notification sent: Transaction added")
-                except Exception as e:
-                    print(f"⚠️ Notification error (non-critical): {e}")
+                BudgetNotificationManager.notify_transaction_added(transaction)
             
-            return True, "Document processed successfully"
+            return True, "Document processed successfully", transaction_count
             
         except Exception as e:
             db.session.rollback()
-            print(f"❌ Error processing document: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error processing document %s: %s", document_or_id, e)
             
             # ✅ NOTIFICATION: Processing failed
-            try:
-                from models.notification_system import NotificationManager
+            if emit_notifications:
                 NotificationManager.create_notification(
                     type='document_processing_failed',
                     severity='danger',
@@ -157,15 +267,20 @@ class DocumentProcessingWorkflow:
                     action_url='/upload',
                     action_label='View Documents'
                 )
-            except Exception as notify_error:
-                print(f"⚠️ Could not send failure notification: {notify_error}")
             
-            return False, str(e)
+            return False, str(e), 0
     
-    def process_multiple_documents(self, document_ids):
+    def process_multiple_documents(self, document_ids, commit_every=BATCH_COMMIT_SIZE, max_workers=None):
         """
         Process multiple documents in batch
         ✅ WITH BATCH NOTIFICATION
+        
+        OCR/extraction runs on up to `max_workers` threads (default
+        DOCUMENT_PROCESSING_WORKERS), while the database work is staged in
+        this thread and committed once per `commit_every` documents: one bulk UPDATE of
+        the documents, one multi-row INSERT of their transactions and one
+        budget resync for the periods they touch. Per-document notifications
+        are replaced by the single batch notification below.
         """
         results = {
             'success': [],
@@ -173,32 +288,157 @@ class DocumentProcessingWorkflow:
             'total_transactions': 0
         }
         
+        # One SELECT of just the columns the batch needs (no raw_text, no ORM
+        # objects); missing and already-processed ids are skipped up front
+        processed = {}
+        files = {}
+        for row in db.session.execute(
+            select(Document.processed, *[getattr(Document, col) for col in _DocumentFile._fields])
+            .where(Document.id.in_(document_ids))
+        ):
+            processed[row.id] = row.processed
+            files[row.id] = _DocumentFile(*row[1:])
+        pending = []
+        
         for doc_id in document_ids:
-            success, message = self.process_document(doc_id)
-            
-            if success:
-                results['success'].append(doc_id)
-                # Count transactions created
-                document = db.session.get(Document, doc_id)
-                if document:
-                    trans_count = Transaction.query.filter_by(document_id=doc_id).count()
-                    results['total_transactions'] += trans_count
+            if doc_id not in files:
+                self._record_failure(results, doc_id, "Document not found")
+            elif processed[doc_id]:
+                self._record_failure(results, doc_id, "Document already processed")
             else:
-                results['failed'].append({'id': doc_id, 'error': message})
+                pending.append(files[doc_id])
+        
+        # Extraction (OCR, subprocesses, file I/O) overlaps across workers;
+        # results are consumed in order and all writes stay here
+        app = current_app._get_current_object()
+        workers = min(max_workers or app.config.get('DOCUMENT_PROCESSING_WORKERS', 4), len(pending)) or 1
+        staged_docs, staged_txns, staged_ids = [], [], []
+        
+        for document, (doc_values, values, error) in zip(pending, self._iter_extractions(app, pending, workers)):
+            doc_id = document.id
+            
+            if doc_values is None:
+                self._record_failure(results, doc_id, error)
+                continue
+            
+            staged_docs.append({'id': doc_id, 'processed': True, **doc_values})
+            if error:
+                self._record_failure(results, doc_id, error)
+            else:
+                staged_ids.append(doc_id)
+                if values:
+                    staged_txns.append(values)
+            
+            if len(staged_docs) >= commit_every:
+                self._commit_batch(staged_docs, staged_txns, staged_ids, results)
+                staged_docs, staged_txns, staged_ids = [], [], []
+        
+        if staged_docs:
+            self._commit_batch(staged_docs, staged_txns, staged_ids, results)
         
         # ✅ NOTIFICATION: Batch processing complete
         if results['success']:
+            BudgetNotificationManager.notify_batch_processed(
+                len(results['success']),
+                results['total_transactions'],
+                len(results['failed'])
+            )
+        
+        return results
+    
+    def _iter_extractions(self, app, pending, workers):
+        """
+        _extract_document() outcomes for the pending documents, in order
+        
+        With DOCUMENT_PROCESSING_POOL=process, page reading and scanning
+        (pure-Python PDF parsing, OpenCV preprocessing) run in worker
+        processes so they use every core instead of sharing the GIL; only
+        paths and the extracted primitives cross the process boundary, and
+        categorization stays in this process. Otherwise worker threads run
+        the whole extraction.
+        """
+        if app.config.get('DOCUMENT_PROCESSING_POOL') != 'process':
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='doc-extract') as executor:
+                yield from executor.map(lambda doc: self._extract_in_context(app, doc), pending)
+            return
+        
+        keep_chars = _raw_text_keep_chars()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_process_pool_context()) as executor:
+            futures = []
+            for document in pending:
+                logger.info("Processing %s", document.original_filename)
+                futures.append(executor.submit(
+                    _extract_text_in_process, document.file_path, _file_extension(document), keep_chars
+                ))
+            
+            for document, future in zip(pending, futures):
+                try:
+                    outcome = self._document_values(document, future.result())
+                except Exception as e:
+                    # e.g. a worker killed mid-OCR (BrokenProcessPool)
+                    logger.warning("Error processing document %s: %s", document.id, e,
+                                   exc_info=logger.isEnabledFor(logging.DEBUG))
+                    outcome = None, None, str(e)
+                yield outcome
+    
+    def _extract_in_context(self, app, document):
+        """_extract_document() on a worker thread (own app context and session)"""
+        with app.app_context():
             try:
-                from models.notification_system import NotificationManager
-                NotificationManager.create_notification(
-                    type='batch_processing_complete',
-                    severity='success',
-                    title='📄 Batch Processing Complete',
-                    message=f"Successfully processed {len(results['success'])} document(s), extracted {results['total_transactions']} transaction(s)",
-                    action_url='/upload',
-                    action_label='View Documents'
-                )
+                return self._extract_document(document)
             except Exception as e:
-                print(f"⚠️ Notification error: {e}")
+                # Bad files are an expected batch outcome: the traceback is
+                # only formatted when debug logging is on
+                logger.warning("Error processing document %s: %s", document.id, e,
+                               exc_info=logger.isEnabledFor(logging.DEBUG))
+                return None, None, str(e)
+    
+    @staticmethod
+    def _record_failure(results, doc_id, error):
+        """Add a failed document to process_multiple_documents() results"""
+        results['failed'].append({'id': doc_id, 'error': str(error)})
+    
+    @staticmethod
+    def _commit_batch(documents, transactions, document_ids, results):
+        """Write one chunk of processed documents and their transactions in a single commit"""
+        
+        try:
+            # Bulk UPDATE by primary key (executemany)
+            db.session.execute(update(Document), documents)
+            if transactions:
+                db.session.execute(insert(Transaction), transactions)
+            budgets = BudgetUtils.stage_budget_periods(BudgetUtils.transaction_periods(transactions))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.exception("Error saving processed documents: %s", e)
+            # Documents staged with an extraction error are already recorded
+            for doc_id in document_ids:
+                DocumentProcessingWorkflow._record_failure(results, doc_id, e)
+            return
         
-        return results
\ No newline at end of file
+        CacheUtils.bump_transactions_version()
+        BudgetUtils.notify_budget_status(budgets)
+        
+        results['success'].extend(document_ids)
+        results['total_transactions'] += len(transactions)
+        logger.info("Saved %d documents, %d transactions", len(documents), len(transactions))
+
+
+_workflow = None
+_workflow_lock = threading.Lock()
+
+
+def get_workflow():
+    """
+    Process-wide DocumentProcessingWorkflow
+
+    Loading (or training) the category model is the expensive part of
+    construction, so it happens once per process however many callers ask.
+    """
+    global _workflow
+    if _workflow is None:
+        with _workflow_lock:
+            if _workflow is None:
+                _workflow = DocumentProcessingWorkflow()
+    return _workflow
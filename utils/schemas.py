@@ -0,0 +1,86 @@
+"""
+Request Schemas
+msgspec structs for the transaction write endpoints
+
+Request bodies are decoded and type-checked straight from the raw bytes in
+one C pass, replacing per-field lookups, casts and date parsing in the views.
+Dates are ISO YYYY-MM-DD strings, decoded to datetime.date by msgspec.
+"""
+
+from datetime import date
+from typing import Annotated, Optional
+
+import msgspec
+
+from models.transaction import Transaction
+
+PositiveAmount = Annotated[float, msgspec.Meta(gt=0)]
+
+
+def _required_text(value, field):
+    """Strip value; ValueError (a validation error) if nothing is left"""
+    value = value.strip()
+    if not value:
+        raise ValueError(f'{field} must not be empty')
+    return value
+
+
+class TransactionCreate(msgspec.Struct):
+    """POST /api/transactions"""
+    amount: PositiveAmount
+    vendor_name: str
+    category_id: int
+    transaction_date: Optional[date] = None  # YYYY-MM-DD; null/missing -> today
+    currency: str = 'INR'
+    description: str = 'Manual entry'
+    payment_method: str = 'Other'
+    tax_amount: float = 0.0
+    tax_percentage: Optional[float] = None
+
+    def __post_init__(self):
+        self.vendor_name = _required_text(self.vendor_name, 'vendor_name')
+        self.description = self.description.strip()
+        self.payment_method = Transaction.normalize_payment_method(self.payment_method)
+        self.tax_percentage = self.tax_percentage or None
+
+
+class TransactionUpdate(msgspec.Struct):
+    """PUT /api/transactions/<id>; only the fields sent are changed"""
+    amount: PositiveAmount = msgspec.UNSET
+    vendor_name: str = msgspec.UNSET
+    transaction_date: date = msgspec.UNSET
+    category_id: int = msgspec.UNSET
+    description: str = msgspec.UNSET
+    payment_method: str = msgspec.UNSET
+    tax_amount: float = msgspec.UNSET
+
+    def __post_init__(self):
+        if self.vendor_name is not msgspec.UNSET:
+            self.vendor_name = _required_text(self.vendor_name, 'vendor_name')
+        if self.description is not msgspec.UNSET:
+            self.description = self.description.strip()
+        if self.payment_method is not msgspec.UNSET:
+            self.payment_method = Transaction.normalize_payment_method(self.payment_method)
+
+    def changes(self):
+        """{field: value} for the fields present in the request"""
+        return {
+            field: value
+            for field, value in msgspec.structs.asdict(self).items()
+            if value is not msgspec.UNSET
+        }
+
+
+def decode_json(body, schema):
+    """
+    Decode and validate a JSON request body
+
+    Numeric strings are accepted for number fields (strict=False).
+
+    Returns:
+        (instance, None) or (None, error message)
+    """
+    try:
+        return msgspec.json.decode(body, type=schema, strict=False), None
+    except (msgspec.ValidationError, msgspec.DecodeError) as e:
+        return None, str(e)
@@ -3,6 +3,7 @@ from models.document import Document
 from models.transaction import Transaction
 from models.category import Category
 from datetime import datetime, timedelta
+from sqlalchemy import insert
 import random
 
 class SeedData:
@@ -24,73 +25,83 @@ class SeedData:
     
     @staticmethod
     def generate_transactions(num_transactions=50):
-        """Generate dummy transactions"""
+        """
+        Generate dummy transactions
+        
+        Rows are built as plain dicts and written with a single Core
+        INSERT ... RETURNING (executemany), skipping per-object ORM flushes.
+        
+        Returns:
+            List of inserted row dicts (with 'id'), for budget syncing
+        """
         categories = Category.query.all()
         
         if not categories:
             print("❌ No categories found. Please run app first to seed categories.")
-            return
+            return []
         
         print(f"🌱 Generating {num_transactions} dummy transactions...")
         
-        transactions_created = 0
+        rows = []
         
         for i in range(num_transactions):
-            try:
-                # Random category
-                category = random.choice(categories)
-                
-                # Random vendor from category
-                vendors_list = SeedData.VENDORS.get(category.name, ['Unknown Vendor'])
-                vendor = random.choice(vendors_list)
-                
-                # Random date in last 90 days
-                days_ago = random.randint(0, 90)
-                transaction_date = datetime.now() - timedelta(days=days_ago)
-                
-                # Random amount based on category
-                if category.name in ['Travel', 'Insurance', 'Healthcare']:
-                    amount = round(random.uniform(1000, 15000), 2)
-                elif category.name in ['Shopping', 'Entertainment']:
-                    amount = round(random.uniform(500, 5000), 2)
-                elif category.name in ['Food & Dining']:
-                    amount = round(random.uniform(100, 1500), 2)
-                else:
-                    amount = round(random.uniform(200, 3000), 2)
-                
-                # Random tax (5-18%)
-                tax_percentage = random.choice([5, 12, 18])
-                tax_amount = round(amount * (tax_percentage / 100), 2)
-                
-                # Payment method
-                payment_method = random.choice(['Card', 'Cash', 'UPI', 'Net Banking', 'Wallet'])
-                
-                transaction = Transaction(
-                    document_id=None,  # No document for dummy data
-                    transaction_date=transaction_date.date(),
-                    amount=amount,
-                    currency='INR',
-                    vendor_name=vendor,
-                    description=f'Payment to {vendor}',
-                    category_id=category.id,
-                    payment_method=payment_method,
-                    tax_amount=tax_amount,
-                    tax_percentage=tax_percentage
-                )
-                
-                db.session.add(transaction)
-                transactions_created += 1
-                
-            except Exception as e:
-                print(f"⚠️ Error creating transaction {i+1}: {str(e)}")
-                continue
+            # Random category
+            category = random.choice(categories)
+            
+            # Random vendor from category
+            vendors_list = SeedData.VENDORS.get(category.name, ['Unknown Vendor'])
+            vendor = random.choice(vendors_list)
+            
+            # Random date in last 90 days
+            days_ago = random.randint(0, 90)
+            transaction_date = datetime.now() - timedelta(days=days_ago)
+            
+            # Random amount based on category
+            if category.name in ['Travel', 'Insurance', 'Healthcare']:
+                amount = round(random.uniform(1000, 15000), 2)
+            elif category.name in ['Shopping', 'Entertainment']:
+                amount = round(random.uniform(500, 5000), 2)
+            elif category.name in ['Food & Dining']:
+                amount = round(random.uniform(100, 1500), 2)
+            else:
+                amount = round(random.uniform(200, 3000), 2)
+            
+            # Random tax (5-18%)
+            tax_percentage = random.choice([5, 12, 18])
+            tax_amount = round(amount * (tax_percentage / 100), 2)
+            
+            # Payment method
+            payment_method = random.choice(['Card', 'Cash', 'UPI', 'Net Banking', 'Wallet'])
+            
+            rows.append({
+                'document_id': None,  # No document for dummy data
+                'transaction_date': transaction_date.date(),
+                'amount': amount,
+                'currency': 'INR',
+                'vendor_name': vendor,
+                'description': f'Payment to {vendor}',
+                'category_id': category.id,
+                'payment_method': payment_method,
+                'tax_amount': tax_amount,
+                'tax_percentage': tax_percentage
+            })
         
         try:
+            ids = db.session.execute(
+                insert(Transaction).returning(Transaction.id),
+                rows
+            ).scalars().all()
             db.session.commit()
-            print(f"✅ Generated {transactions_created} transactions successfully!")
+            
+            for row, row_id in zip(rows, ids):
+                row['id'] = row_id
+            
+            print(f"✅ Generated {len(rows)} transactions successfully!")
+            return rows
         except Exception as e:
             db.session.rollback()
             print(f"❌ Error committing transactions: {str(e)}")
+            return []
     
     @staticmethod
     def generate_documents(num_docs=10):
@@ -266,26 +266,13 @@ class CategoryMapper:
         Returns:
             Category ID (defaults to Uncategorized if not found)
         """
-        from models.category import Category
+        from utils.category_cache import CategoryCache
         
-        # Try exact match
-        category = db_session.query(Category).filter_by(name=category_name).first()
-        
-        if category:
-            return category.id
-        
-        # Try fuzzy match
-        category = db_session.query(Category).filter(
-            Category.name.ilike(f"%{category_name}%")
-        ).first()
-        
-        if category:
-            return category.id
-        
-        # Default to Uncategorized
-        default = db_session.query(Category).filter_by(name='Uncategorized').first()
-        if default:
-            return default.id
+        # Exact, then fuzzy match against the in-memory category snapshot,
+        # defaulting to Uncategorized
+        category_id = CategoryCache.get_id_by_name(category_name, fuzzy=True, default='Uncategorized')
+        if category_id is not None:
+            return category_id
         
         # Fallback to ID 1
         return 1
@@ -0,0 +1,68 @@
+"""
+Background Task Queue
+In-process executor for slow work (document OCR/NLP) so request workers
+return immediately and clients poll for the outcome
+
+Statuses follow RQ's naming: queued -> started -> finished | failed.
+Task records expire after TASK_RESULT_TTL seconds.
+"""
+
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class TaskQueue:
+    """Thread-pool backed task queue; every task runs in its own app context"""
+
+    def __init__(self):
+        self._app = None
+        self._executor = None
+        self._tasks = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Bind to the app and start the worker pool"""
+        self._app = app
+        self._executor = ThreadPoolExecutor(
+            max_workers=app.config.get('TASK_QUEUE_WORKERS', 2),
+            thread_name_prefix='task-queue'
+        )
+        self._tasks = TTLCache(maxsize=1000, ttl=app.config.get('TASK_RESULT_TTL', 3600))
+
+    def enqueue(self, func, *args, **kwargs):
+        """Schedule func(*args, **kwargs); returns the task id"""
+        task_id = uuid.uuid4().hex
+        self._set(task_id, status='queued', result=None, error=None)
+        self._executor.submit(self._run, task_id, func, args, kwargs)
+        return task_id
+
+    def get(self, task_id):
+        """Task record dict, or None if unknown/expired"""
+        with self._lock:
+            task = self._tasks.get(task_id)
+            return dict(task) if task else None
+
+    def _set(self, task_id, **fields):
+        with self._lock:
+            task = self._tasks.get(task_id) or {'id': task_id}
+            task.update(fields)
+            self._tasks[task_id] = task
+
+    def _run(self, task_id, func, args, kwargs):
+        self._set(task_id, status='started')
+        try:
+            with self._app.app_context():
+                result = func(*args, **kwargs)
+            self._set(task_id, status='finished', result=result)
+        except Exception as e:
+            logger.error("Task %s failed: %s", task_id, e, exc_info=True)
+            self._set(task_id, status='failed', error=str(e))
+
+
+task_queue = TaskQueue()